@@ -0,0 +1,75 @@
+"""
+Search Estimator Benchmark
+
+Checks search_estimator's predictions against the searches they predict, on
+the catalogs of bench_generator and larger seeded synthetic catalogs. For
+each catalog the table shows the estimated and actual number of schedules
+(complete schedules an unpruned depth-first search visits), the estimated
+worst-case seconds against the unpruned and the default (bound-pruned)
+search time, and the strategy chosen for a 90 second timeout on one worker.
+
+Usage (from backend.0/):
+    python -m benchmarks.bench_estimator
+"""
+
+import contextlib
+import io
+import time
+
+from scheduler.compiled_catalog import CompiledCatalog
+from scheduler.schedule_generator import ScheduleGenerator
+from scheduler.search_estimator import choose_strategy, estimate_search
+
+from .bench_generator import PREFERENCES, SCENARIOS
+from .synthetic_catalog import generate_catalog
+
+EXTRA_SCENARIOS = [
+    {"name": "mwf-7", "catalog": {"seed": 1, "num_courses": 7, "sections_per_course": (6, 12)},
+     "preferences": "mwf-morning"},
+    {"name": "all-days-7", "catalog": {"seed": 5, "num_courses": 7, "sections_per_course": (6, 12)},
+     "preferences": "all-days-afternoon"},
+    {"name": "mwf-8-sparse", "catalog": {"seed": 3, "num_courses": 8, "sections_per_course": (4, 8)},
+     "preferences": "mwf-morning"},
+]
+
+# Unpruned searches stop after this many seconds
+TIMEOUT = 120
+
+
+def search_seconds(catalog, preferences, use_bounds):
+    """Run a depth-first search; return (seconds, complete schedules scored, stop reason)."""
+    generator = ScheduleGenerator(*catalog, [], preferences, use_bounds=use_bounds)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_schedules(timeout=TIMEOUT)
+    return time.perf_counter() - started, generator.leaves_scored, generator.search_info["stop_reason"]
+
+
+def main():
+    header = (
+        f"{'scenario':>16} {'est ms':>7} {'est sched':>11} {'schedules':>11} {'ratio':>6} "
+        f"{'est s':>8} {'unpruned s':>10} {'pruned s':>9}  strategy"
+    )
+    print(header)
+    print("-" * len(header))
+    for scenario in SCENARIOS + EXTRA_SCENARIOS:
+        catalog = generate_catalog(**scenario["catalog"])
+        preferences = PREFERENCES[scenario["preferences"]]
+
+        started = time.perf_counter()
+        estimate = estimate_search(CompiledCatalog.compile(*catalog), [])
+        estimate_ms = (time.perf_counter() - started) * 1000
+
+        unpruned, schedules, stop_reason = search_seconds(catalog, preferences, use_bounds=False)
+        pruned, _, _ = search_seconds(catalog, preferences, use_bounds=True)
+        ratio = estimate.estimated_schedules / schedules if schedules else float("nan")
+        stopped = f" (unpruned stopped: {stop_reason})" if stop_reason else ""
+        print(
+            f"{scenario['name']:>16} {estimate_ms:>7.2f} {estimate.estimated_schedules:>11.0f} "
+            f"{schedules:>11} {ratio:>6.2f} {estimate.estimated_seconds:>8.2f} {unpruned:>10.2f} "
+            f"{pruned:>9.2f}  {choose_strategy(estimate, 90, 1)}{stopped}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Schedule Generation Benchmark Suite
+
+Runs ScheduleGenerator and ScheduleScorer on seeded synthetic catalogs
+(see synthetic_catalog) without a database and reports, per scenario:
+
+    - compile time: building the generator from the fetched sections
+    - search time, nodes/sec and leaves/sec (complete schedules reached)
+    - peak memory traced while compiling and searching (a separate run, so
+      tracing does not slow the timed ones)
+    - score_schedule and score_batch throughput on random schedules
+    - whether the top scores match the brute-force oracle, for catalogs
+      with at most ORACLE_MAX_SPACE combinations
+
+Results can be saved as a JSON baseline and later runs compared against
+it: timings and throughput that got worse by more than the tolerance, and
+any change in nodes, leaves or top scores, are reported as regressions and
+make the run exit with status 1.
+
+The distribution day score walks a frozenset of weekdays, whose order
+depends on the string hash seed, so the suite re-runs itself with
+PYTHONHASHSEED=0 to keep scores and node counts comparable across runs.
+
+Usage (from backend.0/):
+    python -m benchmarks.bench_generator
+    python -m benchmarks.bench_generator --save benchmarks/baselines/before.json
+    python -m benchmarks.bench_generator --compare benchmarks/baselines/before.json
+    python -m benchmarks.bench_generator --scenario mwf-6 --engine mitm
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from scheduler.schedule_generator import ScheduleGenerator
+
+from .oracle import brute_force_top_scores, search_space
+from .synthetic_catalog import generate_catalog
+
+PREFERENCES = {
+    "mwf-morning": {
+        "preferred_days": ["M", "W", "F"],
+        "preferred_time": "morning",
+        "day_weight": 0.5,
+        "time_weight": 0.5,
+    },
+    "all-days-afternoon": {
+        "preferred_days": ["M", "T", "W", "R", "F"],
+        "preferred_time": "afternoon",
+        "day_weight": 0.5,
+        "time_weight": 0.5,
+    },
+    "tr-evening": {
+        "preferred_days": ["T", "R"],
+        "preferred_time": "evening",
+        "day_weight": 0.3,
+        "time_weight": 0.7,
+    },
+}
+
+# Meeting pattern weights (see synthetic_catalog.MEETING_PATTERNS) with
+# mostly two-day lecture patterns
+TR_HEAVY_PATTERNS = [0.2, 0.6, 0.1, 0.025, 0.025, 0.025, 0.025]
+
+SCENARIOS = [
+    # name, catalog arguments (see generate_catalog) and preferences
+    {"name": "mwf-4", "catalog": {"seed": 1, "num_courses": 4, "sections_per_course": (8, 14)},
+     "preferences": "mwf-morning"},
+    {"name": "mwf-6", "catalog": {"seed": 4, "num_courses": 6, "sections_per_course": (8, 14)},
+     "preferences": "mwf-morning"},
+    {"name": "all-days-6", "catalog": {"seed": 4, "num_courses": 6, "sections_per_course": (8, 14)},
+     "preferences": "all-days-afternoon"},
+    {"name": "online-heavy-5", "catalog": {"seed": 8, "num_courses": 5, "sections_per_course": (6, 10),
+                                          "online_share": 0.3},
+     "preferences": "mwf-morning"},
+    {"name": "tr-heavy-6", "catalog": {"seed": 9, "num_courses": 6, "sections_per_course": (6, 12),
+                                      "pattern_weights": TR_HEAVY_PATTERNS},
+     "preferences": "tr-evening"},
+    {"name": "mwf-8", "catalog": {"seed": 2, "num_courses": 8, "sections_per_course": (6, 12)},
+     "preferences": "mwf-morning"},
+]
+
+# Largest catalog (combinations of one section per course) the oracle enumerates
+ORACLE_MAX_SPACE = 1_000_000
+
+# Timings are the best of this many runs
+REPEATS = 3
+
+# Random schedules scored per scenario for the scorer throughput
+SCORER_SAMPLES = 2000
+
+# Searches stop after this many seconds
+TIMEOUT = 120
+
+# Relative slowdown of a timing or throughput reported as a regression
+TOLERANCE = 0.2
+
+# (metric, whether higher is better) compared against a baseline
+TIMED_METRICS = [
+    ("compile_ms", False),
+    ("search_seconds", False),
+    ("nodes_per_sec", True),
+    ("leaves_per_sec", True),
+    ("peak_kib", False),
+    ("score_schedule_per_sec", True),
+    ("score_batch_per_sec", True),
+]
+EXACT_METRICS = ["nodes", "leaves", "top_scores"]
+
+
+def search(section_dict, section_time_dict, preferences, engine, mode):
+    """Compile and search one request; return (generator, compile seconds, search seconds, scores)."""
+    started = time.perf_counter()
+    generator = ScheduleGenerator(section_dict, section_time_dict, [], preferences)
+    compiled = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedules, _ = generator.generate_schedules(timeout=TIMEOUT, engine=engine, mode=mode)
+    finished = time.perf_counter()
+    scores = [round(score, ScheduleGenerator.SCORE_DIGITS) for score, _ in schedules]
+    return generator, compiled - started, finished - compiled, scores
+
+
+def peak_memory(section_dict, section_time_dict, preferences, engine, mode):
+    """Peak bytes traced while compiling and searching one request."""
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    search(section_dict, section_time_dict, preferences, engine, mode)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return peak
+
+
+def scorer_throughput(generator, seed):
+    """Schedules per second scored by score_schedule and by score_batch."""
+    rng = random.Random(seed)
+    rows = np.array(
+        [
+            [rng.randrange(len(generator.sections)) for _ in generator.sorted_courses]
+            for _ in range(SCORER_SAMPLES)
+        ],
+        dtype=np.intp,
+    )
+    flat = [
+        tuple(slot for index in row for slot in generator.sections[index][1])
+        for row in rows.tolist()
+    ]
+
+    started = time.perf_counter()
+    for schedule in flat:
+        generator.scorer.score_schedule(schedule)
+    single = time.perf_counter() - started
+
+    started = time.perf_counter()
+    generator.scorer.score_batch(generator.score_table, rows)
+    batch = time.perf_counter() - started
+    return SCORER_SAMPLES / single, SCORER_SAMPLES / batch
+
+
+def run_scenario(scenario, engine, mode, check):
+    """Measure one scenario and return its metrics."""
+    catalog = generate_catalog(**scenario["catalog"])
+    preferences = PREFERENCES[scenario["preferences"]]
+
+    runs = [search(*catalog, preferences, engine, mode) for _ in range(REPEATS)]
+    generator, _, _, scores = runs[0]
+    compile_seconds = min(run[1] for run in runs)
+    search_seconds = min(run[2] for run in runs)
+    score_schedule_rate, score_batch_rate = scorer_throughput(generator, scenario["catalog"]["seed"])
+
+    oracle = "skipped"
+    if check and search_space(catalog[0]) <= ORACLE_MAX_SPACE:
+        expected = brute_force_top_scores(*catalog, [], preferences, generator.max_schedules)
+        same = len(expected) == len(scores) and all(
+            abs(actual - reference) <= 10 ** -ScheduleGenerator.SCORE_DIGITS
+            for actual, reference in zip(scores, expected)
+        )
+        oracle = "ok" if same else "mismatch"
+
+    return {
+        "space": generator.search_space_size(),
+        "compile_ms": round(compile_seconds * 1000, 3),
+        "search_seconds": round(search_seconds, 4),
+        "nodes": generator.nodes_visited,
+        "nodes_per_sec": round(generator.nodes_visited / search_seconds),
+        "leaves": generator.schedule_count,
+        "leaves_per_sec": round(generator.schedule_count / search_seconds),
+        "peak_kib": round(peak_memory(*catalog, preferences, engine, mode) / 1024, 1),
+        "score_schedule_per_sec": round(score_schedule_rate),
+        "score_batch_per_sec": round(score_batch_rate),
+        "stop_reason": generator.search_info["stop_reason"],
+        "top_scores": scores,
+        "oracle": oracle,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of every metric against a baseline; return the regressions."""
+    regressions = []
+    for name, metrics in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name}: not in baseline")
+            continue
+        for metric, higher_is_better in TIMED_METRICS:
+            change = (metrics[metric] - before[metric]) / before[metric] if before[metric] else 0.0
+            worse = -change if higher_is_better else change
+            flag = ""
+            if worse > tolerance:
+                flag = "  REGRESSION"
+                regressions.append(f"{name} {metric}")
+            print(f"{name:>16} {metric:>22} {before[metric]:>14} {metrics[metric]:>14} {change:>+8.1%}{flag}")
+        for metric in EXACT_METRICS:
+            if metrics[metric] != before[metric]:
+                print(f"{name:>16} {metric:>22} changed")
+                regressions.append(f"{name} {metric}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scenario", action="append", help="Only run the named scenarios")
+    parser.add_argument("--engine", default="dfs", choices=sorted(ScheduleGenerator.ENGINES))
+    parser.add_argument("--mode", default="exact", choices=sorted(ScheduleGenerator.MODES))
+    parser.add_argument("--no-check", action="store_true", help="Skip the brute-force oracle")
+    parser.add_argument("--save", help="Write the results as a JSON baseline to this path")
+    parser.add_argument("--compare", help="Compare the results with a JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    if os.environ.get("PYTHONHASHSEED") != "0":
+        os.environ["PYTHONHASHSEED"] = "0"
+        os.execv(sys.executable, [sys.executable, "-m", __spec__.name, *sys.argv[1:]])
+
+    scenarios = [
+        scenario for scenario in SCENARIOS
+        if not args.scenario or scenario["name"] in args.scenario
+    ]
+    header = (
+        f"{'scenario':>16} {'space':>10} {'compile ms':>10} {'search s':>9} {'nodes/s':>9} "
+        f"{'leaves/s':>9} {'peak KiB':>9} {'score/s':>8} {'batch/s':>9}  oracle"
+    )
+    print(header)
+    print("-" * len(header))
+    results = {}
+    for scenario in scenarios:
+        metrics = run_scenario(scenario, args.engine, args.mode, not args.no_check)
+        results[scenario["name"]] = metrics
+        stopped = f" (stopped: {metrics['stop_reason']})" if metrics["stop_reason"] else ""
+        print(
+            f"{scenario['name']:>16} {metrics['space']:>10} {metrics['compile_ms']:>10.2f} "
+            f"{metrics['search_seconds']:>9.3f} {metrics['nodes_per_sec']:>9} {metrics['leaves_per_sec']:>9} "
+            f"{metrics['peak_kib']:>9.1f} {metrics['score_schedule_per_sec']:>8} "
+            f"{metrics['score_batch_per_sec']:>9}  {metrics['oracle']}{stopped}"
+        )
+
+    report = {
+        "engine": args.engine,
+        "mode": args.mode,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        with open(args.save, "w") as baseline_file:
+            json.dump(report, baseline_file, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    failed = [name for name, metrics in results.items() if metrics["oracle"] == "mismatch"]
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print()
+        failed += compare(results, baseline, args.tolerance)
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
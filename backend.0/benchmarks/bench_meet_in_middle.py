@@ -0,0 +1,81 @@
+"""
+Meet-in-the-Middle Benchmark
+
+Compares the depth-first search with the meet-in-the-middle engine on seeded
+synthetic catalogs of 6-10 courses with realistic section density, for both
+day scores: the preferred-day score (M/W/F preferred), whose bound prunes
+well, and the distribution score (all weekdays preferred), whose bound is
+loose. Both engines must return the same scores; the table shows wall time
+and search nodes of each.
+
+Usage (from backend.0/):
+    python -m benchmarks.bench_meet_in_middle
+"""
+
+import contextlib
+import io
+import time
+
+from scheduler.schedule_generator import ScheduleGenerator
+
+from .synthetic_catalog import generate_catalog
+
+DAY_PREFERENCES = {
+    "M/W/F": ["M", "W", "F"],
+    "all days": ["M", "T", "W", "R", "F"],
+}
+
+SCENARIOS = [
+    # (seed, number of courses, (min, max) sections per course)
+    (4, 6, (8, 14)),
+    (1, 7, (6, 12)),
+    (3, 8, (4, 8)),
+    (2, 8, (6, 12)),
+    (6, 10, (6, 12)),
+]
+
+# Searches stop after this many seconds
+TIMEOUT = 120
+
+
+def run(engine, preferred_days, section_dict, section_time_dict):
+    """Run one search and return (scores, nodes visited, seconds, stop reason)."""
+    preferences = {
+        "preferred_days": preferred_days,
+        "preferred_time": "morning",
+        "day_weight": 0.5,
+        "time_weight": 0.5,
+    }
+    generator = ScheduleGenerator(section_dict, section_time_dict, [], preferences)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        schedules, _ = generator.generate_schedules(timeout=TIMEOUT, engine=engine)
+    seconds = time.perf_counter() - started
+    scores = [round(score, 9) for score, _ in schedules]
+    return scores, generator.nodes_visited, seconds, generator.search_info["stop_reason"]
+
+
+def main():
+    header = (
+        f"{'seed':>4} {'courses':>7} {'days':>8} {'space':>12} {'dfs nodes':>10} {'mitm nodes':>10} "
+        f"{'dfs s':>7} {'mitm s':>7} {'speedup':>7}  same"
+    )
+    print(header)
+    print("-" * len(header))
+    for seed, num_courses, sections in SCENARIOS:
+        catalog = generate_catalog(seed, num_courses, sections)
+        space = ScheduleGenerator(*catalog, [], {}).search_space_size()
+        for label, preferred_days in DAY_PREFERENCES.items():
+            dfs_scores, dfs_nodes, dfs_seconds, dfs_stop = run("dfs", preferred_days, *catalog)
+            mitm_scores, mitm_nodes, mitm_seconds, mitm_stop = run("mitm", preferred_days, *catalog)
+            same = "yes" if dfs_scores == mitm_scores else "no"
+            if dfs_stop or mitm_stop:
+                same += f" (stopped: dfs {dfs_stop}, mitm {mitm_stop})"
+            print(
+                f"{seed:>4} {num_courses:>7} {label:>8} {space:>12} {dfs_nodes:>10} {mitm_nodes:>10} "
+                f"{dfs_seconds:>7.2f} {mitm_seconds:>7.2f} {dfs_seconds / mitm_seconds:>7.1f}  {same}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Course Ordering Benchmark
+
+Compares the number of search nodes ScheduleGenerator visits with the static
+sorted_courses order against dynamic most-constrained-course ordering, on the
+same seeded synthetic catalogs.
+
+Usage (from backend.0/):
+    python -m benchmarks.bench_ordering
+"""
+
+import contextlib
+import io
+import time
+
+from scheduler.schedule_generator import ScheduleGenerator
+
+from .synthetic_catalog import generate_catalog
+
+PREFERENCES = {
+    "preferred_days": ["M", "W", "F"],
+    "preferred_time": "morning",
+    "day_weight": 0.5,
+    "time_weight": 0.5,
+}
+
+SCENARIOS = [
+    # (seed, number of courses, (min, max) sections per course)
+    (1, 4, (8, 14)),
+    (2, 5, (6, 10)),
+    (3, 6, (4, 8)),
+    (4, 7, (3, 6)),
+    (5, 8, (2, 5)),
+    (6, 8, (3, 5)),
+]
+
+
+def run(ordering, section_dict, section_time_dict):
+    """Run one search and return (nodes visited, schedules generated, seconds)."""
+    generator = ScheduleGenerator(
+        section_dict, section_time_dict, [], PREFERENCES, ordering=ordering
+    )
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_schedules()
+    return generator.nodes_visited, generator.schedule_count, time.perf_counter() - started
+
+
+def main():
+    header = f"{'seed':>4} {'courses':>7} {'static nodes':>13} {'dynamic nodes':>14} {'ratio':>6} {'static s':>9} {'dynamic s':>10}"
+    print(header)
+    print("-" * len(header))
+    for seed, num_courses, sections in SCENARIOS:
+        catalog = generate_catalog(seed, num_courses, sections)
+        static_nodes, _, static_seconds = run("static", *catalog)
+        dynamic_nodes, _, dynamic_seconds = run("dynamic", *catalog)
+        print(
+            f"{seed:>4} {num_courses:>7} {static_nodes:>13} {dynamic_nodes:>14} "
+            f"{dynamic_nodes / max(static_nodes, 1):>6.2f} {static_seconds:>9.2f} {dynamic_seconds:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
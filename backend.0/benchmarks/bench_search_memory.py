@@ -0,0 +1,80 @@
+"""
+Search Memory Benchmark
+
+Measures the memory the ScheduleGenerator search allocates while it runs,
+using tracemalloc, on seeded synthetic catalogs. For each catalog it reports
+the nodes visited, the peak traced memory above the compiled generator, and
+the time per node with and without tracing (best of REPEATS runs).
+tracemalloc pays for every allocation, so the traced overhead per node tracks
+how much the search allocates per node.
+
+Usage (from backend.0/):
+    python -m benchmarks.bench_search_memory
+"""
+
+import contextlib
+import io
+import time
+import tracemalloc
+
+from scheduler.schedule_generator import ScheduleGenerator
+
+from .synthetic_catalog import generate_catalog
+
+PREFERENCES = {
+    "preferred_days": ["M", "W", "F"],
+    "preferred_time": "morning",
+    "day_weight": 0.5,
+    "time_weight": 0.5,
+}
+
+SCENARIOS = [
+    # (seed, number of courses, (min, max) sections per course)
+    (1, 4, (8, 14)),
+    (2, 5, (6, 10)),
+    (3, 6, (4, 8)),
+    (4, 7, (3, 6)),
+    (5, 8, (2, 5)),
+]
+
+# Timings are the best of this many runs
+REPEATS = 3
+
+
+def run(section_dict, section_time_dict, traced):
+    """Run one search and return (nodes visited, seconds, peak traced bytes)."""
+    generator = ScheduleGenerator(section_dict, section_time_dict, [], PREFERENCES)
+    peak = 0
+    if traced:
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        generator.generate_schedules()
+    seconds = time.perf_counter() - started
+    if traced:
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        tracemalloc.stop()
+    return generator.nodes_visited, seconds, peak
+
+
+def main():
+    header = f"{'seed':>4} {'courses':>7} {'nodes':>8} {'peak KiB':>9} {'us/node':>8} {'traced us/node':>15}"
+    print(header)
+    print("-" * len(header))
+    for seed, num_courses, sections in SCENARIOS:
+        catalog = generate_catalog(seed, num_courses, sections)
+        untraced = [run(*catalog, traced=False) for _ in range(REPEATS)]
+        traced = [run(*catalog, traced=True) for _ in range(REPEATS)]
+        nodes = untraced[0][0]
+        seconds = min(result[1] for result in untraced)
+        traced_seconds = min(result[1] for result in traced)
+        peak = max(result[2] for result in traced)
+        print(
+            f"{seed:>4} {num_courses:>7} {nodes:>8} {peak / 1024:>9.1f} "
+            f"{seconds / nodes * 1e6:>8.2f} {traced_seconds / nodes * 1e6:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
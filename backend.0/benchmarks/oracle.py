@@ -0,0 +1,108 @@
+"""
+Brute-Force Oracle Module
+
+This module computes the top schedule scores of a request by enumerating
+every combination of one section per course, straight from the meeting
+times, with none of ScheduleGenerator's compilation, propagation or
+pruning. It is a reference for checking the generator's top-K on catalogs
+small enough to enumerate.
+
+Example Usage:
+    ```python
+    section_dict, section_time_dict = generate_catalog(seed=3, num_courses=4)
+    expected = brute_force_top_scores(section_dict, section_time_dict, [], preferences, 20)
+    ```
+"""
+
+from collections import defaultdict
+from itertools import combinations, product
+from typing import Any, Dict, List
+
+from scheduler.schedule_generator import ScheduleGenerator
+from scheduler.schedule_scoring import ScheduleScorer
+
+
+def overlaps(time1: Any, time2: Any) -> bool:
+    """Whether two meeting times share a day and a moment of time."""
+    return bool(
+        set(time1.days) & set(time2.days)
+        and time1.end_time > time2.begin_time
+        and time1.begin_time < time2.end_time
+    )
+
+
+def search_space(section_dict: Dict[Any, Any]) -> int:
+    """Number of combinations of one section per course, before any filtering."""
+    sizes = defaultdict(int)
+    for section in section_dict.values():
+        sizes[section.course] += 1
+    space = 1
+    for size in sizes.values():
+        space *= size
+    return space
+
+
+def brute_force_top_scores(
+    section_dict: Dict[Any, Any],
+    section_time_dict: Dict[Any, List[Any]],
+    breaks: List[Dict[str, Any]],
+    preferences: Dict[str, Any],
+    max_schedules: int,
+) -> List[float]:
+    """
+    Score every conflict-free schedule and return the best distinct scores.
+
+    Sections with a meeting starting during a break are left out, and scores
+    are told apart at ScheduleGenerator.SCORE_DIGITS decimal places, as by
+    the generator.
+
+    Args:
+        section_dict: Dictionary mapping CRNs to section information
+        section_time_dict: Dictionary mapping CRNs to time slots
+        breaks: List of break periods with begin_time and end_time
+        preferences: Dictionary of user scheduling preferences
+        max_schedules: Number of scores to return
+
+    Returns:
+        List[float]: Up to max_schedules distinct scores, rounded, best first
+    """
+    scorer = ScheduleScorer(preferences)
+    sections_by_course = defaultdict(list)
+    for crn, section in section_dict.items():
+        times = section_time_dict[crn]
+        if not any(
+            break_time["begin_time"] <= slot.begin_time <= break_time["end_time"]
+            for slot in times
+            for break_time in breaks
+        ):
+            sections_by_course[section.course].append(times)
+
+    courses = {section.course for section in section_dict.values()}
+    if len(sections_by_course) < len(courses):
+        return []  # A course has no section outside the breaks
+
+    # Compare every pair of sections once, by position in section_list
+    section_list = [times for options in sections_by_course.values() for times in options]
+    conflicts = {
+        (first, second)
+        for first, second in combinations(range(len(section_list)), 2)
+        if any(
+            overlaps(time1, time2)
+            for time1 in section_list[first]
+            for time2 in section_list[second]
+        )
+    }
+
+    positions = []
+    start = 0
+    for options in sections_by_course.values():
+        positions.append(range(start, start + len(options)))
+        start += len(options)
+
+    scores = set()
+    for schedule in product(*positions):
+        if any(pair in conflicts for pair in combinations(schedule, 2)):
+            continue
+        flat = tuple(slot for position in schedule for slot in section_list[position])
+        scores.add(round(scorer.score_schedule(flat), ScheduleGenerator.SCORE_DIGITS))
+    return sorted(scores, reverse=True)[:max_schedules]
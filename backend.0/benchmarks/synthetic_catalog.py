@@ -0,0 +1,119 @@
+"""
+Synthetic Catalog Module
+
+This module builds seeded, database-free course catalogs that look like Virginia
+Tech's Timetable of Classes, so the schedule generator can be exercised and
+measured without MySQL.
+
+Example Usage:
+    ```python
+    section_dict, section_time_dict = generate_catalog(seed=7, num_courses=6)
+    generator = ScheduleGenerator(section_dict, section_time_dict, [], preferences)
+    ```
+"""
+
+import random
+from datetime import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Meeting patterns as (days, duration in minutes, candidate start times)
+MEETING_PATTERNS = [
+    (("M", "W", "F"), 50, ["08:00", "09:05", "10:10", "11:15", "12:20", "13:25", "14:30", "15:35", "16:40"]),
+    (("T", "R"), 75, ["08:00", "09:30", "11:00", "12:30", "14:00", "15:30", "17:00"]),
+    (("M", "W"), 75, ["16:00", "17:30", "19:00"]),
+    (("M",), 170, ["08:00", "11:15", "14:30"]),
+    (("T",), 170, ["08:00", "11:00", "14:00"]),
+    (("W",), 170, ["08:00", "11:15", "14:30"]),
+    (("R",), 170, ["08:00", "11:00", "14:00"]),
+]
+PATTERN_WEIGHTS = [0.45, 0.35, 0.05, 0.04, 0.04, 0.04, 0.03]
+
+
+class SyntheticSection:
+    """Stand-in for scheduler.models.Section with the fields the pipeline reads."""
+
+    def __init__(self, crn: int, course: str, professor: str, location: str) -> None:
+        self.crn = crn
+        self.course = course
+        self.professor = professor
+        self.location = location
+        self.avg_gpa = None
+
+    def __repr__(self) -> str:
+        return f"{self.crn}: {self.course}"
+
+
+class SyntheticSectionTime:
+    """Stand-in for scheduler.models.SectionTime (one row per meeting day)."""
+
+    def __init__(self, crn: SyntheticSection, days: str, begin_time: time, end_time: time) -> None:
+        self.crn = crn
+        self.days = days
+        self.begin_time = begin_time
+        self.end_time = end_time
+
+    def __repr__(self) -> str:
+        return f"{self.crn.crn}: {self.days} {self.begin_time} - {self.end_time}"
+
+
+def _parse_time(value: str) -> time:
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+def _add_minutes(start: time, minutes: int) -> time:
+    total = start.hour * 60 + start.minute + minutes
+    return time(total // 60, total % 60)
+
+
+def generate_catalog(
+    seed: int = 0,
+    num_courses: int = 6,
+    sections_per_course: Tuple[int, int] = (6, 12),
+    online_share: float = 0.05,
+    pattern_weights: Optional[Sequence[float]] = None,
+) -> Tuple[Dict[int, Any], Dict[int, List[Any]]]:
+    """
+    Generate a seeded synthetic catalog.
+
+    Args:
+        seed: Random seed, so the same arguments always give the same catalog
+        num_courses: Number of distinct courses
+        sections_per_course: Inclusive (min, max) number of sections per course
+        online_share: Probability that a section is ONLINE/ARR with no meeting time
+        pattern_weights: Relative frequency of each of MEETING_PATTERNS among
+            sections with a meeting time (default: PATTERN_WEIGHTS)
+
+    Returns:
+        tuple: (section_dict, section_time_dict) in the shape returned by
+        SectionFetcher.fetch_sections
+    """
+    rng = random.Random(seed)
+    section_dict = {}
+    section_time_dict = {}
+    crn = 10000
+
+    for course_number in range(num_courses):
+        course = f"SYN-{1000 + course_number * 111}"
+        for _ in range(rng.randint(*sections_per_course)):
+            crn += 1
+            section = SyntheticSection(
+                crn, course, f"Professor {rng.randint(1, 40)}", f"Hall {rng.randint(100, 400)}"
+            )
+            section_dict[crn] = section
+
+            if rng.random() < online_share:
+                days = rng.choice(["ONLINE", "ARR"])
+                section_time_dict[crn] = [SyntheticSectionTime(section, days, time(0, 0), time(0, 0))]
+                continue
+
+            days, duration, starts = rng.choices(
+                MEETING_PATTERNS, weights=pattern_weights or PATTERN_WEIGHTS
+            )[0]
+            begin_time = _parse_time(rng.choice(starts))
+            end_time = _add_minutes(begin_time, duration)
+            section_time_dict[crn] = [
+                SyntheticSectionTime(section, day, begin_time, end_time) for day in days
+            ]
+
+    return section_dict, section_time_dict
@@ -138,6 +138,44 @@ LOGGING = {
 
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
 
+# Schedule search budget: requests may ask for less, never more
+SCHEDULE_SEARCH_TIMEOUT = env.float('SCHEDULE_SEARCH_TIMEOUT', default=90)
+SCHEDULE_SEARCH_MAX_NODES = env.int('SCHEDULE_SEARCH_MAX_NODES', default=50_000_000)
+# Processes a single large search may use (one CPU core each); 1 searches in the
+# request thread. Engine "auto" only picks the parallel search with more than 1.
+# Each web worker process starts its own pool of this size on its first parallel search.
+SCHEDULE_SEARCH_WORKERS = env.int('SCHEDULE_SEARCH_WORKERS', default=os.cpu_count() or 1)
+# Serve sections from an in-memory snapshot of the term catalog, reloaded in the
+# background when the scraper bumps the catalog version (checked every interval seconds)
+SCHEDULE_CATALOG_SNAPSHOT = env.bool('SCHEDULE_CATALOG_SNAPSHOT', default=True)
+SCHEDULE_CATALOG_CHECK_INTERVAL = env.float('SCHEDULE_CATALOG_CHECK_INTERVAL', default=30)
+# Catalog file written by `manage.py writecatalog`; while it exists, workers
+# memory-map it instead of loading the catalog from the database
+SCHEDULE_CATALOG_FILE = env.str('SCHEDULE_CATALOG_FILE', default=str(BASE_DIR / 'data' / 'term_catalog.bin'))
+# Cache complete schedule responses by canonical request in the "schedules" cache
+SCHEDULE_RESULT_CACHE = env.bool('SCHEDULE_RESULT_CACHE', default=True)
+# Let identical concurrent requests, in any worker, wait for the first one's
+# result instead of searching again (locks live in the "schedules" cache)
+SCHEDULE_COALESCE_REQUESTS = env.bool('SCHEDULE_COALESCE_REQUESTS', default=True)
+
+# The "schedules" cache is a directory shared by the workers on this machine;
+# entries expire after TIMEOUT seconds and the least recently used go first
+# once MAX_ENTRIES is reached
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'schedules': {
+        'BACKEND': 'scheduler.cache_backends.LRUFileBasedCache',
+        'LOCATION': env.str('SCHEDULE_CACHE_DIR', default=str(BASE_DIR / 'data' / 'schedule_cache')),
+        'TIMEOUT': env.int('SCHEDULE_CACHE_TTL', default=60 * 60),
+        'OPTIONS': {
+            'MAX_ENTRIES': env.int('SCHEDULE_CACHE_MAX_ENTRIES', default=5000),
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
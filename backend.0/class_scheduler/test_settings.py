@@ -0,0 +1,52 @@
+"""
+Django settings for the tests of the views and scheduler.main.
+
+The project settings need a .env file and MySQL, so these run the scheduler
+app on an in-memory SQLite database with local-memory caches. Tests patch
+fetch_sections and catalog_version, so no catalog is ever loaded.
+"""
+
+SECRET_KEY = 'test'
+
+DEBUG = False
+
+ALLOWED_HOSTS = ['*']
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'scheduler.apps.SchedulerConfig',
+    'rest_framework',
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+}
+
+TIME_ZONE = 'UTC'
+
+USE_TZ = True
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+SCHEDULE_SEARCH_TIMEOUT = 90
+SCHEDULE_SEARCH_MAX_NODES = 50_000_000
+SCHEDULE_SEARCH_WORKERS = 1
+SCHEDULE_CATALOG_SNAPSHOT = False
+SCHEDULE_CATALOG_CHECK_INTERVAL = 30
+SCHEDULE_CATALOG_FILE = '/nonexistent/term_catalog.bin'
+SCHEDULE_RESULT_CACHE = True
+SCHEDULE_COALESCE_REQUESTS = True
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'schedules': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'test-schedules',
+    },
+}
@@ -2,4 +2,5 @@
 set -e
 python manage.py migrate
 python manage.py makesuperuser
+python manage.py writecatalog
 # python manage.py runspider
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Beam Schedule Search Module
+
+This module finds near-optimal schedules quickly with a beam search over the
+same tree as ScheduleGenerator._dfs, for interactive requests too large to
+search exactly in time.
+
+The search goes one course level at a time. Every partial schedule in the
+beam is expanded with ScheduleGenerator._branch (most constrained course,
+forward checking and arc consistency), the children are ranked by the score
+of their sections so far (ScheduleScorer.score_batch, one batch per level),
+and the best beam_width are kept. The complete schedules of the last level
+are scored and offered to the heap.
+
+Optimality gap:
+    Every schedule the search did not reach is a completion of a partial
+    schedule it dropped from the beam (or, if the budget ran out, of one
+    still in the beam), so the largest optimistic estimate
+    (ScheduleScorer.upper_bound) among those bounds the score of any schedule
+    the search missed. Together with the best score found,
+    this gives an upper bound on the optimal score.
+
+Example Usage:
+    ```python
+    generator = ScheduleGenerator(section_dict, section_time_dict, breaks, preferences)
+    schedules, count = generator.generate_schedules(mode="beam", beam_width=64)
+    gap = generator.search_info["upper_bound"] - schedules[0][0]
+    ```
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .schedule_generator import ScheduleGenerator, ScheduleHeapElement, SearchStopped
+from .schedule_scoring import EMPTY_PROFILE
+
+logger = logging.getLogger(__name__)
+
+
+def run_beam_search(
+    generator: ScheduleGenerator,
+    beam_width: int,
+) -> Tuple[List[ScheduleHeapElement], Optional[float]]:
+    """
+    Search a generator's request with a beam of partial schedules.
+
+    The generator's budget, counters and seen_scores are updated as by its
+    own search; every child of a beam state counts as a node.
+
+    Args:
+        generator: Compiled generator with a fresh budget (see _reset_search)
+            and domains that are not None
+        beam_width: Number of partial schedules kept per course level
+
+    Returns:
+        Tuple[List[ScheduleHeapElement], Optional[float]]: The top
+        max_schedules schedules found, and an upper bound on the score of any
+        schedule (None if no schedule exists)
+    """
+    heap: List[ScheduleHeapElement] = []
+    scorer = generator.scorer
+    course_bounds = generator.course_bounds
+    unassigned = tuple(range(len(generator.sorted_courses)))
+
+    # States are (estimate, chosen sections, unassigned courses, domains, profile)
+    beam = [
+        (
+            scorer.upper_bound(EMPTY_PROFILE, course_bounds),
+            (),
+            unassigned,
+            generator.domains,
+            EMPTY_PROFILE,
+        )
+    ]
+    missed = -1.0  # Largest estimate of a state dropped from the beam
+    try:
+        while beam and beam[0][2]:
+            children = []
+            for _, chosen, unassigned, domains, profile in beam:
+                for index, remaining, narrowed, extended in generator._branch(unassigned, domains, profile):
+                    generator._count_node()
+                    estimate = scorer.upper_bound(extended, [course_bounds[course] for course in remaining])
+                    children.append((estimate, chosen + (index,), remaining, narrowed, extended))
+
+            if not children:
+                beam = []  # No partial schedule can be completed
+                break
+
+            # Rank by the score of the sections chosen so far; the stable sort
+            # keeps the best standalone sections first among equal scores
+            scores = scorer.score_batch(
+                generator.score_table, np.array([child[1] for child in children], dtype=np.intp)
+            )
+            children = [children[row] for row in np.argsort(-scores, kind="stable").tolist()]
+            if len(children) > beam_width:
+                missed = max([missed] + [child[0] for child in children[beam_width:]])
+                generator.nodes_pruned += len(children) - beam_width
+            beam = children[:beam_width]
+    except SearchStopped:
+        logger.info(f"Schedule generation stopped early: {generator.budget.stop_reason}")
+        missed = max([missed] + [state[0] for state in beam])
+    else:
+        if beam:
+            generator._score_leaves(np.array([state[1] for state in beam], dtype=np.intp), heap)
+
+    upper_bound = max([missed] + [-element.score for element in heap])
+    return heap, upper_bound if upper_bound >= 0 else None
@@ -0,0 +1,90 @@
+"""
+Cache Backends Module
+
+Django cache backends used by the scheduler.
+
+LRUFileBasedCache is Django's file-based cache, shared by every worker on
+the machine through the cache directory, with least-recently-used culling:
+when MAX_ENTRIES is reached it deletes the 1/CULL_FREQUENCY of the entries
+whose files were written longest ago, instead of a random selection. touch
+rewrites an entry's file, so callers that touch entries on every hit get
+LRU eviction. Its add is atomic across processes, so an add of a key no one
+holds can serve as a lock between the workers, and so is its incr, so the
+workers can share counters.
+"""
+
+import os
+import pickle
+import tempfile
+import zlib
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.files import locks
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """FileBasedCache that culls its least recently written (or touched) entries."""
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Set a key only if it is missing or expired, atomically across processes.
+
+        The entry is written to a temporary file and hard-linked to the key's
+        file name, which fails if another process created it first.
+        """
+        self._createdir()
+        fname = self._key_to_file(key, version)
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, "wb") as f:
+                self._write_content(f, timeout, value)
+            for _ in range(2):
+                try:
+                    os.link(tmp_path, fname)
+                    return True
+                except FileExistsError:
+                    if self.has_key(key, version):  # Deletes the file if it expired
+                        return False
+            return False
+        finally:
+            os.remove(tmp_path)
+
+    def incr(self, key, delta=1, version=None):
+        """
+        Add delta to a number, atomically across processes, keeping its expiry.
+
+        Like touch, the entry's file is rewritten in place under an exclusive
+        lock, so concurrent increments queue up instead of losing each other.
+        """
+        try:
+            with open(self._key_to_file(key, version), "r+b") as f:
+                locks.lock(f, locks.LOCK_EX)  # Released when the file is closed
+                if self._is_expired(f):
+                    raise ValueError(f"Key '{key}' not found")
+                start = f.tell()
+                value = pickle.loads(zlib.decompress(f.read())) + delta
+                f.seek(start)
+                f.write(zlib.compress(pickle.dumps(value, self.pickle_protocol)))
+                f.truncate()
+                return value
+        except FileNotFoundError:
+            raise ValueError(f"Key '{key}' not found") from None
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def written(fname):
+            try:
+                return os.path.getmtime(fname)
+            except FileNotFoundError:  # Deleted by another worker meanwhile
+                return 0.0
+
+        for fname in sorted(filelist, key=written)[:num_entries // self._cull_frequency]:
+            self._delete(fname)
@@ -0,0 +1,298 @@
+"""
+Catalog File Module
+
+This module writes the term's sections and meeting times to a compact,
+versioned binary file and reads it back through a memory map. Every
+gunicorn worker maps the same file, so the operating system keeps one copy
+of the catalog in its page cache for all of them, and opening the file
+reads only its header and course table.
+
+File layout (little-endian, every block 8-byte aligned):
+    - Header (HEADER): magic, format version, catalog version and the
+      number of courses, sections, meeting times and strings
+    - Courses (COURSE_DTYPE): one record per course code, in string order,
+      with the range of its sections
+    - Sections (SECTION_DTYPE): fixed-width records grouped by course;
+      text fields are indices into the string table and each section points
+      at its range of meeting times
+    - Meeting times (TIME_DTYPE): days (string index) and begin and end
+      seconds since midnight
+    - String table: STRING_OFFSET_DTYPE offsets (one more than the strings)
+      followed by the UTF-8 bytes of every distinct string
+
+Files are written to a temporary file next to the target and renamed over
+it, so readers only ever map complete files. A reader keeps its map open
+for as long as it is referenced; a newer file replaces the path without
+disturbing requests still reading the old one.
+
+Example Usage:
+    ```python
+    write_catalog_file(path, version, sections)
+    catalog = MappedCatalog(path)
+    section_dict, section_time_dict, missing = catalog.fetch_sections(courses)
+    ```
+"""
+
+import math
+import mmap
+import os
+import struct
+import tempfile
+from datetime import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = b"CFCATLG\0"
+FORMAT_VERSION = 1
+
+# magic, format version, catalog version, courses, sections, meeting times, strings
+HEADER = struct.Struct("<8sIqIIII")
+
+COURSE_DTYPE = np.dtype([("name", "<u4"), ("first", "<u4"), ("count", "<u4")])
+SECTION_TEXT_FIELDS = (
+    "title", "class_type", "modality", "credit_hours", "capacity", "professor", "location", "exam_code",
+)
+SECTION_DTYPE = np.dtype(
+    [("crn", "<u4"), ("course", "<u4")]
+    + [(field, "<u4") for field in SECTION_TEXT_FIELDS]
+    + [("avg_gpa", "<f8"), ("first_time", "<u4"), ("time_count", "<u4")]
+)
+TIME_DTYPE = np.dtype([("days", "<u4"), ("begin", "<u4"), ("end", "<u4")])
+STRING_OFFSET_DTYPE = np.dtype("<u4")
+
+
+class CatalogSection:
+    """Section read from a catalog file, with the Section model's fields."""
+
+    __slots__ = ("crn", "course") + SECTION_TEXT_FIELDS + ("avg_gpa",)
+
+    def __init__(self, **fields: Any) -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+    def __str__(self) -> str:
+        return f"{self.crn}: {self.course}"
+
+
+class CatalogSectionTime:
+    """Meeting time read from a catalog file, with the SectionTime model's fields."""
+
+    __slots__ = ("crn", "days", "begin_time", "end_time")
+
+    def __init__(self, crn: CatalogSection, days: str, begin_time: time, end_time: time) -> None:
+        self.crn = crn
+        self.days = days
+        self.begin_time = begin_time
+        self.end_time = end_time
+
+    def __str__(self) -> str:
+        return f"{self.crn}: {self.days} {self.begin_time} - {self.end_time}"
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _seconds(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _time(seconds: int) -> time:
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def _layout(courses: int, sections: int, times: int, strings: int) -> Dict[str, int]:
+    """Byte offset of every block of a file with the given record counts."""
+    offsets = {}
+    offset = _aligned(HEADER.size)
+    for block, size in (
+        ("courses", courses * COURSE_DTYPE.itemsize),
+        ("sections", sections * SECTION_DTYPE.itemsize),
+        ("times", times * TIME_DTYPE.itemsize),
+        ("string_offsets", (strings + 1) * STRING_OFFSET_DTYPE.itemsize),
+    ):
+        offsets[block] = offset
+        offset = _aligned(offset + size)
+    offsets["strings"] = offset
+    return offsets
+
+
+def write_catalog_file(path: str, version: int, sections: Iterable[Tuple[Any, List[Any]]]) -> int:
+    """
+    Write sections and their meeting times to a catalog file, atomically.
+
+    Args:
+        path: File to write; replaced by a rename once complete
+        version: Catalog version the sections were read at
+        sections: (section, meeting times) pairs with the fields of the
+            Section and SectionTime models
+
+    Returns:
+        int: Number of sections written
+    """
+    strings: Dict[str, int] = {}
+
+    def intern(value: Any) -> int:
+        return strings.setdefault("" if value is None else str(value), len(strings))
+
+    by_course: Dict[str, List[Tuple[Any, List[Any]]]] = {}
+    for section, times in sections:
+        by_course.setdefault(section.course, []).append((section, times))
+    course_names = sorted(by_course)
+
+    courses = np.zeros(len(course_names), dtype=COURSE_DTYPE)
+    section_rows = []
+    time_rows = []
+    for row, course in enumerate(course_names):
+        courses[row] = (intern(course), len(section_rows), len(by_course[course]))
+        for section, times in by_course[course]:
+            gpa = section.avg_gpa
+            section_rows.append(
+                (section.crn, intern(course))
+                + tuple(intern(getattr(section, field)) for field in SECTION_TEXT_FIELDS)
+                + (math.nan if gpa is None else gpa, len(time_rows), len(times))
+            )
+            time_rows.extend(
+                (intern(slot.days), _seconds(slot.begin_time), _seconds(slot.end_time)) for slot in times
+            )
+
+    encoded = [value.encode() for value in strings]  # Dicts keep insertion (index) order
+    string_offsets = np.zeros(len(encoded) + 1, dtype=STRING_OFFSET_DTYPE)
+    string_offsets[1:] = np.cumsum([len(value) for value in encoded])
+    blocks = {
+        "courses": courses.tobytes(),
+        "sections": np.array(section_rows, dtype=SECTION_DTYPE).tobytes(),
+        "times": np.array(time_rows, dtype=TIME_DTYPE).tobytes(),
+        "string_offsets": string_offsets.tobytes(),
+        "strings": b"".join(encoded),
+    }
+    layout = _layout(len(course_names), len(section_rows), len(time_rows), len(encoded))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix=".catalog-", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as output:
+            output.write(HEADER.pack(
+                MAGIC, FORMAT_VERSION, version, len(course_names), len(section_rows), len(time_rows), len(encoded)
+            ))
+            for block, data in blocks.items():
+                output.write(b"\0" * (layout[block] - output.tell()))
+                output.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return len(section_rows)
+
+
+def read_catalog_version(path: str) -> Optional[int]:
+    """
+    Read the catalog version from a file's header.
+
+    Args:
+        path: Catalog file
+
+    Returns:
+        Optional[int]: The catalog version, or None if there is no such file
+    """
+    try:
+        with open(path, "rb") as catalog_file:
+            header = catalog_file.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    return _unpack_header(header, path)[1]
+
+
+def _unpack_header(header: bytes, path: str) -> Tuple[int, ...]:
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a catalog file")
+    magic, format_version, *fields = HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a catalog file")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"{path} has catalog format {format_version}, expected {FORMAT_VERSION}")
+    return (format_version, *fields)
+
+
+class MappedCatalog:
+    """
+    Read-only view of a catalog file through a memory map.
+
+    Has the interface of term_catalog.TermCatalog (version, len and
+    fetch_sections), so a TermCatalogStore can serve it. Records are read
+    from the map and turned into CatalogSection and CatalogSectionTime
+    objects only for the requested courses.
+
+    Attributes:
+        path (str): The mapped file
+        version (int): Catalog version the file was written at
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Map a catalog file.
+
+        Args:
+            path: Catalog file written by write_catalog_file
+        """
+        self.path = path
+        with open(path, "rb") as catalog_file:
+            self._map = mmap.mmap(catalog_file.fileno(), 0, access=mmap.ACCESS_READ)
+        _, self.version, courses, sections, times, strings = _unpack_header(self._map, path)
+        layout = _layout(courses, sections, times, strings)
+        self._courses = np.frombuffer(self._map, COURSE_DTYPE, courses, layout["courses"])
+        self._sections = np.frombuffer(self._map, SECTION_DTYPE, sections, layout["sections"])
+        self._times = np.frombuffer(self._map, TIME_DTYPE, times, layout["times"])
+        self._string_offsets = np.frombuffer(
+            self._map, STRING_OFFSET_DTYPE, strings + 1, layout["string_offsets"]
+        ).tolist()
+        self._strings_start = layout["strings"]
+        self._course_rows = {
+            self._string(name): row for row, name in enumerate(self._courses["name"].tolist())
+        }
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def _string(self, index: int) -> str:
+        start = self._strings_start + self._string_offsets[index]
+        end = self._strings_start + self._string_offsets[index + 1]
+        return self._map[start:end].decode()
+
+    def fetch_sections(self, courses: List[str]) -> Tuple[Dict, Dict, List[str]]:
+        """
+        Return the sections of the courses.
+
+        Args:
+            courses: Course codes of the request
+
+        Returns:
+            Tuple[Dict, Dict, List[str]]: section_dict, section_time_dict and
+            the courses without sections, like SectionFetcher.fetch_sections
+        """
+        section_dict, section_time_dict, missing_sections = {}, {}, []
+        for course in courses:
+            row = self._course_rows.get(course)
+            if row is None:
+                missing_sections.append(course)
+                continue
+            _, first, count = self._courses[row].tolist()
+            for record in self._sections[first:first + count].tolist():
+                crn, _, *text, avg_gpa, first_time, time_count = record
+                section = CatalogSection(
+                    crn=crn,
+                    course=course,
+                    avg_gpa=None if math.isnan(avg_gpa) else avg_gpa,
+                    **{field: self._string(index) for field, index in zip(SECTION_TEXT_FIELDS, text)},
+                )
+                section_dict[crn] = section
+                section_time_dict[crn] = [
+                    CatalogSectionTime(section, self._string(days), _time(begin), _time(end))
+                    for days, begin, end in self._times[first_time:first_time + time_count].tolist()
+                ]
+        return section_dict, section_time_dict, missing_sections
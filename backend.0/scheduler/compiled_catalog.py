@@ -0,0 +1,199 @@
+"""
+Compiled Catalog Module
+
+This module turns the Section and SectionTime objects of a request
+(SectionFetcher output) into a compact catalog of plain records and array
+columns. ScheduleGenerator compiles its search problem from the catalog, so
+the ORM objects are read once per request and are only needed again to hand
+the final top schedules to ScheduleFormatter.
+
+Layout:
+    Sections are numbered in section_dict order. Their meeting times are
+    stored back to back as CompiledSlot records, section i owning
+    slots[slot_start[i]:slot_start[i + 1]], with parallel array columns of
+    the begin and end minute of day and a day mask per slot. Bit k of a day
+    mask stands for the day character day_lanes[k].
+
+Example Usage:
+    ```python
+    section_dict, section_time_dict, _ = SectionFetcher(courses).fetch_sections()
+    catalog = CompiledCatalog.compile(section_dict, section_time_dict)
+    masks = catalog.occupancy_masks()
+    blocked = catalog.starts_during(breaks)
+    ```
+"""
+
+from array import array
+from datetime import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+def minute_of_day(t: time) -> int:
+    """Convert a time of day to minutes since midnight."""
+    return t.hour * 60 + t.minute
+
+
+class CompiledSlot:
+    """One meeting time of a section, detached from its SectionTime."""
+
+    __slots__ = ("days", "begin_time", "end_time", "begin", "end")
+
+    def __init__(self, days: str, begin_time: time, end_time: time) -> None:
+        self.days = days
+        self.begin_time = begin_time
+        self.end_time = end_time
+        self.begin = minute_of_day(begin_time)  # Minutes since midnight
+        self.end = minute_of_day(end_time)
+
+    def __repr__(self) -> str:
+        return f"CompiledSlot({self.days!r}, {self.begin_time}, {self.end_time})"
+
+
+class CompiledCatalog:
+    """
+    The sections of a request as plain records and array columns.
+
+    Attributes:
+        crns (List): CRN of each section
+        courses (List[str]): Course codes, in order of first appearance
+        section_course (array): Index into courses of each section
+        slot_start (array): Offset of each section's first slot, followed by
+            the total number of slots
+        slots (List[CompiledSlot]): Meeting times of all sections, grouped
+            by section
+        slot_begin (array): Begin minute of day of each slot
+        slot_end (array): End minute of day of each slot
+        slot_days (array): Day mask of each slot, over day_lanes
+        day_lanes (Tuple[str, ...]): Distinct day characters, sorted
+    """
+
+    __slots__ = (
+        "crns",
+        "courses",
+        "section_course",
+        "slot_start",
+        "slots",
+        "slot_begin",
+        "slot_end",
+        "slot_days",
+        "day_lanes",
+    )
+
+    def __init__(
+        self,
+        crns: List[Any],
+        courses: List[str],
+        section_course: array,
+        slot_start: array,
+        slots: List[CompiledSlot],
+        day_lanes: Tuple[str, ...],
+    ) -> None:
+        self.crns = crns
+        self.courses = courses
+        self.section_course = section_course
+        self.slot_start = slot_start
+        self.slots = slots
+        self.day_lanes = day_lanes
+        self.slot_begin = array("H", (slot.begin for slot in slots))
+        self.slot_end = array("H", (slot.end for slot in slots))
+        lane_bits = {day: 1 << lane for lane, day in enumerate(day_lanes)}
+        self.slot_days = array(
+            "Q", (sum(lane_bits[day] for day in set(slot.days)) for slot in slots)
+        )
+
+    @classmethod
+    def compile(
+        cls, section_dict: Dict[Any, Any], section_time_dict: Dict[Any, List[Any]]
+    ) -> "CompiledCatalog":
+        """
+        Copy the fields the search reads out of fetched sections.
+
+        Args:
+            section_dict: Dictionary mapping CRNs to Section objects
+            section_time_dict: Dictionary mapping CRNs to lists of SectionTime objects
+
+        Returns:
+            CompiledCatalog: The request's sections in section_dict order
+        """
+        crns = list(section_dict)
+        course_index: Dict[str, int] = {}
+        section_course = array("i")
+        slot_start = array("i", [0])
+        slots: List[CompiledSlot] = []
+        for crn, section in section_dict.items():
+            section_course.append(course_index.setdefault(section.course, len(course_index)))
+            slots.extend(
+                CompiledSlot(slot.days, slot.begin_time, slot.end_time)
+                for slot in section_time_dict[crn]
+            )
+            slot_start.append(len(slots))
+
+        day_lanes = tuple(sorted({day for slot in slots for day in slot.days}))
+        return cls(crns, list(course_index), section_course, slot_start, slots, day_lanes)
+
+    def __len__(self) -> int:
+        """Number of sections."""
+        return len(self.crns)
+
+    def section_slots(self, section: int) -> Tuple[CompiledSlot, ...]:
+        """Meeting times of one section."""
+        return tuple(self.slots[self.slot_start[section]:self.slot_start[section + 1]])
+
+    def occupancy_masks(self) -> List[int]:
+        """
+        Compile every section's meeting times into a single occupancy bitmask.
+
+        The time axis is split at every distinct begin/end minute of the
+        catalog, so each bit stands for one elementary interval on one day.
+        Two meeting times overlap exactly when they share such an interval,
+        which makes conflict detection between sections a single integer AND.
+        Meetings with no duration (online/ARR) occupy no bits, since they can
+        never overlap another meeting.
+
+        Returns:
+            List[int]: Occupancy bitmask of each section
+        """
+        boundaries = sorted(set(self.slot_begin) | set(self.slot_end))
+        position = {minute: index for index, minute in enumerate(boundaries)}
+        lane_width = max(len(boundaries) - 1, 0)
+
+        masks = []
+        for section in range(len(self.crns)):
+            mask = 0
+            for slot in range(self.slot_start[section], self.slot_start[section + 1]):
+                first = position[self.slot_begin[slot]]
+                last = position[self.slot_end[slot]]
+                if last <= first:
+                    continue
+                span = ((1 << (last - first)) - 1) << first
+                days = self.slot_days[slot]
+                while days:
+                    lowest = days & -days
+                    days ^= lowest
+                    mask |= span << ((lowest.bit_length() - 1) * lane_width)
+            masks.append(mask)
+        return masks
+
+    def starts_during(self, breaks: Sequence[Dict[str, time]]) -> List[int]:
+        """
+        Find the sections with a meeting that starts during a break.
+
+        Args:
+            breaks: Break periods with begin_time and end_time
+
+        Returns:
+            List[int]: Indices of the sections, ascending
+        """
+        periods = [
+            (minute_of_day(break_time["begin_time"]), minute_of_day(break_time["end_time"]))
+            for break_time in breaks
+        ]
+        return [
+            section
+            for section in range(len(self.crns))
+            if any(
+                begin <= self.slot_begin[slot] <= end
+                for slot in range(self.slot_start[section], self.slot_start[section + 1])
+                for begin, end in periods
+            )
+        ]
@@ -5,7 +5,12 @@ from collections import defaultdict
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "class_scheduler.settings")
 django.setup()
 
-from scheduler.models import Section, SectionTime
+from django.conf import settings
+from django.db import connection, transaction
+
+from scheduler.catalog_file import MappedCatalog, read_catalog_version
+from scheduler.models import CatalogVersion, Section, SectionTime
+from scheduler.term_catalog import TermCatalog, TermCatalogStore
 
 
 class SectionFetcher:
@@ -67,3 +72,55 @@ class SectionFetcher:
                 missing_sections.append(course)
 
         return self.section_dict, self.section_time_dict, missing_sections
+
+
+def fetch_term_catalog():
+    """
+    Fetch every section and its times as a TermCatalog at the current catalog version.
+
+    Returns:
+        TermCatalog: The term's sections and meeting times by course.
+    """
+    with transaction.atomic():  # One consistent read of the version and the sections
+        version = CatalogVersion.current()
+        sections = list(Section.objects.prefetch_related("sectiontime_set"))
+    section_dict = {section.crn: section for section in sections}
+    section_time_dict = {
+        section.crn: list(section.sectiontime_set.all()) for section in sections
+    }
+    return TermCatalog(version, section_dict, section_time_dict)
+
+
+def close_connection():
+    """
+    Close the calling thread's database connection.
+
+    Django only closes the connections of request threads, so the term
+    catalog's background refresh thread would otherwise leak its own.
+    """
+    connection.close()
+
+
+def load_term_catalog():
+    """
+    Load the term catalog from the catalog file, or from the database if there is none.
+
+    Returns:
+        TermCatalog or MappedCatalog: The term's sections and meeting times by course.
+    """
+    if os.path.exists(settings.SCHEDULE_CATALOG_FILE):
+        return MappedCatalog(settings.SCHEDULE_CATALOG_FILE)
+    return fetch_term_catalog()
+
+
+def read_term_catalog_version():
+    """Return the version load_term_catalog would load, from the file's header if there is one."""
+    version = read_catalog_version(settings.SCHEDULE_CATALOG_FILE)
+    return CatalogVersion.current() if version is None else version
+
+
+# Process-wide snapshot of the term's sections used by the API views
+term_catalog = TermCatalogStore(
+    load_term_catalog, read_term_catalog_version, settings.SCHEDULE_CATALOG_CHECK_INTERVAL,
+    release=close_connection,
+)
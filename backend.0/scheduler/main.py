@@ -1,30 +1,118 @@
-from .fetch_sections import SectionFetcher
+import json
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .compiled_catalog import CompiledCatalog
+from .fetch_sections import SectionFetcher, term_catalog
+from .models import CatalogVersion
+from .request_coalescing import RequestFlights
+from .result_cache import ScheduleResultCache, request_key
 from .schedule_formatter import ScheduleFormatter
-from .schedule_generator import ScheduleGenerator
+from .schedule_generator import ScheduleGenerator, SearchBudget
+from .search_estimator import choose_strategy, estimate_search
+
+logger = logging.getLogger(__name__)
 
-def process_schedules(courses, breaks, preferences, max_schedules=20):
+# Responses of earlier requests, shared by the workers through the "schedules" cache
+result_cache = ScheduleResultCache(caches["schedules"])
+
+# Searches in progress, which identical requests in any worker wait for. Partial
+# results depend on the leader's budget, so waiters search by themselves instead.
+request_flights = RequestFlights(
+    caches["schedules"], shareable=lambda result: not isinstance(result, tuple) or not result[2]["partial"]
+)
+
+def process_schedules(courses, breaks, preferences, max_schedules=20, timeout=90, max_nodes=None, workers=1,
+                      engine="dfs", mode="exact", beam_width=ScheduleGenerator.BEAM_WIDTH):
     """
     Main function to generate and format schedules for the given list of courses and input.
     
     This function orchestrates the entire process of fetching course sections,
-    generating schedules, and formatting the results.
+    generating schedules, and formatting the results. With SCHEDULE_RESULT_CACHE
+    on, results of complete exact searches are cached and identical later
+    requests are answered from the cache (see result_cache). Partial, beam and
+    approximate results depend on the timeout, workers and engine chosen, so
+    they are never cached. With
+    SCHEDULE_COALESCE_REQUESTS on, identical concurrent requests wait for the
+    first one's result instead of searching again (see request_coalescing).
 
     Args:
         courses (list): A list of course codes to generate schedules for.
         breaks (list): A list of break times to exclude from schedules.
         preferences (dict): A dictionary of user preferences for scheduling.
         max_schedules (int, optional): The maximum number of schedules to return. Defaults to 10.
+        timeout (float, optional): Seconds the search may run before returning its best schedules so far. Defaults to 90.
+        max_nodes (int, optional): Maximum number of search nodes to expand. Defaults to no limit.
+        workers (int, optional): Number of processes to search large requests with. Defaults to 1.
+        engine (str, optional): "dfs" for the depth-first search, "mip" for the integer-programming search,
+            which suits requests with many courses or sections, "mitm" for the meet-in-the-middle search,
+            which suits requests with many courses, or "auto" to pick a strategy from the request's
+            estimated search time (see search_estimator.choose_strategy). Defaults to "dfs".
+        mode (str, optional): "exact" to search with engine, "beam" for a fast beam search that may miss the
+            best schedules, or "auto" to use the beam search only where search_estimator.choose_strategy
+            picks it. Defaults to "exact".
+        beam_width (int, optional): Partial schedules the beam search keeps per course. Defaults to 64.
         
     Returns:
-        list: A list of formatted schedules as dictionaries with names, days, and CRNs.
+        tuple: A list of formatted schedules as dictionaries with names, days, and CRNs,
+            the number of schedules generated, the search info (partial flag, stop reason, nodes explored,
+            mode used and an upper bound on the best score) and the request's stats (see request_stats).
+        list: Error messages if a course has no sections or two courses can never fit together.
     """
     # logger.info(f"Processing schedules for courses: {courses}")
     # logger.debug(f"Preferences: {preferences}")
     # logger.debug(f"Breaks: {breaks}")
     
-    # Step 1: Fetch sections from the database
-    section_fetcher = SectionFetcher(courses)
-    section_dict, section_time_dict, missing_sections = section_fetcher.fetch_sections()
+    # Step 0: Answer identical requests from the result cache or from a search already running
+    key = None
+    if settings.SCHEDULE_RESULT_CACHE or settings.SCHEDULE_COALESCE_REQUESTS:
+        key = request_key(
+            courses, breaks, preferences, catalog_version(),
+            max_schedules=max_schedules, engine=engine, mode=mode, beam_width=beam_width,
+        )
+
+    def search(budget):
+        result = compute_schedules(
+            courses, breaks, preferences, max_schedules, budget, max_nodes, workers,
+            engine, mode, beam_width,
+        )
+        if key and settings.SCHEDULE_RESULT_CACHE and isinstance(result, tuple):
+            result[3]["cache"] = "miss"
+            if is_cacheable(result[2]):
+                result_cache.set(key, result)
+        return result
+
+    result = result_cache.get(key) if key and settings.SCHEDULE_RESULT_CACHE else None
+    if result is not None:
+        result = result[:3] + ({**result[3], "cache": "hit"},)
+    elif key and settings.SCHEDULE_COALESCE_REQUESTS:
+        result, coalesced = request_flights.run(key, timeout, search)
+        if coalesced and isinstance(result, tuple):
+            result = result[:3] + ({**result[3], "coalesced": True},)
+    else:
+        result = search(timeout)
+
+    if isinstance(result, tuple):
+        logger.info(json.dumps({"event": "schedule_stats", **result[3]}))
+    return result
+
+
+def compute_schedules(courses, breaks, preferences, max_schedules=20, timeout=90, max_nodes=None, workers=1,
+                      engine="dfs", mode="exact", beam_width=ScheduleGenerator.BEAM_WIDTH):
+    """
+    Fetch sections, search and format the schedules of a request, bypassing the result cache.
+
+    Takes the arguments and returns the results of process_schedules.
+    """
+    # Step 1: Fetch sections from the term catalog snapshot or the database
+    started = time.perf_counter()
+    section_dict, section_time_dict, missing_sections = fetch_sections(courses)
+    fetched = time.perf_counter()
     
     if missing_sections:
         error_messages = [f"No sections found for {course}" for course in missing_sections]
@@ -33,7 +121,23 @@ def process_schedules(courses, breaks, preferences, max_schedules=20):
     # Step 2: Generate and score valid schedules dynamically
     # logger.info("Generating schedules")
     schedule_generator = ScheduleGenerator(section_dict, section_time_dict, breaks, preferences, max_schedules)
-    top_schedules, total_schedules = schedule_generator.generate_schedules()
+    compiled = time.perf_counter()
+    
+    if schedule_generator.conflicting_courses:
+        first_course, second_course = schedule_generator.conflicting_courses
+        return [f"No sections found for {first_course} that fit with {second_course}"]
+    
+    estimate = strategy = None
+    if engine == "auto":
+        estimate, strategy, (engine, mode, workers) = resolve_auto(
+            schedule_generator, breaks, timeout, mode, workers
+        )
+
+    top_schedules, total_schedules = schedule_generator.generate_schedules(
+        timeout=timeout, max_nodes=max_nodes, workers=workers,
+        engine=engine, mode=mode, beam_width=beam_width,
+    )
+    searched = time.perf_counter()
     
     # logger.info(f"Generated {len(top_schedules)} schedules")
     
@@ -42,4 +146,240 @@ def process_schedules(courses, breaks, preferences, max_schedules=20):
     formatted_schedules = formatter.print_ranked_schedules(top_schedules, top_n=max_schedules)
     
     # logger.info("Schedule processing complete")
-    return (formatted_schedules, total_schedules)
\ No newline at end of file
+    stats = request_stats(
+        schedule_generator, courses, engine,
+        fetch=fetched - started, compile=compiled - fetched, search=searched - compiled,
+        format=time.perf_counter() - searched,
+    )
+    if strategy:
+        stats["strategy"] = strategy
+        stats["estimate"] = estimate._asdict()
+    return (formatted_schedules, total_schedules, schedule_generator.search_info, stats)
+
+
+def is_cacheable(search_info):
+    """
+    Return whether a search's result is the same for every timeout, worker count and engine.
+
+    Only complete exact searches qualify: a partial result depends on how far the search got,
+    and a beam search result on its width and on the strategy an "auto" request resolved to.
+    """
+    return search_info["mode"] == "exact" and not search_info["partial"]
+
+
+def catalog_version():
+    """Return the version of the catalog requests are served from."""
+    if settings.SCHEDULE_CATALOG_SNAPSHOT:
+        return term_catalog.get().version
+    return CatalogVersion.current()
+
+
+def resolve_auto(schedule_generator, breaks, timeout, mode, workers):
+    """
+    Pick the strategy of an engine "auto" request from its estimated search time.
+
+    Args:
+        schedule_generator (ScheduleGenerator): The request's compiled generator.
+        breaks (list): A list of break times to exclude from schedules.
+        timeout (float): Seconds the search may run.
+        mode (str): The requested search mode.
+        workers (int): Processes available to the search.
+
+    Returns:
+        tuple: The search_estimator.SearchEstimate, the strategy chosen and the
+            (engine, mode, workers) to search with (see strategy_options).
+    """
+    estimate = estimate_search(schedule_generator.catalog, breaks)
+    strategy = choose_strategy(estimate, timeout, workers)
+    return estimate, strategy, strategy_options(strategy, mode, workers)
+
+
+def strategy_options(strategy, mode, workers):
+    """
+    Translate a strategy of search_estimator.choose_strategy into search options.
+
+    Only the "parallel" and "beam" strategies keep the workers. "dfs" is chosen for
+    searches too short to repay starting work on the process pool (or when there is a
+    single worker), and the meet-in-the-middle search runs in one process, so both
+    search with a single worker.
+
+    Args:
+        strategy (str): "dfs", "parallel", "mitm" or "beam".
+        mode (str): The requested search mode, kept unless the strategy is "beam". "auto" resolves to
+            "beam" for the beam strategy and "exact" otherwise.
+        workers (int): Processes available to the search.
+
+    Returns:
+        tuple: The engine, mode and number of workers to search with.
+    """
+    if strategy == "beam":
+        return "dfs", "beam", workers
+    if mode == "auto":
+        mode = "exact"
+    if strategy == "parallel":
+        return "dfs", mode, workers
+    return strategy, mode, 1
+
+
+def estimate_schedules(courses, breaks, timeout=90, workers=1):
+    """
+    Estimate the number of schedules of a request and its search time, without searching.
+
+    Args:
+        courses (list): A list of course codes.
+        breaks (list): A list of break times to exclude from schedules.
+        timeout (float, optional): Seconds a search of the request may run. Defaults to 90.
+        workers (int, optional): Number of processes a search may use. Defaults to 1.
+
+    Returns:
+        dict: The fields of search_estimator.SearchEstimate and the strategy an "auto" search would use.
+        list: Error messages if a course has no sections.
+    """
+    section_dict, section_time_dict, missing_sections = fetch_sections(courses)
+
+    if missing_sections:
+        return [f"No sections found for {course}" for course in missing_sections]
+
+    estimate = estimate_search(CompiledCatalog.compile(section_dict, section_time_dict), breaks)
+    return {**estimate._asdict(), "strategy": choose_strategy(estimate, timeout, workers)}
+
+
+def request_stats(schedule_generator, courses, engine, **phase_seconds):
+    """
+    Combine a request's phase timings with its generator's search counters.
+
+    Args:
+        schedule_generator (ScheduleGenerator): The generator after its search.
+        courses (list): The requested course codes.
+        engine (str): The search engine requested.
+        **phase_seconds: Seconds spent in each phase (fetch, compile, search, format).
+
+    Returns:
+        dict: The courses, engine and mode used, seconds per phase (with "score", the part of the
+            search spent scoring complete schedules), and the search counters of
+            ScheduleGenerator.search_stats (nodes visited and pruned by reason, leaves scored,
+            heap replacements and search space size).
+    """
+    search_stats = dict(schedule_generator.search_stats)
+    timings = {phase: round(seconds, 6) for phase, seconds in phase_seconds.items()}
+    timings["score"] = search_stats.pop("score_seconds")
+    return {
+        "courses": list(courses),
+        "engine": engine,
+        "mode": schedule_generator.search_info["mode"],
+        "seconds": timings,
+        **search_stats,
+    }
+
+
+def fetch_sections(courses):
+    """
+    Fetch sections and times for the courses.
+
+    With SCHEDULE_CATALOG_SNAPSHOT on, sections come from the worker's term
+    catalog snapshot; otherwise from the database.
+
+    Args:
+        courses (list): A list of course codes.
+
+    Returns:
+        tuple: section_dict, section_time_dict and the courses without sections.
+    """
+    if settings.SCHEDULE_CATALOG_SNAPSHOT:
+        return term_catalog.get().fetch_sections(courses)
+    return SectionFetcher(courses).fetch_sections()
+
+
+def stream_schedules(courses, breaks, preferences, max_schedules=20, timeout=90, max_nodes=None,
+                     progress_interval=ScheduleGenerator.PROGRESS_INTERVAL, mode="exact",
+                     beam_width=ScheduleGenerator.BEAM_WIDTH):
+    """
+    Generate schedules like process_schedules, yielding results while the search runs.
+
+    The search runs in a background thread and reports progress to this
+    generator through a queue. Sections are fetched and schedules formatted in
+    the calling thread, so all database access stays on the request's
+    connection. Closing the generator early (e.g. when the client disconnects)
+    cancels the search. Only the serial depth-first search reports progress, so
+    streamed requests are always searched by it, in one process.
+
+    Args:
+        courses (list): A list of course codes to generate schedules for.
+        breaks (list): A list of break times to exclude from schedules.
+        preferences (dict): A dictionary of user preferences for scheduling.
+        max_schedules (int, optional): The maximum number of schedules to return. Defaults to 20.
+        timeout (float, optional): Seconds the search may run before returning its best schedules so far. Defaults to 90.
+        max_nodes (int, optional): Maximum number of search nodes to expand. Defaults to no limit.
+        progress_interval (float, optional): Minimum seconds between progress events.
+        mode, beam_width: Search options, as for process_schedules. A beam search streams just
+            its result, which it finds quickly.
+
+    Yields:
+        tuple: (event, data) pairs. "progress" events carry nodes explored and
+            pruned, the estimated fraction of the search covered, the best score
+            and elapsed seconds. "schedules" events carry the current top
+            formatted schedules whenever they change. The last event is
+            "result", whose data matches the response of the blocking endpoint:
+            either the error messages or the final schedules with search info.
+    """
+    section_dict, section_time_dict, missing_sections = fetch_sections(courses)
+
+    if missing_sections:
+        yield ("result", {"schedules": [f"No sections found for {course}" for course in missing_sections]})
+        return
+
+    schedule_generator = ScheduleGenerator(section_dict, section_time_dict, breaks, preferences, max_schedules)
+
+    if schedule_generator.conflicting_courses:
+        first_course, second_course = schedule_generator.conflicting_courses
+        yield ("result", {"schedules": [f"No sections found for {first_course} that fit with {second_course}"]})
+        return
+
+    events = queue.Queue()
+    budget = SearchBudget(timeout, max_nodes)
+
+    def search():
+        try:
+            result = schedule_generator.generate_schedules(
+                budget=budget,
+                progress=lambda report: events.put(("progress", report)),
+                progress_interval=progress_interval,
+                mode=mode,
+                beam_width=beam_width,
+            )
+        except Exception as e:
+            events.put(("error", e))
+        else:
+            events.put(("done", result))
+
+    search_thread = threading.Thread(target=search, name="schedule-search", daemon=True)
+    search_thread.start()
+
+    formatter = ScheduleFormatter(date_format="%I:%M %p")
+    try:
+        while True:
+            kind, payload = events.get()
+            if kind == "error":
+                raise payload
+
+            if kind == "done":
+                top_schedules, total_schedules = payload
+                search_info = schedule_generator.search_info
+                yield ("result", {
+                    "schedules": formatter.print_ranked_schedules(top_schedules, top_n=max_schedules),
+                    "total_schedules": total_schedules,
+                    "partial": search_info["partial"],
+                    "search": search_info,
+                })
+                return
+
+            schedules = payload.pop("schedules")
+            yield ("progress", payload)
+            if schedules is not None:
+                yield ("schedules", {
+                    "schedules": formatter.print_ranked_schedules(schedules, top_n=max_schedules),
+                    "best_score": payload["best_score"],
+                })
+    finally:
+        if search_thread.is_alive():
+            budget.cancel("client_disconnected")
@@ -0,0 +1,265 @@
+"""
+Meet-in-the-Middle Schedule Search Module
+
+This module finds a ScheduleGenerator's top schedules by splitting the
+courses into two halves, enumerating every internally consistent
+half-schedule of each half, and joining the halves, as an alternative to the
+depth-first search for requests with many courses (7-8 and up).
+
+Half-schedules:
+    Each half is enumerated depth-first over the arc-consistent domains,
+    choosing only sections compatible with the ones already chosen. A left
+    half-schedule keeps the bitset of section classes compatible with all of
+    its sections (the AND of their compatibility rows, i.e. the classes whose
+    occupancy masks do not overlap it). The score components of a
+    half-schedule (time total, slot count, weekday and other day counts) are
+    sums over its sections, so the half-schedules form a ScoreTable of their
+    own and a joined pair is scored with ScheduleScorer.score_batch on two
+    rows.
+
+Join:
+    For every class of the right half, a bitset over the right
+    half-schedules marks the ones containing it. A left half-schedule's
+    compatible partners are the right half-schedules containing none of the
+    right classes it rules out, so finding them is an OR over those classes'
+    bitsets. Left half-schedules are joined in order of an optimistic bound
+    (ScheduleScorer.upper_bound over the right half's course bounds); once
+    the heap is full, only partners beating its lowest score are offered, and
+    the join stops at the first left half-schedule whose bound cannot.
+
+Nodes count half-schedule search nodes plus joined left half-schedules
+against the generator's SearchBudget. A half with more than
+MAX_HALF_SCHEDULES half-schedules is not enumerated; the request is then
+searched depth-first instead.
+
+Example Usage:
+    ```python
+    generator = ScheduleGenerator(section_dict, section_time_dict, breaks, preferences)
+    schedules, count = generator.generate_schedules(engine="mitm")
+    ```
+"""
+
+import logging
+import math
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from .schedule_generator import ScheduleGenerator, ScheduleHeapElement, SearchStopped
+from .schedule_scoring import EMPTY_PROFILE, ScoreTable
+
+logger = logging.getLogger(__name__)
+
+# Largest number of half-schedules enumerated for one half
+MAX_HALF_SCHEDULES = 200_000
+
+
+class HalfTooLarge(Exception):
+    """Raised when a half has more than MAX_HALF_SCHEDULES half-schedules."""
+
+
+def split_courses(generator: ScheduleGenerator) -> Tuple[List[int], List[int]]:
+    """
+    Split the courses into two halves with balanced search spaces.
+
+    Courses are assigned largest domain first, each to the half whose product
+    of domain sizes is smaller so far.
+
+    Args:
+        generator: Compiled generator whose domains are not None
+
+    Returns:
+        Tuple[List[int], List[int]]: Indices into sorted_courses of the left
+        and right half
+    """
+    halves: Tuple[List[int], List[int]] = ([], [])
+    sizes = [0.0, 0.0]  # Log of each half's product of domain sizes
+    by_size = sorted(
+        range(len(generator.domains)),
+        key=lambda course: generator.domains[course].bit_count(),
+        reverse=True,
+    )
+    for course in by_size:
+        half = 0 if sizes[0] <= sizes[1] else 1
+        halves[half].append(course)
+        sizes[half] += math.log(generator.domains[course].bit_count())
+    return halves
+
+
+def enumerate_half(
+    generator: ScheduleGenerator, courses: List[int]
+) -> Tuple[List[Tuple[int, ...]], List[int]]:
+    """
+    Enumerate every consistent choice of one section class per course.
+
+    Args:
+        generator: Compiled generator with a budget (see _reset_search)
+        courses: Indices into sorted_courses of the half's courses
+
+    Returns:
+        Tuple[List[Tuple[int, ...]], List[int]]: The half-schedules, as
+        section class indices in courses order, and the bitset of classes
+        compatible with each
+
+    Raises:
+        SearchStopped: When the search budget is exhausted
+        HalfTooLarge: When there are more than MAX_HALF_SCHEDULES
+    """
+    domains = generator.domains
+    compatibility = generator.compatibility
+    half_schedules: List[Tuple[int, ...]] = []
+    allowed_sets: List[int] = []
+
+    def extend(position: int, chosen: Tuple[int, ...], allowed: int) -> None:
+        generator._count_node()
+        if position == len(courses):
+            if len(half_schedules) == MAX_HALF_SCHEDULES:
+                raise HalfTooLarge()
+            half_schedules.append(chosen)
+            allowed_sets.append(allowed)
+            return
+
+        options = domains[courses[position]] & allowed
+        while options:
+            lowest = options & -options
+            options ^= lowest
+            index = lowest.bit_length() - 1
+            extend(position + 1, chosen + (index,), allowed & compatibility[index])
+
+    extend(0, (), -1)
+    return half_schedules, allowed_sets
+
+
+def _bitset_indices(bits: int, size: int) -> np.ndarray:
+    """Positions of the set bits of a bitset over size items, ascending."""
+    packed = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed, bitorder="little")[:size])
+
+
+def _half_table(generator: ScheduleGenerator, *halves: List[Tuple[int, ...]]) -> ScoreTable:
+    """Score components of the half-schedules of each half in turn, summed over their sections."""
+    rows = [np.array(half_schedules, dtype=np.intp) for half_schedules in halves]
+    return ScoreTable(
+        *(
+            np.concatenate([column[half_rows].sum(axis=1) for half_rows in rows])
+            for column in generator.score_table
+        )
+    )
+
+
+def run_meet_in_middle(
+    generator: ScheduleGenerator,
+) -> List[ScheduleHeapElement]:
+    """
+    Find a generator's top schedules by joining enumerated half-schedules.
+
+    The generator's budget, counters and seen_scores are updated as by its
+    own search.
+
+    Args:
+        generator: Compiled generator with a fresh budget (see _reset_search)
+            and domains that are not None
+
+    Returns:
+        List[ScheduleHeapElement]: The top max_schedules schedules
+    """
+    heap: List[ScheduleHeapElement] = []
+    left_courses, right_courses = split_courses(generator)
+    try:
+        try:
+            lefts, left_allowed = enumerate_half(generator, left_courses)
+            rights, _ = enumerate_half(generator, right_courses)
+        except HalfTooLarge:
+            logger.info("Half-schedules exceed MAX_HALF_SCHEDULES, searching depth-first")
+            unassigned = tuple(range(len(generator.sorted_courses)))
+            generator._dfs(unassigned, (), generator.domains, EMPTY_PROFILE, heap)
+            return heap
+        if not lefts or not rights:
+            return heap
+        _join(generator, right_courses, lefts, left_allowed, rights, heap)
+    except SearchStopped:
+        logger.info(f"Schedule generation stopped early: {generator.budget.stop_reason}")
+    return heap
+
+
+def _join(
+    generator: ScheduleGenerator,
+    right_courses: List[int],
+    lefts: List[Tuple[int, ...]],
+    left_allowed: List[int],
+    rights: List[Tuple[int, ...]],
+    heap: List[ScheduleHeapElement],
+) -> None:
+    """
+    Score compatible pairs of half-schedules and keep the top N.
+
+    Args:
+        generator: Compiled generator with a budget (see _reset_search)
+        right_courses: Courses of the right half
+        lefts: Left half-schedules
+        left_allowed: Classes compatible with each left half-schedule
+        rights: Right half-schedules
+        heap: Priority queue containing the top N schedules
+
+    Raises:
+        SearchStopped: When the search budget is exhausted
+    """
+    scorer = generator.scorer
+    table = _half_table(generator, lefts, rights)
+
+    # Bitset over the right half-schedules containing each right class
+    containing = {}
+    for column in np.array(rights, dtype=np.intp).T:
+        for index in np.unique(column).tolist():
+            packed = np.packbits(column == index, bitorder="little")
+            containing[index] = int.from_bytes(packed.tobytes(), "little")
+    right_classes = 0
+    for index in containing:
+        right_classes |= 1 << index
+    everyone = (1 << len(rights)) - 1
+
+    # Join the left half-schedules with the best possible completion first
+    remaining = [generator.course_bounds[course] for course in right_courses]
+    bounds = []
+    for chosen in lefts:
+        profile = EMPTY_PROFILE
+        for index in chosen:
+            profile = scorer.combine_profiles(profile, generator.section_profiles[index])
+        bounds.append(scorer.upper_bound(profile, remaining))
+
+    order = sorted(range(len(lefts)), key=bounds.__getitem__, reverse=True)
+    for position, left in enumerate(order):
+        generator._count_node()
+        full = len(heap) >= generator.max_schedules
+        if full and bounds[left] + generator.BOUND_TOLERANCE <= -heap[0].score:
+            generator.nodes_pruned += len(lefts) - position
+            break
+
+        # Partners must avoid every right class this half-schedule rules out
+        excluded = right_classes & ~left_allowed[left]
+        conflicting = 0
+        while excluded:
+            lowest = excluded & -excluded
+            excluded ^= lowest
+            conflicting |= containing[lowest.bit_length() - 1]
+        partners = _bitset_indices(everyone & ~conflicting, len(rights))
+        if not len(partners):
+            continue
+
+        pairs = np.column_stack((np.full(len(partners), left), len(lefts) + partners))
+        started = time.perf_counter()
+        scores = scorer.score_batch(table, pairs)
+        generator.score_seconds += time.perf_counter() - started
+        generator.leaves_scored += len(partners)
+        candidates = np.arange(len(partners))
+        if len(heap) >= generator.max_schedules:
+            candidates = np.flatnonzero(scores > -heap[0].score)
+        offered = 0
+        for row in candidates[np.argsort(-scores[candidates], kind="stable")].tolist():
+            score = float(scores[row])
+            if len(heap) >= generator.max_schedules and score <= -heap[0].score:
+                break
+            generator._offer(score, lefts[left] + rights[partners[row]], heap)
+            offered += 1
+        generator.schedule_count += len(partners) - offered
@@ -0,0 +1,447 @@
+"""
+MIP Schedule Search Module
+
+This module finds a ScheduleGenerator's top schedules with a 0-1 integer
+program solved by the mip package (CBC), as an alternative to the
+depth-first search for requests with many courses or sections.
+
+Model:
+    - One binary variable per section class left in a course's domain, and
+      exactly one class per course
+    - Conflicts as clique constraints: the compiled occupancy masks split the
+      week into intervals, and at most one chosen class may occupy each
+      interval. Two classes conflict exactly when they share an interval.
+      Sections meeting during a break were already dropped by the generator.
+    - The score is a mean time score over meeting slots plus a day score,
+      neither of which is linear in the choice. Both depend on small integer
+      totals, so schedules are split into strata: by slot total and class
+      count per weekday for the distribution score (all weekdays preferred),
+      by slot total and day-entry total otherwise. Within a stratum the time
+      score is linear, the distribution score is a constant computed by
+      ScheduleScorer, and the preferred-day ratio is linear, with each
+      spacing bonus a binary that is 1 exactly when both of its days have a
+      class.
+
+Strata are selected by changing the right-hand sides of equality
+constraints, so one continuous model serves all their LP relaxations. Each
+MIP solve builds a fresh model with its stratum's no-good cuts: re-solving a
+CBC model after adding cuts has returned ERROR, and optima below the
+stratum's best schedule. Every solution is re-scored with
+ScheduleScorer.score_batch before it is offered to the heap.
+
+Top-K enumeration:
+    Strata wait in a priority queue by an upper bound on their scores: at
+    first one that ignores conflicts, then their LP relaxation, then the
+    optimum of a MIP solve, which also yields the stratum's best schedule.
+    When a solved stratum comes first, its schedule is offered to the heap,
+    excluded with a no-good cut (sum of its chosen variables <= courses - 1)
+    and the stratum is solved again. Enumeration stops once no stratum can
+    beat the lowest kept score of a full heap. Each LP or MIP solve counts as
+    one search node against the generator's SearchBudget.
+
+    Like the depth-first search, the result holds one schedule per score.
+    Once a stratum yields a schedule tying a kept score, its later solves are
+    capped below that score (less OBJECTIVE_TOLERANCE) to skip the other ties.
+
+    A solve that stops early with time left (CBC reports ERROR) raises
+    SolverError, and the search finishes with the depth-first search, which
+    keeps the schedules found so far.
+
+Example Usage:
+    ```python
+    generator = ScheduleGenerator(section_dict, section_time_dict, breaks, preferences)
+    schedules, count = generator.generate_schedules(engine="mip")
+    ```
+"""
+
+import heapq
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from mip import BINARY, CONTINUOUS, INF, MAXIMIZE, LinExpr, Model, OptimizationStatus, xsum
+from mip.cbc import cbc_set_parameter
+
+from .schedule_generator import ScheduleGenerator, ScheduleHeapElement, SearchStopped
+from .schedule_scoring import EMPTY_PROFILE
+
+logger = logging.getLogger(__name__)
+
+# Scores within this of the lowest kept score are still searched, so solver
+# round-off never ends the enumeration early
+OBJECTIVE_TOLERANCE = 1e-7
+
+# Feasibility tolerance of the solver, well below OBJECTIVE_TOLERANCE so a
+# score cap cannot be slipped by rounding
+SOLVER_TOLERANCE = 1e-9
+
+# How a queued stratum's bound was found: ignoring conflicts, by the LP
+# relaxation, or by a MIP solve that also found the stratum's best schedule
+ESTIMATED, RELAXED, SOLVED = 0, 1, 2
+
+
+class SolverError(Exception):
+    """Raised when a solve stops without a result before the deadline."""
+
+
+class MipSearch:
+    """
+    Top-K enumeration of one generator's request with a shared CBC model.
+
+    A stratum is a tuple of totals over the chosen classes: the slot total,
+    then either the class count of each weekday (distribution score) or the
+    number of day entries (preferred-day score).
+
+    Attributes:
+        generator (ScheduleGenerator): Compiled generator being searched
+        courses (List[List[int]]): Section class indices in each course's domain
+        coefficients (np.ndarray): (totals, classes) contribution of each
+            class to each stratum total
+        strata (List[Tuple[int, ...]]): Reachable totals
+        bounds (List[float]): Optimistic score of each stratum, ignoring conflicts
+        day_scores (np.ndarray): Exact day score of each distribution stratum
+        caps (List[float]): Upper limit on the scores still searched per stratum
+        cuts (List[List[Tuple[int, ...]]]): Schedules found in each stratum,
+            cut out of its later solves
+        relaxation (StratumProgram): The linear relaxation
+    """
+
+    def __init__(self, generator: ScheduleGenerator) -> None:
+        self.generator = generator
+        self.scorer = generator.scorer
+        self.preferences = generator.scorer.preferences
+        self.distribution = self.preferences.preferred_days == self.scorer.VALID_DAYS
+        self.courses = [
+            [index for index in range(len(generator.sections)) if domain >> index & 1]
+            for domain in generator.domains
+        ]
+        table = generator.score_table
+        self.time_totals = table.time_totals
+        self.preferred_counts = np.array(
+            [profile.preferred_count for profile in generator.section_profiles]
+        )
+        if self.distribution:
+            rows = [table.slot_counts, *table.weekday_counts.T]
+        else:
+            rows = [table.slot_counts, table.weekday_counts.sum(axis=1) + table.other_day_counts]
+        self.coefficients = np.array(rows).astype(int)
+
+        preferred_day_list = sorted(self.preferences.preferred_days)
+        self.spacing_pairs = [
+            (self.scorer.WEEKDAYS.index(day1), self.scorer.WEEKDAYS.index(day2))
+            for day1, day2 in zip(preferred_day_list, preferred_day_list[1:])
+            if abs(ord(day2) - ord(day1)) >= 2
+        ]
+
+        self._find_strata()
+        self.caps = [1.0] * len(self.strata)
+        self.cuts: List[List[Tuple[int, ...]]] = [[] for _ in self.strata]
+        self.relaxation = StratumProgram(self, CONTINUOUS)
+
+    def _find_strata(self) -> None:
+        """Enumerate reachable strata and bound each one's score, ignoring conflicts."""
+        # Best time total and preferred-day count per stratum, kept separately
+        best = {(0,) * len(self.coefficients): (0.0, 0)}
+        for indices in self.courses:
+            options: Dict[Tuple[int, ...], Tuple[float, int]] = {}
+            for index in indices:
+                key = tuple(self.coefficients[:, index].tolist())
+                time_total, preferred = options.get(key, (0.0, 0))
+                options[key] = (
+                    max(time_total, self.time_totals[index]),
+                    max(preferred, self.preferred_counts[index]),
+                )
+            combined: Dict[Tuple[int, ...], Tuple[float, int]] = {}
+            for key, (time_total, preferred) in best.items():
+                for option, (option_time, option_preferred) in options.items():
+                    merged = tuple(a + b for a, b in zip(key, option))
+                    kept_time, kept_preferred = combined.get(merged, (-1.0, -1))
+                    combined[merged] = (
+                        max(kept_time, time_total + option_time),
+                        max(kept_preferred, preferred + option_preferred),
+                    )
+            best = combined
+        self.strata = sorted(best)
+
+        if self.distribution:
+            counts = np.array([stratum[1:] for stratum in self.strata], dtype=float)
+            self.day_scores = self.scorer._batch_distribution_scores(counts)
+        spacing_bonus = 0.1 * len(self.spacing_pairs)
+        self.bounds = []
+        for position, stratum in enumerate(self.strata):
+            time_total, preferred = best[stratum]
+            if self.distribution:
+                day_score = self.day_scores[position]
+            else:
+                day_score = min(preferred / stratum[1] + spacing_bonus, 1.0) if stratum[1] else 0.0
+            self.bounds.append(self._score(stratum[0], time_total, day_score))
+
+    def _score(self, slots: int, time_total: float, day_score: float) -> float:
+        """Score of a schedule from its slot total, sum of time scores and day score."""
+        if not slots:
+            return 0.0
+        return min(
+            self.preferences.time_weight * min(time_total / slots, 1.0)
+            + self.preferences.day_weight * day_score,
+            1.0,
+        )
+
+    def solve(self, stratum: int, relax: bool = False) -> Optional[Tuple[float, Tuple[int, ...]]]:
+        """
+        Find the best schedule of a stratum, or bound it by the LP relaxation.
+
+        Args:
+            stratum: Position of the stratum in strata
+            relax: Solve only the linear relaxation, for a cheap bound
+
+        Returns:
+            Optional[Tuple[float, Tuple[int, ...]]]: An upper bound on the
+            stratum's scores and the best schedule's section class indices
+            (empty when relaxed), or None if the stratum has no schedule left
+            or the deadline hit inside the solve. The deadline cancels the
+            budget, so the search stops and reports a partial result instead
+            of silently dropping the stratum
+
+        Raises:
+            SolverError: If the solve stopped without a result before the deadline
+        """
+        generator = self.generator
+        budget = generator.budget
+        if relax:
+            program = self.relaxation
+        else:
+            program = StratumProgram(self, BINARY)
+            for chosen in self.cuts[stratum]:
+                program.exclude(chosen)
+        program.select(stratum, self.caps[stratum])
+
+        remaining = INF if budget.deadline is None else budget.deadline - time.monotonic()
+        status = program.model.optimize(max_seconds=max(remaining, 0.0))
+        generator.nodes_visited += 1
+        if status == OptimizationStatus.INFEASIBLE:
+            return None
+        if status != OptimizationStatus.OPTIMAL:
+            if budget.deadline is not None and time.monotonic() >= budget.deadline:
+                budget.cancel("deadline")
+                return None
+            raise SolverError(f"CBC stopped with status {status.name}")
+        if relax:
+            return program.model.objective_value, ()
+        chosen = tuple(index for index, choice in program.choices.items() if choice.x >= 0.5)
+        return program.model.objective_bound, chosen
+
+    def exclude(self, stratum: int, chosen: Tuple[int, ...], tie: Optional[float] = None) -> None:
+        """
+        Cut a found schedule out of its stratum's later solves.
+
+        Args:
+            stratum: Stratum the schedule belongs to
+            chosen: Section class indices of the schedule
+            tie: The schedule's score if it tied with a kept schedule. The
+                heap keeps one schedule per score and solves return a
+                stratum's schedules best first, so the stratum's remaining
+                schedules are then capped below it, skipping further ties in
+                one solve. Caps make solves slower, so they are only set once
+                ties show up.
+        """
+        if tie is not None:
+            self.caps[stratum] = min(self.caps[stratum], tie - OBJECTIVE_TOLERANCE)
+        self.cuts[stratum].append(chosen)
+
+
+class StratumProgram:
+    """
+    One CBC model of a MipSearch's request, with the stratum selectable.
+
+    Attributes:
+        model (Model): The program
+        choices (Dict[int, Var]): Variable of each section class index
+    """
+
+    def __init__(self, search: MipSearch, var_type: str) -> None:
+        """Build the model; strata are selected through constraint right-hand sides."""
+        self.search = search
+        generator = search.generator
+        model = Model(sense=MAXIMIZE, solver_name="CBC")
+        model.verbose = 0
+        model.threads = 1
+        model.preprocess = 0  # Presolve can report OPTIMAL for re-solves that are infeasible
+        model.infeas_tol = model.integer_tol = SOLVER_TOLERANCE
+        # With primal heuristics on, CBC has reported optima below a stratum's
+        # best schedule, which the enumeration would then skip. Orbital
+        # branching prints to stdout.
+        cbc_set_parameter(model.solver, "heur", "off")
+        cbc_set_parameter(model.solver, "OrbitalBranching", "off")
+        self.model = model
+
+        # Exactly one class per course
+        self.choices = {}
+        for course, indices in enumerate(search.courses):
+            for index in indices:
+                self.choices[index] = model.add_var(var_type=var_type, lb=0.0, ub=1.0, name=f"x_{index}")
+            model += xsum(self.choices[index] for index in indices) == 1, f"course_{course}"
+
+        # At most one chosen class per occupied interval of the week
+        occupants: Dict[int, List[int]] = {}
+        for index in self.choices:
+            mask = generator.section_masks[generator.sections[index][0]]
+            while mask:
+                low = mask & -mask
+                occupants.setdefault(low.bit_length(), []).append(index)
+                mask ^= low
+        for members in {tuple(members) for members in occupants.values() if len(members) > 1}:
+            model += xsum(self.choices[index] for index in members) <= 1
+
+        # Totals no class contributes to are always 0 and need no constraint
+        self.total_constraints = [
+            model.add_constr(self._total(row) == 0) if row[list(self.choices)].any() else None
+            for row in search.coefficients
+        ]
+
+        # Each spacing bonus is 1 exactly when both of its days have a class
+        weekday_counts = generator.score_table.weekday_counts
+        present = {}
+        for column in {column for pair in search.spacing_pairs for column in pair}:
+            present[column] = model.add_var(var_type=var_type, lb=0.0, ub=1.0)
+            on_day = [choice for index, choice in self.choices.items() if weekday_counts[index, column] > 0]
+            model += present[column] <= xsum(on_day)
+            model += xsum(on_day) <= len(search.courses) * present[column]
+        self.bonuses = []
+        for column1, column2 in search.spacing_pairs:
+            bonus = model.add_var(var_type=var_type, lb=0.0, ub=1.0)
+            model += bonus <= present[column1]
+            model += bonus <= present[column2]
+            model += bonus >= present[column1] + present[column2] - 1
+            self.bonuses.append(bonus)
+
+        # The score equals the schedule's score, so capping it excludes every
+        # schedule scoring above the cap. Its link to the choice depends on
+        # the stratum; see select. The day score of preferred days is capped
+        # at 1, which clipped marks.
+        self.score = model.add_var(lb=0.0, ub=1.0)
+        self.day_score = model.add_var(lb=0.0, ub=1.0)
+        self.clipped = model.add_var(var_type=var_type, lb=0.0, ub=1.0)
+        self.stratum_constraints: List = []
+        model.objective = self.score
+
+    def exclude(self, chosen: Tuple[int, ...]) -> None:
+        """Add a no-good cut excluding one schedule's section classes."""
+        self.model += xsum(self.choices[index] for index in chosen) <= len(chosen) - 1
+
+    def _total(self, coefficients) -> LinExpr:
+        """Sum of the class variables weighted by coefficients."""
+        return xsum(
+            float(coefficients[index]) * choice
+            for index, choice in self.choices.items()
+            if coefficients[index]
+        )
+
+    def select(self, stratum: int, cap: float) -> None:
+        """
+        Restrict the model to one stratum's schedules scoring at most cap.
+
+        Args:
+            stratum: Position of the stratum in the search's strata
+            cap: Upper limit on the score
+        """
+        search = self.search
+        preferences = search.preferences
+        model = self.model
+        totals = search.strata[stratum]
+        for constraint, total in zip(self.total_constraints, totals):
+            if constraint is not None:
+                constraint.rhs = total
+
+        # Within the stratum the time score is linear, and so is the day score:
+        # a constant for distribution scoring, the preferred-day ratio plus
+        # spacing bonuses (at most 1) otherwise
+        model.remove(self.stratum_constraints)
+        slots = totals[0]
+        if not slots:
+            self.stratum_constraints = [model.add_constr(self.score == 0)]
+        else:
+            self.stratum_constraints = [
+                model.add_constr(
+                    self.score
+                    == preferences.time_weight / slots * self._total(search.time_totals)
+                    + preferences.day_weight * self.day_score
+                )
+            ]
+            if search.distribution:
+                self.stratum_constraints.append(
+                    model.add_constr(self.day_score == float(search.day_scores[stratum]))
+                )
+            elif totals[1]:
+                # day_score = min(ratio + bonuses, 1): the ratio plus bonuses
+                # unless clipped, and 1 only if they reach 1
+                day_score = self._total(search.preferred_counts / totals[1]) + 0.1 * xsum(self.bonuses)
+                largest = 1.0 + 0.1 * len(self.bonuses)
+                self.stratum_constraints += [
+                    model.add_constr(self.day_score <= day_score),
+                    model.add_constr(self.day_score >= day_score - largest * self.clipped),
+                    model.add_constr(self.day_score >= self.clipped),
+                ]
+            else:
+                self.stratum_constraints.append(model.add_constr(self.day_score == 0))
+
+        self.score.ub = cap
+
+
+def run_mip_search(
+    generator: ScheduleGenerator,
+) -> List[ScheduleHeapElement]:
+    """
+    Enumerate a generator's top schedules by repeated MIP solves.
+
+    The generator's budget, counters and seen_scores are updated as by its
+    own search; nodes_visited counts solves. If CBC fails on a solve, the
+    depth-first search takes over with the schedules found so far.
+
+    Args:
+        generator: Compiled generator with a fresh budget (see _reset_search)
+            and domains that are not None
+
+    Returns:
+        List[ScheduleHeapElement]: The top max_schedules schedules
+    """
+    heap: List[ScheduleHeapElement] = []
+    budget = generator.budget
+    search = MipSearch(generator)
+
+    def floor() -> float:
+        if len(heap) < generator.max_schedules:
+            return -1.0
+        return -heap[0].score - OBJECTIVE_TOLERANCE
+
+    # Entries are (-score bound, stratum, how the bound was found, best
+    # schedule). Strata start with the bound from _find_strata, which ignores
+    # conflicts, and are refined by their LP relaxation before their first
+    # MIP solve, so hopeless strata cost only a cheap LP.
+    queue = [(-bound, stratum, ESTIMATED, ()) for stratum, bound in enumerate(search.bounds)]
+    heapq.heapify(queue)
+
+    try:
+        while queue and not budget.exhausted(generator.nodes_visited):
+            bound, stratum, source, chosen = heapq.heappop(queue)
+            if -bound <= floor():
+                break
+            if source == SOLVED:
+                score = float(generator.scorer.score_batch(generator.score_table, np.array([chosen]))[0])
+                tie = round(score, generator.SCORE_DIGITS) in generator.seen_scores
+                generator._offer(score, chosen, heap)
+                search.exclude(stratum, chosen, score if tie else None)
+            solution = search.solve(stratum, relax=source == ESTIMATED)
+            if solution is not None:
+                bound, chosen = solution
+                heapq.heappush(queue, (-bound, stratum, RELAXED if source == ESTIMATED else SOLVED, chosen))
+    except SolverError as error:
+        # seen_scores keeps the search from offering the found schedules again
+        logger.warning(f"MIP search failed, finishing with the depth-first search: {error}")
+        unassigned = tuple(range(len(generator.sorted_courses)))
+        try:
+            generator._dfs(unassigned, (), generator.domains, EMPTY_PROFILE, heap)
+        except SearchStopped:
+            logger.info(f"Schedule generation stopped early: {budget.stop_reason}")
+
+    return heap
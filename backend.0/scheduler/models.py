@@ -69,6 +69,25 @@ class SectionTime(models.Model):
             (other.crn_id, other.days, other.begin_time, other.end_time)
 
 
+class CatalogVersion(models.Model):
+    """Single row counting section catalog updates; the scraper bumps it when it finishes."""
+    version = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls):
+        catalog_version, _ = cls.objects.get_or_create(pk=1)
+        catalog_version.version = models.F("version") + 1
+        catalog_version.save(update_fields=["version", "updated_at"])
+
+    def __str__(self):
+        return (f"Catalog version {self.version}")
+
+
 class User(models.Model):
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
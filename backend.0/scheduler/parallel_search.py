@@ -0,0 +1,422 @@
+"""
+Parallel Schedule Search Module
+
+This module runs a ScheduleGenerator search on several CPU cores. The search
+is pure Python, so a single request is otherwise limited to one core by the
+GIL.
+
+The top levels of the search tree are expanded in the calling process and
+every consistent subtree becomes a task on a ProcessPoolExecutor. Workers
+receive the compiled problem once, as the picklable output of
+ScheduleGenerator.to_compact, and keep their own top-K heaps, which are merged
+at the end. The K-th best score reached by any worker is shared through shared
+memory so all workers prune against the global threshold.
+
+The pool is created on the first parallel search and kept for the life of
+the process, so a request pays for neither process startup nor the import
+of the scheduler in every worker. Its workers are started by a fork server
+(or spawned) instead of forked from the web process, whose other threads
+(e.g. the term catalog refresh) may hold locks a fork would copy in a locked
+state. The pool has shared memory for SEARCH_SLOTS concurrent searches: each
+search takes a slot holding its K-th best score, its node count and a
+cancel flag, which the workers poll with the budget. When every slot is
+taken, a search runs its subtrees in the calling process instead. A pool
+whose worker died (e.g. killed by the OS) is broken for good: it is dropped,
+so the next search starts a new one, and the search that found it broken
+finishes its remaining subtrees in the calling process.
+
+Load balancing:
+    The tree is split into many more tasks than workers and the largest
+    subtrees are submitted first. Idle workers take the next pending task from
+    the pool's shared queue, so a worker that finishes a small subtree moves
+    on to other work instead of waiting for a slow sibling.
+
+Example Usage:
+    ```python
+    generator = ScheduleGenerator(section_dict, section_time_dict, breaks, preferences)
+    schedules, count = generator.generate_schedules(workers=4)
+    ```
+"""
+
+import heapq
+import itertools
+import logging
+import multiprocessing
+import pickle
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from .schedule_generator import (
+    ScheduleGenerator,
+    ScheduleHeapElement,
+    SearchBudget,
+    SearchStopped,
+)
+from .schedule_scoring import EMPTY_PROFILE
+
+logger = logging.getLogger(__name__)
+
+# Aim for this many subtrees per worker so uneven subtrees balance out
+TASKS_PER_WORKER = 8
+
+# Never expand more than this many levels in the parent process
+MAX_SPLIT_DEPTH = 2
+
+# Concurrent searches a process's pool has shared memory for
+SEARCH_SLOTS = 4
+
+# Seconds between checks of the parent's budget while waiting for workers
+CANCEL_POLL_INTERVAL = 0.1
+
+# Pools of this process by number of workers, created by get_pool
+_pools: Dict[int, "SearchPool"] = {}
+_pools_lock = threading.Lock()
+
+# Identifies each parallel search of this process to the workers
+_search_ids = itertools.count()
+
+# Worker process state: the pool's shared memory, set by _init_worker, and
+# the generator of the search the worker last ran a task of
+_worker_shared: Optional[Tuple[Any, Any, Any]] = None
+_worker_search: Optional[Tuple[int, ScheduleGenerator]] = None
+
+
+class SharedFloor:
+    """
+    The K-th best score of one parallel search, shared by its workers.
+
+    Reads and updates hold the shared array's lock, so a worker never lowers
+    a score another worker has just raised.
+    """
+
+    def __init__(self, floors, slot: int) -> None:
+        self.floors = floors
+        self.slot = slot
+
+    @property
+    def value(self) -> float:
+        with self.floors.get_lock():
+            return self.floors[self.slot]
+
+    def raise_to(self, score: float) -> float:
+        """
+        Raise the shared score to score if that is higher.
+
+        Returns:
+            float: The shared score after the update
+        """
+        with self.floors.get_lock():
+            if score > self.floors[self.slot]:
+                self.floors[self.slot] = score
+            return self.floors[self.slot]
+
+
+class SharedNodeBudget(SearchBudget):
+    """
+    Search budget whose node limit and cancellation are shared by all workers of a search.
+
+    Each worker adds the nodes it expanded since its last check to a shared
+    counter, so max_nodes caps the whole parallel search rather than each
+    task separately, and stops once the parent sets the search's cancel flag.
+    """
+
+    def __init__(self, deadline: Optional[float], max_nodes: Optional[int], nodes, cancelled, slot: int) -> None:
+        super().__init__(max_nodes=max_nodes)
+        self.deadline = deadline
+        self.nodes = nodes
+        self.cancelled = cancelled
+        self.slot = slot
+        self._reported = 0
+
+    def exhausted(self, nodes_visited: int) -> bool:
+        with self.nodes.get_lock():
+            self.nodes[self.slot] += nodes_visited - self._reported
+            total = self.nodes[self.slot]
+        self._reported = nodes_visited
+        if self.cancelled[self.slot]:
+            self.cancel()
+        return super().exhausted(total)
+
+
+class SearchPool:
+    """
+    A process pool kept for the life of the process, with shared memory for
+    SEARCH_SLOTS concurrent searches.
+
+    Attributes:
+        executor (ProcessPoolExecutor): The worker processes
+        floors (Array): K-th best score of the search in each slot
+        nodes (Array): Nodes expanded by the search in each slot
+        cancelled (Array): Whether the search in each slot must stop
+    """
+
+    def __init__(self, workers: int) -> None:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.floors = context.Array("d", SEARCH_SLOTS)
+        self.nodes = context.Array("q", SEARCH_SLOTS)
+        self.cancelled = context.Array("b", SEARCH_SLOTS)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.floors, self.nodes, self.cancelled),
+        )
+        self._free = list(range(SEARCH_SLOTS))
+        self._lock = threading.Lock()
+
+    def acquire(self, floor: float, nodes: int) -> Optional[int]:
+        """
+        Take a free slot and reset it for a new search.
+
+        Args:
+            floor: K-th best score known before the search (-1.0 if none)
+            nodes: Nodes the search expanded before its tasks run
+
+        Returns:
+            Optional[int]: The slot, or None if every slot is taken
+        """
+        with self._lock:
+            if not self._free:
+                return None
+            slot = self._free.pop()
+        self.floors[slot] = floor
+        self.nodes[slot] = nodes
+        self.cancelled[slot] = 0
+        return slot
+
+    def release(self, slot: int) -> None:
+        """Return a slot once no task of its search is running."""
+        with self._lock:
+            self._free.append(slot)
+
+
+def get_pool(workers: int) -> SearchPool:
+    """Return this process's pool with the given number of workers, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            pool = _pools[workers] = SearchPool(workers)
+        return pool
+
+
+def discard_pool(workers: int, pool: SearchPool) -> None:
+    """Drop a broken pool so the next search with that many workers creates a new one."""
+    with _pools_lock:
+        if _pools.get(workers) is pool:
+            del _pools[workers]
+    pool.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _init_worker(floors, nodes, cancelled) -> None:
+    """Keep the pool's shared memory for the worker's tasks."""
+    global _worker_shared
+    _worker_shared = (floors, nodes, cancelled)
+
+
+def _search_subtree(
+    task: Tuple[Tuple[int, ...], Tuple[int, ...], List[int], Any],
+    search_id: int,
+    problem: bytes,
+    slot: int,
+    deadline: Optional[float],
+    max_nodes: Optional[int],
+) -> Dict[str, Any]:
+    """
+    Search one subtree in a worker process.
+
+    Args:
+        task: (chosen section indices, unassigned courses, domains, profile)
+        search_id: Identifies the search the task belongs to
+        problem: The search's pickled ScheduleGenerator.to_compact output,
+            unpickled once per worker and search
+        slot: The search's slot in the pool's shared memory
+        deadline: time.monotonic() value after which to stop, or None
+        max_nodes: Node budget shared by the whole parallel search, or None
+
+    Returns:
+        Dict[str, Any]: The worker's top (score, chosen) pairs and counters
+    """
+    global _worker_search
+    if _worker_search is None or _worker_search[0] != search_id:
+        _worker_search = (search_id, ScheduleGenerator.from_compact(pickle.loads(problem)))
+    generator = _worker_search[1]
+    floors, nodes, cancelled = _worker_shared
+    chosen, unassigned, domains, profile = task
+    heap: List[ScheduleHeapElement] = []
+
+    generator._reset_search(SharedNodeBudget(deadline, max_nodes, nodes, cancelled, slot))
+    generator.shared_floor = SharedFloor(floors, slot)
+    generator.score_floor = generator.shared_floor.value
+    try:
+        generator._dfs(unassigned, chosen, domains, profile, heap)
+    except SearchStopped:
+        pass
+
+    return {
+        "schedules": [(-element.score, element.schedule) for element in heap],
+        "schedule_count": generator.schedule_count,
+        "nodes_visited": generator.nodes_visited,
+        "nodes_pruned": generator.nodes_pruned,
+        "nodes_conflicted": generator.nodes_conflicted,
+        "leaves_scored": generator.leaves_scored,
+        "heap_replacements": generator.heap_replacements,
+        "score_seconds": generator.score_seconds,
+        "stop_reason": generator.budget.stop_reason,
+    }
+
+
+def split_search(generator: ScheduleGenerator, target_tasks: int) -> List[Tuple]:
+    """
+    Expand the top of the search tree into independent subtrees.
+
+    Args:
+        generator: Compiled generator whose tree should be split
+        target_tasks: Number of subtrees to aim for
+
+    Returns:
+        List[Tuple]: (chosen, unassigned, domains, profile) per subtree,
+        largest estimated subtree first
+    """
+    frontier = [((), tuple(range(len(generator.sorted_courses))), generator.domains, EMPTY_PROFILE)]
+    for _ in range(MAX_SPLIT_DEPTH):
+        if len(frontier) >= target_tasks or not frontier[0][1]:
+            break
+        expanded = []
+        for chosen, unassigned, domains, profile in frontier:
+            generator.nodes_visited += 1
+            for index, remaining, new_domains, new_profile in generator._branch(
+                unassigned, domains, profile
+            ):
+                expanded.append((chosen + (index,), remaining, new_domains, new_profile))
+        frontier = expanded
+
+    def subtree_size(task):
+        size = 1
+        for course in task[1]:
+            size *= task[2][course].bit_count()
+        return size
+
+    return sorted(frontier, key=subtree_size, reverse=True)
+
+
+def _search_in_process(generator: ScheduleGenerator, tasks: List[Tuple], heap: List[ScheduleHeapElement]) -> None:
+    """Search subtrees in the calling process, stopping quietly with the budget."""
+    try:
+        for chosen, unassigned, domains, profile in tasks:
+            generator._dfs(unassigned, chosen, domains, profile, heap)
+    except SearchStopped:
+        pass
+
+
+def run_parallel_search(generator: ScheduleGenerator, workers: int) -> List[ScheduleHeapElement]:
+    """
+    Search a generator's problem on the process's pool (see get_pool).
+
+    The generator's budget, counters and seen_scores are updated as if it had
+    run the search itself. When the budget stops (including by cancel() from
+    another thread), the search's cancel flag stops the running workers.
+
+    Args:
+        generator: Compiled generator with a fresh budget (see _reset_search)
+        workers: Number of worker processes
+
+    Returns:
+        List[ScheduleHeapElement]: The merged top max_schedules schedules
+    """
+    budget = generator.budget
+    tasks = split_search(generator, workers * TASKS_PER_WORKER)
+
+    # Subtrees that are already complete schedules are scored in place
+    heap: List[ScheduleHeapElement] = []
+    _search_in_process(generator, [task for task in tasks if not task[1]], heap)
+    if budget.stop_reason is not None:
+        return heap
+    results = [(-element.score, element.schedule) for element in heap]
+    tasks = [task for task in tasks if task[1]]
+
+    pool = get_pool(workers)
+    floor = -heap[0].score if len(heap) >= generator.max_schedules else -1.0
+    slot = pool.acquire(floor, generator.nodes_visited)
+    if slot is None:
+        # Every slot is in use by other searches of this process
+        _search_in_process(generator, tasks, heap)
+        return heap
+
+    # Tasks by position until their results are collected
+    remaining = dict(enumerate(tasks))
+
+    def collect(future):
+        outcome = future.result()
+        del remaining[positions[future]]
+        results.extend(outcome["schedules"])
+        generator.schedule_count += outcome["schedule_count"]
+        generator.nodes_visited += outcome["nodes_visited"]
+        generator.nodes_pruned += outcome["nodes_pruned"]
+        generator.nodes_conflicted += outcome["nodes_conflicted"]
+        generator.leaves_scored += outcome["leaves_scored"]
+        generator.heap_replacements += outcome["heap_replacements"]
+        generator.score_seconds += outcome["score_seconds"]
+        if outcome["stop_reason"]:
+            budget.cancel(outcome["stop_reason"])
+
+    search_id = next(_search_ids)
+    problem = pickle.dumps(generator.to_compact())
+    positions = {}
+    pending = set()
+    broken = False
+    try:
+        for position, task in enumerate(tasks):
+            future = pool.executor.submit(
+                _search_subtree, task, search_id, problem, slot, budget.deadline, budget.max_nodes
+            )
+            positions[future] = position
+            pending.add(future)
+        while pending and budget.stop_reason is None:
+            timeout = CANCEL_POLL_INTERVAL
+            if budget.deadline is not None:
+                # Workers watch the same deadline; allow them a moment to return
+                overdue = time.monotonic() - budget.deadline - 1
+                if overdue >= 0:
+                    budget.cancel("deadline")
+                    break
+                timeout = min(timeout, -overdue)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                collect(future)
+    except BrokenProcessPool:
+        logger.warning(f"Search pool with {workers} workers broke, searching in process")
+        discard_pool(workers, pool)
+        broken = True
+    finally:
+        # Drop tasks that have not started and stop the running ones, which
+        # must return before the slot can be reused
+        pool.cancelled[slot] = 1
+        for future in pending:
+            future.cancel()
+        wait(pending)
+        pool.release(slot)
+
+    for future in pending:
+        if not future.cancelled() and future.exception() is None:
+            collect(future)
+    if broken:
+        _search_in_process(generator, list(remaining.values()), heap)
+        results.extend((-element.score, element.schedule) for element in heap)
+
+    # Merge per-worker heaps, keeping one schedule per distinct score
+    merged = []
+    generator.seen_scores.clear()
+    for score, chosen in sorted(results, key=lambda result: result[0], reverse=True):
+        score_key = round(score, generator.SCORE_DIGITS)
+        if score_key in generator.seen_scores:
+            continue
+        generator.seen_scores.add(score_key)
+        merged.append(ScheduleHeapElement(-score, chosen))
+        if len(merged) == generator.max_schedules:
+            break
+    heapq.heapify(merged)
+    return merged
@@ -0,0 +1,118 @@
+"""
+Request Coalescing Module
+
+This module runs identical concurrent schedule requests once. When a popular
+course list is submitted by several users within the same second, the
+first request (the leader) searches and the others wait for its result
+instead of starting the same search.
+
+Requests are identified by their result_cache.request_key. The leader holds
+a lock in a shared Django cache (an atomic add, see
+cache_backends.LRUFileBasedCache) and publishes its result there, tagged
+with the lock's token; identical requests in any worker, or in another
+thread of the same worker, find the lock taken and poll for that result.
+
+Waiters keep their own timeout. A request only waits for a leader due to
+finish by the request's own deadline (plus WAIT_GRACE seconds). Only
+results the shareable function accepts (e.g. complete, not partial ones)
+are published, so a request that reaches its deadline without a result,
+whose leader failed, or whose leader's result was not shareable, searches
+by itself with whatever time it has left.
+
+Example Usage:
+    ```python
+    flights = RequestFlights(caches["schedules"], shareable=lambda result: not result.partial)
+    result, coalesced = flights.run(key, timeout, lambda budget: search(timeout=budget))
+    ```
+"""
+
+import time
+import uuid
+from typing import Any, Callable, Optional, Tuple
+
+# Cache key prefixes of the cross-worker lock and result of a request key
+LOCK_PREFIX = "flight-lock:"
+RESULT_PREFIX = "flight-result:"
+
+
+class RequestFlights:
+    """
+    Runs each request key once at a time, sharing the result with identical
+    concurrent requests in every worker.
+    """
+
+    # Seconds a leader may overrun its search timeout (fetching and
+    # formatting) and still be waited for
+    WAIT_GRACE = 2.0
+
+    # Seconds the cross-worker lock outlives the leader's timeout, so the
+    # lock of a crashed worker expires
+    LOCK_GRACE = 30.0
+
+    # Seconds a leader's result stays readable for waiters in other workers
+    RESULT_TTL = 60
+
+    # Seconds between checks for another worker's result
+    POLL_INTERVAL = 0.05
+
+    # Smallest search timeout given to a request that has to search by itself
+    MIN_TIMEOUT = 0.1
+
+    def __init__(self, cache: Any, shareable: Callable[[Any], bool] = lambda result: True) -> None:
+        """
+        Args:
+            cache: Django cache shared by the workers, for locks and results
+            shareable: Whether a leader's result may be handed to waiters.
+                Waiters for a result it rejects search by themselves.
+        """
+        self.cache = cache
+        self.shareable = shareable
+
+    def run(self, key: str, timeout: float, compute: Callable[[float], Any]) -> Tuple[Any, bool]:
+        """
+        Compute the result of a request, or wait for an identical one in progress.
+
+        Args:
+            key: The request's key (see result_cache.request_key)
+            timeout: Seconds the request may search for
+            compute: Computes the result, given the seconds it may search for
+
+        Returns:
+            Tuple[Any, bool]: The result, and whether it was computed by
+            another request
+        """
+        deadline = time.time() + timeout
+        token = uuid.uuid4().hex
+        if self.cache.add(LOCK_PREFIX + key, (token, deadline), timeout=timeout + self.LOCK_GRACE):
+            try:
+                result = compute(timeout)
+                if self.shareable(result):
+                    self.cache.set(RESULT_PREFIX + key, (token, result), timeout=self.RESULT_TTL)
+                return result, False
+            finally:
+                self.cache.delete(LOCK_PREFIX + key)
+
+        result = self._wait_for_worker(key, deadline)
+        if result is not None:
+            return result, True
+        return compute(self._remaining(deadline)), False
+
+    def _wait_for_worker(self, key: str, deadline: float) -> Optional[Any]:
+        """Poll for the result of the worker holding the lock; None if it does not come in time."""
+        token = None
+        while True:
+            lock = self.cache.get(LOCK_PREFIX + key)
+            if lock is not None:
+                token, leader_deadline = lock
+                if leader_deadline > deadline + self.WAIT_GRACE:
+                    return None  # The leader would finish after this request's deadline
+            # Checked after the lock, since the leader publishes before releasing it
+            published = self.cache.get(RESULT_PREFIX + key)
+            if published is not None and published[0] == token:
+                return published[1]
+            if lock is None or time.time() >= deadline + self.WAIT_GRACE:
+                return None  # Released without a shareable result or out of time
+            time.sleep(self.POLL_INTERVAL)
+
+    def _remaining(self, deadline: float) -> float:
+        return max(deadline - time.time(), self.MIN_TIMEOUT)
@@ -0,0 +1,144 @@
+"""
+Result Cache Module
+
+This module caches the responses of schedule requests. During registration
+many students submit the same course lists with default preferences, and
+every one of them used to run a full search.
+
+Requests are keyed canonically: the sorted, de-duplicated course list, the
+breaks sorted and de-duplicated, the preferences with sorted days and
+rounded weights, the options that change the result, and the catalog
+version, so a catalog update makes every earlier entry unreachable.
+
+Entries live in a Django cache, so every worker sharing its backend (e.g.
+cache_backends.LRUFileBasedCache) shares them. The backend's TIMEOUT and
+MAX_ENTRIES bound their age and number; each hit touches its entry, which
+restarts its TTL and, with an LRU backend, marks it as recently used.
+Hit and miss counters are kept in the same cache.
+
+Example Usage:
+    ```python
+    results = ScheduleResultCache(caches["schedules"])
+    key = request_key(courses, breaks, preferences, catalog_version, max_schedules=20)
+    response = results.get(key)
+    if response is None:
+        response = compute()
+        results.set(key, response)
+    ```
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+
+# Prefix of the cache keys of responses
+KEY_PREFIX = "schedules:"
+
+# Cache keys of the hit and miss counters
+HITS_KEY = "schedule-cache:hits"
+MISSES_KEY = "schedule-cache:misses"
+
+# Decimal places preference weights are compared at
+WEIGHT_DIGITS = 6
+
+
+def request_key(
+    courses: List[str],
+    breaks: List[Dict[str, Any]],
+    preferences: Dict[str, Any],
+    catalog_version: Optional[int],
+    **options: Any,
+) -> str:
+    """
+    Build the canonical cache key of a schedule request.
+
+    Args:
+        courses: Course codes of the request
+        breaks: List of break periods with begin_time and end_time
+        preferences: Dictionary of user scheduling preferences
+        catalog_version: Version of the catalog the request is served from
+        **options: Other request options that change the result (e.g.
+            max_schedules, engine, mode)
+
+    Returns:
+        str: The cache key
+    """
+    canonical = {
+        "courses": sorted(set(courses)),
+        "breaks": sorted({
+            (str(break_time["begin_time"]), str(break_time["end_time"])) for break_time in breaks
+        }),
+        "preferred_days": sorted(set(preferences["preferred_days"])),
+        "preferred_time": preferences["preferred_time"],
+        "day_weight": round(preferences["day_weight"], WEIGHT_DIGITS),
+        "time_weight": round(preferences["time_weight"], WEIGHT_DIGITS),
+        "catalog_version": catalog_version,
+        "options": options,
+    }
+    digest = hashlib.sha256(json.dumps(canonical, sort_keys=True, default=str).encode()).hexdigest()
+    return KEY_PREFIX + digest
+
+
+class ScheduleResultCache:
+    """
+    Schedule responses by request key in a Django cache, with hit and miss counters.
+    """
+
+    def __init__(self, cache: Any) -> None:
+        """
+        Args:
+            cache: The Django cache (e.g. caches["schedules"]) holding the entries
+        """
+        self.cache = cache
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached response for a key, counting the hit or miss.
+
+        Args:
+            key: Key from request_key
+
+        Returns:
+            Optional[Any]: The response, or None if it is not cached
+        """
+        response = self.cache.get(key)
+        if response is None:
+            self._count(MISSES_KEY)
+            return None
+        self.cache.touch(key)  # Restarts the TTL and marks the entry as recently used
+        self._count(HITS_KEY)
+        return response
+
+    def set(self, key: str, response: Any) -> None:
+        """
+        Cache the response of a request.
+
+        Args:
+            key: Key from request_key
+            response: The response to return for later identical requests
+        """
+        self.cache.set(key, response)
+
+    def counters(self) -> Dict[str, Any]:
+        """
+        Return the hits and misses counted by every worker sharing the cache.
+
+        Returns:
+            Dict[str, Any]: hits, misses and hit_rate (None before any lookup)
+        """
+        counts = self.cache.get_many([HITS_KEY, MISSES_KEY])
+        hits, misses = counts.get(HITS_KEY, 0), counts.get(MISSES_KEY, 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+        }
+
+    def _count(self, counter: str) -> None:
+        # add and incr are atomic across workers (see cache_backends), and incr
+        # keeps the expiry add gave the counter, so counters never expire
+        self.cache.add(counter, 0, timeout=None)
+        try:
+            self.cache.incr(counter)
+        except ValueError:
+            pass  # Culled between add and incr; the count is lost
@@ -9,7 +9,10 @@ Key Features:
     - Generates multiple valid course schedules
     - Handles time conflicts and break periods
     - Scores schedules based on user preferences
-    - Implements timeout mechanism for large schedule spaces
+    - Cooperative deadline/node budget that returns the best schedules found so far
+    - Progress callbacks with the current best schedules while the search runs
+    - Searches over meeting patterns and expands equivalent sections as variants
+    - Compiles the fetched sections into an ORM-free catalog before searching
     - Memory-efficient schedule generation using heap
 
 Example Usage:
@@ -25,6 +28,9 @@ Example Usage:
 
     # Generate top schedules
     schedules = generator.generate_schedules()
+
+    # Each entry is (score, [variant schedules]); variants share meeting times
+    # and differ only in section (professor, location, CRN)
     ```
 
 Note:
@@ -33,13 +39,77 @@ Note:
     and removal operations while keeping memory usage constant.
 """
 
-from collections import defaultdict
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
 import heapq
-from typing import List, Dict, Tuple, Any, Optional
-from .schedule_scoring import ScheduleScorer
-import threading
+from itertools import islice, product
+import logging
+
+import numpy as np
+from typing import List, Dict, Tuple, Any, Optional, Iterator, NamedTuple, Callable
+from .compiled_catalog import CompiledCatalog, CompiledSlot
+from .schedule_scoring import ScheduleScorer, SectionProfile, EMPTY_PROFILE
+from .search_estimator import choose_strategy, estimate_search
 import time
 
+logger = logging.getLogger(__name__)
+
+
+class SearchBudget:
+    """
+    A cooperative cancellation token for a schedule search.
+
+    The search polls the budget periodically and stops cleanly once the
+    deadline has passed, the node budget is used up, or cancel() has been
+    called from elsewhere, keeping the best schedules found so far.
+
+    Attributes:
+        deadline (Optional[float]): time.monotonic() value after which to stop
+        max_nodes (Optional[int]): Maximum number of search nodes to expand
+        stop_reason (Optional[str]): "deadline", "node_budget" or "cancelled"
+            once the budget is exhausted, otherwise None
+    """
+
+    def __init__(
+        self, timeout: Optional[float] = None, max_nodes: Optional[int] = None
+    ) -> None:
+        """
+        Initialize a budget starting now.
+
+        Args:
+            timeout: Seconds the search may run, or None for no deadline
+            max_nodes: Number of nodes the search may expand, or None for no limit
+        """
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.max_nodes = max_nodes
+        self.stop_reason: Optional[str] = None
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        """Ask the search to stop at its next check."""
+        if self.stop_reason is None:
+            self.stop_reason = reason
+
+    def exhausted(self, nodes_visited: int) -> bool:
+        """
+        Check whether the search should stop.
+
+        Args:
+            nodes_visited: Number of nodes the search has expanded so far
+
+        Returns:
+            bool: True once the search must stop (stop_reason is then set)
+        """
+        if self.stop_reason is None:
+            if self.max_nodes is not None and nodes_visited >= self.max_nodes:
+                self.stop_reason = "node_budget"
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.stop_reason = "deadline"
+        return self.stop_reason is not None
+
+
+class SearchStopped(Exception):
+    """Raised inside the search to unwind it once its budget is exhausted."""
+
 
 class ScheduleHeapElement:
     """
@@ -51,16 +121,16 @@ class ScheduleHeapElement:
 
     Attributes:
         score (float): The negated score of the schedule (for min-heap operation)
-        schedule (Dict[str, List[Any]]): The course schedule mapping CRNs to time slots
+        schedule (Tuple[int, ...]): Indices of the section classes in the schedule
     """
 
-    def __init__(self, score: float, schedule: Dict[str, List[Any]]) -> None:
+    def __init__(self, score: float, schedule: Tuple[int, ...]) -> None:
         """
         Initialize a new heap element.
 
         Args:
             score (float): The schedule's score (will be negated internally)
-            schedule (Dict[str, List[Any]]): The schedule configuration
+            schedule (Tuple[int, ...]): The schedule configuration
         """
         self.score = score
         self.schedule = schedule
@@ -73,9 +143,10 @@ class ScheduleHeapElement:
             other (ScheduleHeapElement): Another schedule element
 
         Returns:
-            bool: True if this element has a lower score (higher actual score)
+            bool: True if this element has a lower actual score, so the worst
+            kept schedule sits at the root of the heap
         """
-        return self.score < other.score
+        return self.score > other.score
 
     def __eq__(self, other: "ScheduleHeapElement") -> bool:
         """
@@ -106,10 +177,80 @@ class ScheduleGenerator:
         preferences (Dict): User preferences for schedule optimization
         max_schedules (int): Maximum number of schedules to generate
         scorer (ScheduleScorer): Instance of scoring algorithm
-        course_sections (defaultdict): Grouped sections by course
+        catalog (CompiledCatalog): The sections as plain records and columns,
+            which everything up to the final schedules is compiled from
+        course_sections (defaultdict): Grouped (crn, compiled times) pairs by course
         sorted_courses (List): Courses sorted by number of sections
+        section_masks (Dict): Mapping of CRNs to compiled occupancy bitmasks
+        blocked_crns (Set): CRNs excluded because a meeting starts during a break
+        sections (List): Representative (crn, compiled times) pair of each meeting-pattern
+            class, indexed in sorted_courses order
+        equivalent_sections (List[List]): All (crn, times) pairs sharing the
+            meeting pattern of each indexed class
+        course_bits (List[int]): Bitset of section indices for each sorted course
+        compatibility (List[int]): Bitset of compatible section indices per section
+        domains (Optional[List[int]]): Arc-consistent section bitsets per sorted
+            course, or None when no schedule can exist
+        conflicting_courses (Optional[Tuple]): Pair of courses with no compatible
+            combination of sections, if any
+        ordering (str): Course ordering strategy, "dynamic" or "static"
+        conflict_degree (List[int]): Incompatible section pairs per sorted course
+        nodes_visited (int): Number of search nodes expanded by the last run
+        use_bounds (bool): Whether subtrees are cut using ScheduleScorer.upper_bound
+        section_profiles (List[SectionProfile]): Score components per indexed section
+        score_table (ScoreTable): Score components per indexed section as arrays,
+            for batch scoring
+        course_bounds (List[CourseBound]): Best-case contribution per sorted course
+        nodes_pruned (int): Number of subtrees cut by the score bound in the last run
+        nodes_conflicted (int): Number of children of the last run abandoned
+            because forward checking left some course without sections
+        leaves_scored (int): Number of complete schedules scored in the last run
+        heap_replacements (int): Number of times the last run replaced the
+            lowest kept schedule with a better one
+        score_seconds (float): Time the last run spent scoring complete schedules
+        budget (Optional[SearchBudget]): Cancellation token of the current run
+        search_info (Dict): Outcome of the last run: whether it is partial, why
+            it stopped, nodes explored and pruned, elapsed seconds, the mode
+            used and an upper bound on the best score (None if unknown)
+        search_stats (Dict): Counters of the last run, see _collect_stats
+        score_floor (float): Score a schedule must beat to be kept, known from
+            outside this search (-1.0 when unknown)
+        shared_floor (Optional[SharedFloor]): The best K-th score across
+            parallel workers (see parallel_search), or None for a serial search
+        progress (Optional[Callable]): Callback receiving progress reports
+            during the current run, or None
     """
 
+    ORDERINGS = frozenset({"dynamic", "static"})
+    ENGINES = frozenset({"dfs", "mip", "mitm"})
+    MODES = frozenset({"exact", "beam", "auto"})
+
+    # Slack for float rounding between upper_bound and score_schedule
+    BOUND_TOLERANCE = 1e-9
+
+    # Cap on the equivalent variants expanded for one ranked schedule
+    MAX_VARIANTS = 50
+
+    # Decimal places to which two scores must agree to count as duplicates
+    SCORE_DIGITS = 9
+
+    # Default search deadline in seconds, and how many nodes to expand
+    # between budget checks
+    DEFAULT_TIMEOUT = 90
+    BUDGET_CHECK_INTERVAL = 256
+
+    # Complete schedules buffered before they are scored together
+    LEAF_BATCH_SIZE = 1024
+
+    # Smallest search space (section-class combinations) worth a process pool
+    PARALLEL_MIN_SPACE = 20_000
+
+    # Default minimum seconds between progress reports
+    PROGRESS_INTERVAL = 0.25
+
+    # Default partial schedules kept per level by the beam search
+    BEAM_WIDTH = 64
+
     def __init__(
         self,
         section_dict: Dict[str, Any],
@@ -117,6 +258,8 @@ class ScheduleGenerator:
         breaks: List[Dict[str, int]],
         preferences: Dict[str, Any],
         max_schedules: int = 20,
+        ordering: str = "dynamic",
+        use_bounds: bool = True,
     ) -> None:
         """
         Initialize the schedule generator with course data and constraints.
@@ -127,176 +270,1033 @@ class ScheduleGenerator:
             breaks: List of break periods with begin_time and end_time
             preferences: Dictionary of user scheduling preferences
             max_schedules: Maximum number of schedules to generate (default: 10)
+            ordering: "dynamic" branches on the unassigned course with the fewest
+                remaining sections at each level; "static" follows sorted_courses
+            use_bounds: Cut subtrees that cannot beat the current top schedules
+                once max_schedules have been found
+
+        Raises:
+            ValueError: If ordering is not a known strategy
         """
+        if ordering not in self.ORDERINGS:
+            raise ValueError(f"ordering must be one of {set(self.ORDERINGS)}")
+
         # Store input parameters
         self.section_dict = section_dict
         self.section_time_dict = section_time_dict
         self.breaks = breaks
         self.preferences = preferences
         self.max_schedules = max_schedules
+        self.ordering = ordering
+        self.use_bounds = use_bounds
         self.scorer = ScheduleScorer(self.preferences)
         self.schedule_count = 0
+        self.nodes_visited = 0
+        self.nodes_pruned = 0
+        self.nodes_conflicted = 0
+        self.leaves_scored = 0
+        self.heap_replacements = 0
+        self.score_seconds = 0.0
+        self.budget: Optional[SearchBudget] = None
+        self.search_info: Dict[str, Any] = {}
+        self.search_stats: Dict[str, Any] = {}
+        self.score_floor = -1.0
+        self.shared_floor = None
+        self.progress = None
 
         self.seen_scores = set()
 
+        # Copy the sections out of the ORM once; the search reads only the
+        # catalog, and SectionTime objects are looked up again for the result
+        self.catalog = CompiledCatalog.compile(section_dict, section_time_dict)
+
+        # Compile meeting times into bitmasks once so conflict checks are integer ANDs
+        self.section_masks = dict(zip(self.catalog.crns, self.catalog.occupancy_masks()))
+        self.blocked_crns = {
+            self.catalog.crns[section] for section in self.catalog.starts_during(breaks)
+        }
+
         # Group sections by course for efficient processing
         self.course_sections = defaultdict(list)
-        for crn, section in section_dict.items():
-            self.course_sections[section.course].append((crn, section_time_dict[crn]))
+        for section, crn in enumerate(self.catalog.crns):
+            sections = self.course_sections[
+                self.catalog.courses[self.catalog.section_course[section]]
+            ]
+            if crn not in self.blocked_crns:
+                sections.append((crn, self.catalog.section_slots(section)))
 
         # Sort courses by section count to optimize search space
         self.sorted_courses = sorted(
             self.course_sections.keys(), key=lambda c: len(self.course_sections[c])
         )
 
-    def generate_schedules(self) -> List[Tuple[float, Dict[str, List[Any]]]]:
+        # Collapse sections with identical meeting times into one class each and
+        # index the classes in search order, best standalone score first within
+        # a course. Conflicts and scores depend only on meeting times, so the
+        # search runs over classes and members are expanded only at the end.
+        self.sections: List[Tuple[str, Tuple[CompiledSlot, ...]]] = []
+        self.equivalent_sections: List[List[Tuple[str, Tuple[CompiledSlot, ...]]]] = []
+        self.course_bits: List[int] = []
+        for course in self.sorted_courses:
+            classes = defaultdict(list)
+            for crn, times in self.course_sections[course]:
+                classes[self._meeting_signature(times)].append((crn, times))
+
+            first = len(self.sections)
+            for members in sorted(
+                classes.values(),
+                key=lambda members: self.scorer.score_schedule(tuple(members[0][1])),
+                reverse=True,
+            ):
+                self.sections.append(members[0])
+                self.equivalent_sections.append(members)
+            self.course_bits.append(((1 << len(self.sections)) - 1) ^ ((1 << first) - 1))
+        self.section_profiles: List[SectionProfile] = [
+            self.scorer.section_profile(times) for _, times in self.sections
+        ]
+        self.score_table = self.scorer.score_table([times for _, times in self.sections])
+        self.compatibility = self._build_compatibility()
+        self.conflict_degree = self._count_conflicts()
+
+        # Prune sections that cannot appear in any schedule before searching
+        self.conflicting_courses = self._find_conflicting_courses()
+        self.domains = None
+        if self.conflicting_courses is None:
+            self.domains = self._propagate(
+                list(self.course_bits), tuple(range(len(self.sorted_courses)))
+            )
+
+        # Best case each course can add to a schedule, for branch-and-bound
+        self.course_bounds = [
+            self.scorer.course_bound(
+                [
+                    self.section_profiles[index]
+                    for index in range(len(self.sections))
+                    if domain >> index & 1
+                ]
+            )
+            for domain in (self.domains or self.course_bits)
+        ]
+
+    def generate_schedules(
+        self,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        max_nodes: Optional[int] = None,
+        budget: Optional[SearchBudget] = None,
+        workers: int = 1,
+        progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        progress_interval: float = PROGRESS_INTERVAL,
+        engine: str = "dfs",
+        mode: str = "exact",
+        beam_width: int = BEAM_WIDTH,
+    ) -> List[Tuple[float, List[Dict[str, List[Any]]]]]:
         """
         Generate and return the top N schedules based on scoring.
 
-        This method initiates a threaded depth-first search with a timeout
-        to prevent excessive runtime on large course combinations. It returns
-        schedules sorted by score in descending order.
+        The search runs in the calling thread and polls a SearchBudget, so a
+        deadline or node budget stops it cleanly instead of leaving a thread
+        running. Whatever the search has found by then is returned, and
+        search_info records whether the result is partial.
+
+        Args:
+            timeout: Seconds the search may run (default: 90), or None
+            max_nodes: Maximum number of search nodes to expand, or None
+            budget: Existing cancellation token to use instead of building one
+                from timeout and max_nodes
+            workers: Number of processes to search with. Above 1, large
+                searches are split into subtrees and run on a process pool.
+            progress: Called from the search at most every progress_interval
+                seconds with a dict of nodes_explored, nodes_pruned,
+                fraction_covered (estimated share of the tree searched),
+                best_score, elapsed_seconds and schedules (the current top N
+                in the returned format, or None if unchanged since the last
+                report). Only serial searches report progress.
+            progress_interval: Minimum seconds between progress reports
+            engine: "dfs" for the depth-first search, "mip" to enumerate the
+                top schedules with a 0-1 integer program (see mip_search), or
+                "mitm" to join enumerated half-schedules (see meet_in_middle).
+                All return the same scores; "mip" and "mitm" ignore workers
+                and progress, and "mip" counts solver calls as nodes.
+            mode: "exact" searches with engine; "beam" runs a beam search
+                instead (see beam_search), which is fast but may miss the
+                best schedules; "auto" picks "beam" when
+                search_estimator.choose_strategy would pick the beam search
+                for the request and its remaining time, "exact" otherwise.
+                search_info records the mode used and an upper bound on the
+                best score, so the gap to the optimum is known.
+            beam_width: Partial schedules the beam search keeps per level
 
         Returns:
-            List[Tuple[float, Dict]]: List of (score, [schedule]) pairs, sorted
-            by score in descending order. Returns ["timeout"] if the generation
-            process exceeds the time limit.
+            List[Tuple[float, List[Dict]]]: List of (score, [schedule variants])
+            pairs, sorted by score in descending order, together with
+            schedule_count.
+
+        Raises:
+            ValueError: If engine or mode is not known
 
         Note:
-            The schedule generation is limited to 90 seconds to prevent
-            excessive runtime in cases with many possible combinations.
+            Requests that constraint propagation proves infeasible return
+            no schedules without searching. With use_bounds, schedule_count
+            only counts the schedules actually reached, not pruned ones.
         """
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {set(self.ENGINES)}")
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {set(self.MODES)}")
+
         heap: List[ScheduleHeapElement] = []
-        self.seen_scores.clear()  # Clear seen scores for each new generation
+        self._reset_search(budget or SearchBudget(timeout, max_nodes))
+        if mode == "auto":
+            deadline = self.budget.deadline
+            remaining = float("inf") if deadline is None else deadline - time.monotonic()
+            strategy = choose_strategy(estimate_search(self.catalog, self.breaks), remaining, workers)
+            mode = "beam" if strategy == "beam" else "exact"
+        started = time.monotonic()
+        self.progress = progress
+        self._progress_interval = progress_interval
+        self._started = started
+        self._next_progress = started + progress_interval
+        self._reported_scores = None
+
+        upper_bound = None
+        if self.domains is None:
+            logger.info("No compatible combination of sections exists")
+        elif mode == "beam":
+            # Imported here to avoid a circular import
+            from .beam_search import run_beam_search
+
+            heap, upper_bound = run_beam_search(self, beam_width)
+        elif engine == "mip":
+            # Imported here so the mip package loads only when it is used
+            from .mip_search import run_mip_search
 
-        # Start DFS in a separate thread with timeout
-        thread = threading.Thread(target=self._dfs, args=(0, {}, [], heap))
-        thread.start()
-        thread.join(timeout=90)  # 90-second timeout
+            heap = run_mip_search(self)
+        elif engine == "mitm":
+            # Imported here to avoid a circular import
+            from .meet_in_middle import run_meet_in_middle
 
-        if thread.is_alive():
-            print("Schedule generation timed out")
-            return ["timeout"]
+            heap = run_meet_in_middle(self)
+        elif workers > 1 and self.search_space_size() >= self.PARALLEL_MIN_SPACE:
+            # Imported here to avoid a circular import
+            from .parallel_search import run_parallel_search
 
-        print(f"Total schedules generated: {self.schedule_count}")
+            try:
+                heap = run_parallel_search(self, workers)
+            except SearchStopped:
+                pass
+            # Workers stop without raising, so every stop is logged here
+            if self.budget.stop_reason is not None:
+                logger.info(f"Schedule generation stopped early: {self.budget.stop_reason}")
+        else:
+            unassigned = tuple(range(len(self.sorted_courses)))
+            try:
+                self._dfs(unassigned, (), self.domains, EMPTY_PROFILE, heap)
+            except SearchStopped:
+                logger.info(f"Schedule generation stopped early: {self.budget.stop_reason}")
 
-        # Convert negative scores back to positive and sort
-        result = [(-element.score, element.schedule) for element in heap]
-        return (sorted(result, key=lambda x: x[0], reverse=True), self.schedule_count)
+        partial = self.budget.stop_reason is not None
+        if mode == "exact" and not partial and heap:
+            upper_bound = max(-element.score for element in heap)  # A complete search is optimal
+        self.search_info = {
+            "partial": partial,
+            "stop_reason": self.budget.stop_reason,
+            "nodes_explored": self.nodes_visited,
+            "nodes_pruned": self.nodes_pruned,
+            "elapsed_seconds": round(time.monotonic() - started, 3),
+            "mode": mode,
+            "upper_bound": upper_bound,
+        }
+        self.search_stats = self._collect_stats()
+        logger.debug(f"Total schedules generated: {self.schedule_count}")
+
+        self.progress = None
+        return (self._rank(heap), self.schedule_count)
+
+    def _collect_stats(self) -> Dict[str, Any]:
+        """
+        Summarize the counters of the last run.
+
+        Breaks exclude sections before the search starts, so the "break"
+        count is of sections, while "conflict" and "bound" count search nodes.
+
+        Returns:
+            Dict[str, Any]: Nodes visited, pruned by reason, leaves scored,
+            heap replacements, seconds spent scoring, and the search space as
+            combinations of all fetched sections and after breaks and
+            constraint propagation
+        """
+        combinations = 1
+        for sections in Counter(self.catalog.section_course).values():
+            combinations *= sections
+        return {
+            "nodes_visited": self.nodes_visited,
+            "nodes_pruned": {
+                "conflict": self.nodes_conflicted,
+                "break": len(self.blocked_crns),
+                "bound": self.nodes_pruned,
+            },
+            "leaves_scored": self.leaves_scored,
+            "heap_replacements": self.heap_replacements,
+            "score_seconds": round(self.score_seconds, 6),
+            "search_space": {
+                "combinations": combinations,
+                "after_propagation": self.search_space_size(),
+            },
+        }
+
+    def _rank(
+        self, heap: List[ScheduleHeapElement]
+    ) -> List[Tuple[float, List[Dict[str, List[Any]]]]]:
+        """
+        Turn a heap into (score, [schedule variants]) pairs, best first.
+
+        Args:
+            heap: Priority queue containing the top N schedules
+
+        Returns:
+            List[Tuple[float, List[Dict]]]: Schedules sorted by score in
+            descending order
+        """
+        # Convert negative scores back to positive, sort, and expand variants
+        result = [
+            (-element.score, self._expand_variants(element.schedule))
+            for element in heap
+        ]
+        return sorted(result, key=lambda x: x[0], reverse=True)
+
+    def search_space_size(self) -> int:
+        """
+        Number of section-class combinations left after arc consistency.
+
+        Returns:
+            int: Product of the domain sizes of all courses (0 if infeasible)
+        """
+        size = 1 if self.domains is not None else 0
+        for domain in self.domains or ():
+            size *= domain.bit_count()
+        return size
+
+    def to_compact(self) -> Dict[str, Any]:
+        """
+        Export the compiled search problem without ORM objects.
+
+        The result holds only plain data (bitsets, score components and
+        meeting-time tuples), so it can be pickled to worker processes and
+        turned back into a searchable generator with from_compact.
+
+        Returns:
+            Dict[str, Any]: Picklable description of the search problem
+        """
+        return {
+            "preferences": self.preferences,
+            "max_schedules": self.max_schedules,
+            "ordering": self.ordering,
+            "use_bounds": self.use_bounds,
+            "sorted_courses": self.sorted_courses,
+            "slots": [times for _, times in self.sections],
+            "course_bits": self.course_bits,
+            "compatibility": self.compatibility,
+            "conflict_degree": self.conflict_degree,
+            "domains": self.domains,
+            "section_profiles": self.section_profiles,
+            "course_bounds": self.course_bounds,
+        }
+
+    @classmethod
+    def from_compact(cls, compact: Dict[str, Any]) -> "ScheduleGenerator":
+        """
+        Rebuild a searchable generator from to_compact output.
+
+        The generator can run _dfs over the compiled problem but has no
+        section objects, so it cannot expand variants.
+
+        Args:
+            compact: Output of to_compact
+
+        Returns:
+            ScheduleGenerator: Generator ready to search subtrees
+        """
+        generator = cls.__new__(cls)
+        generator.preferences = compact["preferences"]
+        generator.max_schedules = compact["max_schedules"]
+        generator.ordering = compact["ordering"]
+        generator.use_bounds = compact["use_bounds"]
+        generator.scorer = ScheduleScorer(generator.preferences)
+        generator.sorted_courses = compact["sorted_courses"]
+        generator.sections = [(None, slots) for slots in compact["slots"]]
+        generator.course_bits = compact["course_bits"]
+        generator.compatibility = compact["compatibility"]
+        generator.conflict_degree = compact["conflict_degree"]
+        generator.domains = compact["domains"]
+        generator.section_profiles = compact["section_profiles"]
+        generator.score_table = generator.scorer.score_table(compact["slots"])
+        generator.course_bounds = compact["course_bounds"]
+        generator.seen_scores = set()
+        generator.shared_floor = None
+        generator.progress = None
+        generator._reset_search(SearchBudget())
+        return generator
+
+    def _reset_search(self, budget: SearchBudget) -> None:
+        """
+        Clear per-run state before a search.
+
+        Args:
+            budget: Cancellation token for the run
+        """
+        self.seen_scores.clear()  # Clear seen scores for each new generation
+        self.schedule_count = 0
+        self.nodes_visited = 0
+        self.nodes_pruned = 0
+        self.nodes_conflicted = 0
+        self.leaves_scored = 0
+        self.heap_replacements = 0
+        self.score_seconds = 0.0
+        self.score_floor = -1.0
+        self.budget = budget
+        self._next_budget_check = self._schedule_budget_check()
 
     def _dfs(
         self,
-        course_index: int,
-        current_schedule: Dict[str, List[Any]],
-        flat_schedule: List[Any],
+        unassigned: Tuple[int, ...],
+        chosen: Tuple[int, ...],
+        domains: List[int],
+        profile: SectionProfile,
         heap: List[ScheduleHeapElement],
     ) -> None:
         """
-        Recursive depth-first search to generate valid schedules.
+        Depth-first search to generate valid schedules.
 
         This method explores possible schedule combinations while maintaining
         the top N schedules in a heap. It uses negative scores to create a
         min-heap of the highest scoring schedules.
 
+        Each remaining course has a domain bitset of the sections that are
+        compatible with every section chosen so far. Choosing a section
+        intersects the remaining domains with that section's compatibility
+        row and re-establishes arc consistency among them, so the branch is
+        abandoned as soon as any remaining course is left without candidates.
+        The course to branch on is picked per node by _select_position.
+
+        Once the heap is full, a node is cut when the scorer's optimistic
+        bound for any completion of it cannot beat the lowest kept score (or
+        score_floor, when a parallel search shares a better one).
+
+        The search is iterative with an explicit stack of per-level arrays
+        allocated once per call. Domains are narrowed in place and every
+        change is recorded on a trail, which is unwound on backtrack instead
+        of copying the domains at each node. Complete schedules are buffered
+        as rows of an index array and scored LEAF_BATCH_SIZE at a time with
+        ScheduleScorer.score_batch; a tuple of the chosen sections is built
+        only for schedules that can enter the heap.
+
         Args:
-            course_index: Current position in sorted_courses list
-            current_schedule: Mapping of CRNs to their time slots
-            flat_schedule: List of all time slots in current schedule
+            unassigned: Indices into sorted_courses of courses not yet chosen
+            chosen: Indices of the section classes chosen so far
+            domains: Section bitsets still available to each sorted course
+                (not modified)
+            profile: Summed score components of the sections chosen so far
             heap: Priority queue containing the top N schedules
 
         Note:
             The method modifies the heap in-place, maintaining only the
             top N schedules based on their scores.
+
+        Raises:
+            SearchStopped: When the search budget is exhausted
         """
-        # Base case: complete schedule found
-        if course_index == len(self.sorted_courses):
-            score = self.scorer.score_schedule(tuple(flat_schedule))
-
-            # Skip if we've seen this score before
-            if score in self.seen_scores:
-                return
-
-            element = ScheduleHeapElement(-score, current_schedule.copy())
-            self.schedule_count += 1
-
-            if len(heap) < self.max_schedules:
-                heapq.heappush(heap, element)
-                self.seen_scores.add(score)
-            elif -score < heap[0].score:
-                try:
-                    old_score = -heap[0].score
-                    self.seen_scores.remove(old_score)
-                except KeyError:
-                    pass  # If old score wasn't in set, that's okay
-                self.seen_scores.add(score)
-                heapq.heapreplace(heap, element)
+        depth = len(unassigned)
+        order = list(unassigned)  # order[level:] are the courses still unassigned
+        domains = list(domains)
+        picks = [0] * depth  # Section class chosen at each level
+        options = [0] * depth  # Sections of the level's course not tried yet
+        totals = [0] * depth  # Sections of the level's course when it was entered
+        marks = [0] * depth  # Trail length when each level was entered
+        profiles = [profile] * (depth + 1)
+        trail: List[int] = []  # Flat (course, previous domain) pairs
+
+        first_pick = len(chosen)
+        leaves = np.empty((self.LEAF_BATCH_SIZE, first_pick + depth), dtype=np.intp)
+        leaves[:, :first_pick] = chosen  # Complete schedules waiting to be scored
+        leaf_count = 0
+
+        level = 0
+        entering = True
+        try:
+            while level >= 0:
+                if entering:
+                    entering = False
+                    self.nodes_visited += 1
+                    if self.nodes_visited >= self._next_budget_check:
+                        if self.budget.exhausted(self.nodes_visited):
+                            raise SearchStopped()
+                        self._next_budget_check = self._schedule_budget_check()
+                        if self.shared_floor is not None or self.progress is not None:
+                            # Shared floors and reports need the buffered leaves scored
+                            self._score_leaves(leaves[:leaf_count], heap)
+                            leaf_count = 0
+                        if self.shared_floor is not None:
+                            self._exchange_floor(heap)
+                        if self.progress is not None:
+                            self._report_progress(heap, options, totals, level)
+
+                    # Base case: complete schedule found, buffered for batch scoring
+                    if level == depth:
+                        leaves[leaf_count, first_pick:] = picks
+                        leaf_count += 1
+                        if leaf_count == self.LEAF_BATCH_SIZE:
+                            self._score_leaves(leaves, heap)
+                            leaf_count = 0
+                        level -= 1
+                        continue
+
+                    # Cut the subtree if even its best completion cannot enter the top N
+                    if self.use_bounds and self._bounded_out(order, level, profiles[level], heap):
+                        self.nodes_pruned += 1
+                        level -= 1
+                        continue
+
+                    # Branch on the most constrained course, moved to order[level]
+                    position = self._select_position(order, level, domains)
+                    order[level], order[position] = order[position], order[level]
+                    options[level] = domains[order[level]]
+                    totals[level] = options[level].bit_count()
+                    marks[level] = len(trail)
+
+                # Undo the previous child's narrowing, then find the next consistent child
+                mark = marks[level]
+                self._unwind(domains, trail, mark)
+                remaining = options[level]
+                while remaining:
+                    lowest = remaining & -remaining
+                    remaining ^= lowest
+                    index = lowest.bit_length() - 1
+                    if self._narrow(domains, order, level + 1, index, trail):
+                        break
+                    self.nodes_conflicted += 1
+                    self._unwind(domains, trail, mark)
+                else:
+                    level -= 1  # Every section of this level's course is exhausted
+                    continue
+
+                options[level] = remaining
+                picks[level] = index
+                profiles[level + 1] = self.scorer.combine_profiles(
+                    profiles[level], self.section_profiles[index]
+                )
+                level += 1
+                entering = True
+        finally:
+            # Leaves found before the budget ran out still count
+            self._score_leaves(leaves[:leaf_count], heap)
+
+    def _score_leaves(self, leaves: np.ndarray, heap: List[ScheduleHeapElement]) -> None:
+        """
+        Score a block of complete schedules and keep those that enter the top N.
+
+        Scores are computed together by ScheduleScorer.score_batch. Only
+        schedules scoring at least the lowest kept score at the start of the
+        block are considered one by one, in search order.
+
+        Args:
+            leaves: (schedules, courses) array of section class indices
+            heap: Priority queue containing the top N schedules
+        """
+        if not len(leaves):
             return
+        started = time.perf_counter()
+        scores = self.scorer.score_batch(self.score_table, leaves)
+        self.score_seconds += time.perf_counter() - started
+        self.leaves_scored += len(leaves)
+
+        if len(heap) >= self.max_schedules:
+            candidates = np.flatnonzero(scores >= -heap[0].score)
+            self.schedule_count += len(leaves) - len(candidates)
+        else:
+            candidates = range(len(leaves))
 
-        # Try adding each section of the current course
-        course = self.sorted_courses[course_index]
-        for crn, times in self.course_sections[course]:
-            if self._is_valid_addition(flat_schedule, times):
-                # Create new schedule copies to prevent interference
-                new_schedule = current_schedule.copy()
-                new_schedule[crn] = times
-                new_flat_schedule = flat_schedule + times
+        for row in candidates:
+            self._offer(float(scores[row]), tuple(leaves[row].tolist()), heap)
 
-                # Recurse with updated schedule
-                self._dfs(course_index + 1, new_schedule, new_flat_schedule, heap)
+    def _offer(self, score: float, schedule: Tuple[int, ...], heap: List[ScheduleHeapElement]) -> None:
+        """
+        Keep a scored schedule if it enters the top N.
 
-    def _is_valid_addition(
-        self, current_schedule: List[Any], new_times: List[Any]
+        Args:
+            score: The schedule's score
+            schedule: Indices of the section classes in the schedule
+            heap: Priority queue containing the top N schedules
+        """
+        # Skip if we've seen this score before. Scores are compared rounded,
+        # since equal sums added in a different order can differ in the last bit.
+        score_key = round(score, self.SCORE_DIGITS)
+        if score_key in self.seen_scores:
+            return
+
+        self.schedule_count += 1
+
+        if len(heap) < self.max_schedules:
+            heapq.heappush(heap, ScheduleHeapElement(-score, schedule))
+            self.seen_scores.add(score_key)
+        elif -score < heap[0].score:
+            try:
+                old_score = -heap[0].score
+                self.seen_scores.remove(round(old_score, self.SCORE_DIGITS))
+            except KeyError:
+                pass  # If old score wasn't in set, that's okay
+            self.seen_scores.add(score_key)
+            heapq.heapreplace(heap, ScheduleHeapElement(-score, schedule))
+            self.heap_replacements += 1
+
+    def _bounded_out(
+        self,
+        order: List[int],
+        level: int,
+        profile: SectionProfile,
+        heap: List[ScheduleHeapElement],
     ) -> bool:
         """
-        Validate if new time slots can be added to the current schedule.
+        Check whether no completion of a node can enter the top N.
 
-        This method checks for conflicts with existing courses and break
-        periods. A conflict occurs when time slots overlap on the same days
-        or when a class starts during a break period.
+        Args:
+            order: Courses in branching order; order[level:] are unassigned
+            level: Number of courses assigned at the node
+            profile: Summed score components of the sections chosen so far
+            heap: Priority queue containing the top N schedules
+
+        Returns:
+            bool: True if the node's upper bound cannot beat the lowest kept
+            score (or score_floor)
+        """
+        floor = self.score_floor
+        if len(heap) >= self.max_schedules and -heap[0].score > floor:
+            floor = -heap[0].score
+        if floor < 0:
+            return False
+        bounds = self.course_bounds
+        remaining = [bounds[order[position]] for position in range(level, len(order))]
+        return self.scorer.upper_bound(profile, remaining) + self.BOUND_TOLERANCE <= floor
+
+    def _narrow(
+        self, domains: List[int], order: List[int], start: int, index: int, trail: List[int]
+    ) -> bool:
+        """
+        Forward check and propagate the choice of a section, in place.
+
+        The domains of the unassigned courses order[start:] are intersected
+        with the section's compatibility row and made arc consistent again.
+        Every domain change is pushed onto the trail first so _unwind can
+        restore it.
 
         Args:
-            current_schedule: List of existing time slots
-            new_times: List of time slots to be added
+            domains: Section bitsets per sorted course, narrowed in place
+            order: Courses in branching order
+            start: Position in order of the first course still unassigned
+            index: Section class being chosen
+            trail: Flat (course, previous domain) undo log
 
         Returns:
-            bool: True if the new times can be added without conflicts
+            bool: False if some unassigned course runs out of sections
         """
-        for new_time in new_times:
-            # Check conflicts with existing courses
-            for existing_time in current_schedule:
-                if self._check_conflict(new_time, existing_time):
-                    return False
+        compatibility = self.compatibility
+        row = compatibility[index]
+        end = len(order)
+        changed = 0  # Bitset of courses whose domain shrank and must be revisited
 
-            # Check conflicts with break periods
-            for break_time in self.breaks:
-                if (
-                    new_time.begin_time >= break_time["begin_time"]
-                    and new_time.begin_time <= break_time["end_time"]
-                ):
+        for position in range(start, end):
+            course = order[position]
+            domain = domains[course]
+            narrowed = domain & row
+            if narrowed != domain:
+                if not narrowed:
                     return False
+                trail.append(course)
+                trail.append(domain)
+                domains[course] = narrowed
+                changed |= 1 << course
+
+        # Arc consistency: revisit every course against each course that shrank
+        while changed:
+            lowest = changed & -changed
+            changed ^= lowest
+            other = lowest.bit_length() - 1
+            supports = domains[other]
+            for position in range(start, end):
+                course = order[position]
+                if course == other:
+                    continue
+                kept = candidates = domain = domains[course]
+                while candidates:
+                    bit = candidates & -candidates
+                    candidates ^= bit
+                    if not compatibility[bit.bit_length() - 1] & supports:
+                        kept ^= bit
+                if kept != domain:
+                    if not kept:
+                        return False
+                    trail.append(course)
+                    trail.append(domain)
+                    domains[course] = kept
+                    changed |= 1 << course
         return True
 
     @staticmethod
-    def _check_conflict(time1: Any, time2: Any) -> bool:
+    def _unwind(domains: List[int], trail: List[int], mark: int) -> None:
+        """
+        Restore the domains changed since the trail had length mark.
+
+        Args:
+            domains: Section bitsets per sorted course, restored in place
+            trail: Flat (course, previous domain) undo log
+            mark: Trail length to unwind to
+        """
+        while len(trail) > mark:
+            previous = trail.pop()
+            domains[trail.pop()] = previous
+
+    def _branch(
+        self, unassigned: Tuple[int, ...], domains: List[int], profile: SectionProfile
+    ) -> Iterator[Tuple[int, Tuple[int, ...], List[int], SectionProfile]]:
+        """
+        Yield the consistent children of a search node.
+
+        The most constrained unassigned course is chosen and each of its
+        remaining sections is tried in index (best score first) order. The
+        remaining domains are forward checked against the section's
+        compatibility row and made arc consistent; sections that leave some
+        course without candidates are skipped.
+
+        Args:
+            unassigned: Indices into sorted_courses of courses not yet chosen
+            domains: Section bitsets still available to each sorted course
+            profile: Summed score components of the sections chosen so far
+
+        Yields:
+            Tuple: (section index, courses still unassigned, narrowed domains,
+            profile including the section)
+        """
+        course_index = self._select_course(unassigned, domains)
+        remaining = tuple(course for course in unassigned if course != course_index)
+        options = domains[course_index]
+        while options:
+            lowest = options & -options
+            options ^= lowest
+            index = lowest.bit_length() - 1
+
+            # Forward check: restrict remaining courses to compatible sections
+            row = self.compatibility[index]
+            new_domains = domains.copy()
+            changed = []
+            for other in remaining:
+                narrowed = domains[other] & row
+                if narrowed != domains[other]:
+                    new_domains[other] = narrowed
+                    changed.append(other)
+            if self._propagate(new_domains, remaining, changed) is None:
+                self.nodes_conflicted += 1
+                continue  # Some remaining course has no compatible section left
+
+            yield (
+                index,
+                remaining,
+                new_domains,
+                self.scorer.combine_profiles(profile, self.section_profiles[index]),
+            )
+
+    def _exchange_floor(self, heap: List[ScheduleHeapElement]) -> None:
         """
-        Check if two time slots conflict with each other.
+        Publish this search's K-th best score and adopt the best shared one.
 
-        A conflict occurs when two time slots share any days and their
-        time ranges overlap.
+        Parallel workers share the highest K-th best score any of them has
+        reached, so every worker can prune against the global threshold.
 
         Args:
-            time1: First time slot object
-            time2: Second time slot object
+            heap: Priority queue containing the top N schedules
+        """
+        floor = -heap[0].score if len(heap) >= self.max_schedules else -1.0
+        self.score_floor = max(self.score_floor, self.shared_floor.raise_to(floor))
+
+    def _report_progress(
+        self,
+        heap: List[ScheduleHeapElement],
+        options: List[int],
+        totals: List[int],
+        level: int,
+    ) -> None:
+        """
+        Send a progress report if progress_interval has passed since the last.
+
+        The covered fraction treats sibling subtrees as equally large: at each
+        level above the current node, the finished siblings' share of the
+        parent's subtree is added.
+
+        Args:
+            heap: Priority queue containing the top N schedules
+            options: Sections not tried yet at each level of the search stack
+            totals: Sections each level's course started with
+            level: Depth of the node being visited
+        """
+        now = time.monotonic()
+        if now < self._next_progress:
+            return
+        self._next_progress = now + self._progress_interval
+
+        fraction = 0.0
+        weight = 1.0
+        for depth in range(level):
+            finished = totals[depth] - options[depth].bit_count() - 1
+            fraction += weight * finished / totals[depth]
+            weight /= totals[depth]
+
+        scores = sorted(-element.score for element in heap)
+        self.progress(
+            {
+                "nodes_explored": self.nodes_visited,
+                "nodes_pruned": self.nodes_pruned,
+                "fraction_covered": round(fraction, 4),
+                "best_score": scores[-1] if scores else None,
+                "elapsed_seconds": round(now - self._started, 3),
+                "schedules": self._rank(heap) if scores != self._reported_scores else None,
+            }
+        )
+        self._reported_scores = scores
+
+    def _schedule_budget_check(self) -> int:
+        """
+        Pick the node count at which the search next polls its budget.
 
         Returns:
-            bool: True if the time slots conflict
+            int: BUDGET_CHECK_INTERVAL nodes from now, or the node budget if
+            that comes first
+        """
+        next_check = self.nodes_visited + self.BUDGET_CHECK_INTERVAL
+        if self.budget.max_nodes is not None:
+            next_check = min(next_check, self.budget.max_nodes)
+        return next_check
 
-        Note:
-            Time slot objects must have 'days', 'begin_time', and 'end_time'
-            attributes. Days should be comparable using set operations.
+    def _count_node(self) -> None:
+        """
+        Count a visited node, polling the budget when a check is due.
+
+        Used by the search engines outside _dfs, which polls inline.
+
+        Raises:
+            SearchStopped: When the search budget is exhausted
+        """
+        self.nodes_visited += 1
+        if self.nodes_visited >= self._next_budget_check:
+            if self.budget.exhausted(self.nodes_visited):
+                raise SearchStopped()
+            self._next_budget_check = self._schedule_budget_check()
+
+    def _select_course(self, unassigned: Tuple[int, ...], domains: List[int]) -> int:
+        """
+        Choose the course to branch on next.
+
+        With dynamic ordering this is the unassigned course with the fewest
+        sections left in its domain, breaking ties in favour of the course
+        that conflicts with the most sections of other courses, then the
+        lowest index. Static ordering keeps the sorted_courses order.
+
+        Args:
+            unassigned: Indices into sorted_courses of courses not yet chosen
+            domains: Section bitsets still available to each sorted course
+
+        Returns:
+            int: Index into sorted_courses of the course to branch on
+        """
+        order = list(unassigned)
+        return order[self._select_position(order, 0, domains)]
+
+    def _select_position(self, order: List[int], level: int, domains: List[int]) -> int:
+        """
+        Choose the course to branch on among order[level:].
+
+        Uses the same strategy as _select_course. Ties are broken by course
+        index rather than position, so the choice does not depend on how
+        earlier levels rearranged order.
+
+        Args:
+            order: Courses in branching order; order[level:] are unassigned
+            level: Number of courses already assigned
+            domains: Section bitsets still available to each sorted course
+
+        Returns:
+            int: Position in order of the course to branch on
+        """
+        if self.ordering == "static":
+            return min(range(level, len(order)), key=order.__getitem__)
+
+        best_position = level
+        best_key = (domains[order[level]].bit_count(), -self.conflict_degree[order[level]], order[level])
+        for position in range(level + 1, len(order)):
+            course = order[position]
+            size = domains[course].bit_count()
+            if size > best_key[0]:
+                continue
+            key = (size, -self.conflict_degree[course], course)
+            if key < best_key:
+                best_position = position
+                best_key = key
+        return best_position
+
+    def _propagate(
+        self,
+        domains: List[int],
+        courses: Tuple[int, ...],
+        changed: Optional[List[int]] = None,
+    ) -> Optional[List[int]]:
         """
-        return (
-            set(time1.days) & set(time2.days)  # Common days exist
-            and time1.end_time > time2.begin_time  # time1 ends after time2 starts
-            and time1.begin_time < time2.end_time  # time1 starts before time2 ends
+        Enforce arc consistency between the given courses' domains in place.
+
+        A section is removed from a course's domain when it is incompatible
+        with every remaining section of some other course. Removals can make
+        further sections unsupported, so affected arcs are revisited until
+        nothing changes (AC-3).
+
+        Args:
+            domains: Section bitsets per sorted course, narrowed in place
+            courses: Indices of the courses to make consistent
+            changed: Courses whose domains shrank since they were last
+                consistent. None checks every arc.
+
+        Returns:
+            Optional[List[int]]: The narrowed domains, or None if any course
+            runs out of sections
+        """
+        if any(not domains[course] for course in courses):
+            return None
+
+        if changed is None:
+            changed = courses
+        queue = deque(
+            (course, other) for other in changed for course in courses if course != other
         )
+        queued = set(queue)
+
+        while queue:
+            course, other = queue.popleft()
+            queued.discard((course, other))
+
+            supports = domains[other]
+            kept = remaining = domains[course]
+            while remaining:
+                lowest = remaining & -remaining
+                remaining ^= lowest
+                if not self.compatibility[lowest.bit_length() - 1] & supports:
+                    kept ^= lowest
+
+            if kept != domains[course]:
+                if not kept:
+                    return None
+                domains[course] = kept
+                for neighbor in courses:
+                    arc = (neighbor, course)
+                    if neighbor != course and neighbor != other and arc not in queued:
+                        queue.append(arc)
+                        queued.add(arc)
+        return domains
+
+    def _count_conflicts(self) -> List[int]:
+        """
+        Count the incompatible section pairs each course takes part in.
+
+        Returns:
+            List[int]: Number of (own section, other course section) pairs that
+            overlap, per sorted course
+        """
+        all_sections = (1 << len(self.sections)) - 1
+        degrees = []
+        for bits in self.course_bits:
+            others = all_sections & ~bits
+            degree = 0
+            sections = bits
+            while sections:
+                lowest = sections & -sections
+                sections ^= lowest
+                degree += (others & ~self.compatibility[lowest.bit_length() - 1]).bit_count()
+            degrees.append(degree)
+        return degrees
+
+    def _find_conflicting_courses(self) -> Optional[Tuple[str, str]]:
+        """
+        Find a pair of courses that can never be taken together.
+
+        Returns:
+            Optional[Tuple[str, str]]: The first pair of courses, both with
+            available sections, where every combination of their sections
+            overlaps, or None if every pair has a compatible combination
+        """
+        for first, first_bits in enumerate(self.course_bits):
+            for second in range(first + 1, len(self.course_bits)):
+                second_bits = self.course_bits[second]
+                if not first_bits or not second_bits:
+                    continue
+
+                supported = False
+                sections = first_bits
+                while sections and not supported:
+                    lowest = sections & -sections
+                    sections ^= lowest
+                    supported = bool(
+                        self.compatibility[lowest.bit_length() - 1] & second_bits
+                    )
+                if not supported:
+                    return (self.sorted_courses[first], self.sorted_courses[second])
+        return None
+
+    def _expand_variants(self, chosen: Tuple[int, ...]) -> List[Dict[str, List[Any]]]:
+        """
+        Expand a schedule of section classes into concrete schedules.
+
+        Args:
+            chosen: Indices of the section classes in the schedule
+
+        Returns:
+            List[Dict[str, List[Any]]]: Up to MAX_VARIANTS schedules mapping
+            CRNs to time slots, one per combination of equivalent sections
+        """
+        combinations = product(*(self.equivalent_sections[index] for index in chosen))
+        return [
+            {crn: self.section_time_dict[crn] for crn, _ in variant}
+            for variant in islice(combinations, self.MAX_VARIANTS)
+        ]
+
+    @staticmethod
+    def _meeting_signature(times: Tuple[CompiledSlot, ...]) -> Tuple:
+        """
+        Describe a section's meeting pattern independently of the section.
+
+        Args:
+            times: The section's compiled time slots
+
+        Returns:
+            Tuple: Sorted (days, begin, end) minutes of every time slot
+        """
+        return tuple(sorted((slot.days, slot.begin, slot.end) for slot in times))
+
+    def _build_compatibility(self) -> List[int]:
+        """
+        Build the section-by-section compatibility table as bitset rows.
+
+        Row i has bit j set when section j belongs to a different course and
+        its meetings do not overlap section i. Each pair is checked once here,
+        so the search never compares meeting times again.
+
+        Returns:
+            List[int]: Compatibility bitset for every indexed section
+        """
+        masks = [self.section_masks[crn] for crn, _ in self.sections]
+        course_of = [
+            course_index
+            for course_index, bits in enumerate(self.course_bits)
+            for _ in range(bits.bit_count())
+        ]
+
+        compatibility = [0] * len(self.sections)
+        for i in range(len(self.sections)):
+            for j in range(i + 1, len(self.sections)):
+                if course_of[i] != course_of[j] and not masks[i] & masks[j]:
+                    compatibility[i] |= 1 << j
+                    compatibility[j] |= 1 << i
+        return compatibility
@@ -7,9 +7,11 @@ and day-based schedule optimization.
 
 Key Features:
     - Time preference scoring using exponential decay
+    - Minute-of-day time score lookup tables shared across requests
     - Day distribution analysis and scoring
     - Preference-based schedule optimization
-    - Performance optimization through caching
+    - Optimistic score bounds for partial schedules (branch-and-bound)
+    - Vectorized NumPy scoring of blocks of schedules
     - Comprehensive error handling and logging
     - Configurable scoring parameters
 
@@ -24,6 +26,10 @@ Example Usage:
     
     scorer = ScheduleScorer(preferences)
     score = scorer.score_schedule(schedule_tuple)
+
+    # Many schedules at once, as rows of section indices into a table
+    table = scorer.score_table([section_1_times, section_2_times, section_3_times])
+    scores = scorer.score_batch(table, np.array([[0, 1], [0, 2]]))
     ```
 
 Note:
@@ -33,11 +39,12 @@ Note:
 
 from dataclasses import dataclass
 from datetime import datetime, time
-from typing import List, Set, Dict, Tuple, Optional
+from typing import List, Set, Dict, Tuple, Optional, NamedTuple, Sequence
 from collections import Counter
 import math
 import logging
-from functools import lru_cache
+
+import numpy as np
 
 # Configure logging with detailed output format
 logging.basicConfig(
@@ -79,12 +86,54 @@ class TimePreference:
             raise ValueError(f"preferred_days must be subset of {valid_days}")
 
 
+class SectionProfile(NamedTuple):
+    """Additive per-section quantities that a schedule's score is built from."""
+
+    time_total: float  # Sum of the time scores of the section's slots
+    slot_count: int  # Number of meeting slots
+    preferred_count: int  # Day entries falling on preferred days
+    day_count: int  # All day entries, as counted by the day score
+
+
+class CourseBound(NamedTuple):
+    """Best-case summary of the sections a course can still contribute."""
+
+    best_time_mean: float
+    min_slots: int
+    max_slots: int
+    best_preferred_ratio: float
+    min_days: int
+    max_days: int
+
+
+EMPTY_PROFILE = SectionProfile(0.0, 0, 0, 0)
+
+MINUTES_PER_DAY = 24 * 60
+
+# Minute-of-day time score tables by preferred_time, see ScheduleScorer.time_score_table
+_TIME_SCORE_TABLES: Dict[str, np.ndarray] = {}
+
+
+class ScoreTable(NamedTuple):
+    """Per-section score components as arrays, indexed by section, for score_batch."""
+
+    time_totals: np.ndarray  # Sum of the time scores of each section's slots
+    slot_counts: np.ndarray  # Number of meeting slots per section
+    weekday_counts: np.ndarray  # (sections, 5) day entries per weekday, in WEEKDAYS order
+    other_day_counts: np.ndarray  # Day characters that are not weekdays (ONLINE, ARR, ...)
+
+
 class ScheduleScorer:
     """A schedule scoring system that evaluates schedules based on user preferences."""
 
     # Class-level constants
     VALID_DAYS = frozenset({"M", "T", "W", "R", "F"})
 
+    # VALID_DAYS in calendar order, the order the distribution score walks it.
+    # Not derived from VALID_DAYS, whose iteration order depends on the hash
+    # seed and so differs between processes.
+    WEEKDAYS = ("M", "T", "W", "R", "F")
+
     # Define peak times for each period (not just midpoints)
     TIME_PEAKS = {
         "morning": [
@@ -125,27 +174,53 @@ class ScheduleScorer:
             preferred_days=set(preferences.get("preferred_days", [])),
             day_weight=preferences.get("day_weight", 0.5),
         )
+        self.time_scores = self.time_score_table(self.preferences.preferred_time)
+        self._slot_scores = self.time_scores.tolist()  # Python floats for scalar lookups
 
     @staticmethod
     def _convert_to_minutes(t: time) -> int:
         """Convert time to minutes since midnight."""
         return t.hour * 60 + t.minute
 
-    def _calculate_time_score_for_slot(self, class_time: time) -> float:
-        """Calculate time score using piecewise linear interpolation between peak times."""
-        if class_time == time(0, 0):  # Online class
-            return self.ONLINE_CLASS_SCORES[self.preferences.preferred_time]
+    @classmethod
+    def time_score_table(cls, preferred_time: str) -> np.ndarray:
+        """
+        Time score of a slot starting at each minute of the day.
+
+        Built once per preferred_time per process and shared by every scorer;
+        the entry for midnight is the online class score. The array is read-only.
 
-        peaks = self.TIME_PEAKS[self.preferences.preferred_time]
-        class_minutes = self._convert_to_minutes(class_time)
+        Args:
+            preferred_time: "morning", "afternoon" or "evening"
+
+        Returns:
+            np.ndarray: MINUTES_PER_DAY scores indexed by minute of day
+        """
+        table = _TIME_SCORE_TABLES.get(preferred_time)
+        if table is None:
+            table = np.array(
+                [
+                    cls._interpolate_time_score(preferred_time, minutes)
+                    for minutes in range(MINUTES_PER_DAY)
+                ]
+            )
+            table[0] = cls.ONLINE_CLASS_SCORES[preferred_time]  # Online classes start at 00:00
+            table.flags.writeable = False
+            _TIME_SCORE_TABLES[preferred_time] = table
+        return table
+
+    @classmethod
+    def _interpolate_time_score(cls, preferred_time: str, class_minutes: int) -> float:
+        """Calculate time score using piecewise linear interpolation between peak times."""
+        peaks = cls.TIME_PEAKS[preferred_time]
 
         # Find surrounding peak times
         for i in range(len(peaks) - 1):
             time1, score1 = peaks[i]
             time2, score2 = peaks[i + 1]
 
-            time1_mins = self._convert_to_minutes(time1)
-            time2_mins = self._convert_to_minutes(time2)
+            time1_mins = cls._convert_to_minutes(time1)
+            time2_mins = cls._convert_to_minutes(time2)
 
             if time1_mins <= class_minutes <= time2_mins:
                 # Linear interpolation between peaks
@@ -154,34 +229,279 @@ class ScheduleScorer:
 
         # Outside preferred range - exponential falloff
         nearest_peak_mins = min(
-            (abs(self._convert_to_minutes(t) - class_minutes), s) for t, s in peaks
+            (abs(cls._convert_to_minutes(t) - class_minutes), s) for t, s in peaks
         )[1]
 
         return nearest_peak_mins * 0.5  # Halve the score of nearest peak time
 
-    @lru_cache(maxsize=1024)
+    def _calculate_time_score_for_slot(self, class_time: time) -> float:
+        """Look up the time score of a slot starting at class_time."""
+        return self._slot_scores[class_time.hour * 60 + class_time.minute]
+
     def score_schedule(self, schedule: Tuple) -> float:
         """Calculate comprehensive score for a schedule."""
         if not schedule:
             return 0.0
 
         try:
-            time_score = self._calculate_time_score(schedule)
-            day_score = self._calculate_day_score(schedule)
-
-            return max(
-                min(
-                    time_score * self.preferences.time_weight
-                    + day_score * self.preferences.day_weight,
-                    1.0,
-                ),
-                0.0,
-            )
+            time_total = sum(self._calculate_time_score_for_slot(slot.begin_time) for slot in schedule)
+            day_counts = Counter(day for slot in schedule for day in slot.days)
+            return self.score_components(time_total, len(schedule), day_counts)
 
         except Exception as e:
             logger.error(f"Error scoring schedule: {str(e)}")
             return 0.0
 
+    def score_components(self, time_total: float, slot_count: int, day_counts: Counter) -> float:
+        """
+        Score a schedule from its running sums, with the formula of score_schedule.
+
+        Args:
+            time_total: Sum of the time scores of the schedule's slots
+            slot_count: Number of meeting slots
+            day_counts: Day entries per day character
+
+        Returns:
+            float: The schedule's score, 0.0 for a schedule without slots
+        """
+        if not slot_count:
+            return 0.0
+
+        time_score = time_total / slot_count
+        if self.preferences.preferred_days == self.VALID_DAYS:
+            day_score = self._calculate_improved_distribution_score(day_counts)
+        else:
+            day_score = self._calculate_improved_preference_score(day_counts)
+
+        return max(
+            min(
+                time_score * self.preferences.time_weight
+                + day_score * self.preferences.day_weight,
+                1.0,
+            ),
+            0.0,
+        )
+
+    def section_profile(self, section_times: Sequence) -> SectionProfile:
+        """Summarize a section's meeting times into its additive score components."""
+        day_counts = Counter(day for section in section_times for day in section.days)
+        return SectionProfile(
+            time_total=sum(
+                self._calculate_time_score_for_slot(section.begin_time)
+                for section in section_times
+            ),
+            slot_count=len(section_times),
+            preferred_count=sum(
+                count
+                for day, count in day_counts.items()
+                if day in self.preferences.preferred_days
+            ),
+            day_count=sum(day_counts.values()),
+        )
+
+    @staticmethod
+    def combine_profiles(first: SectionProfile, second: SectionProfile) -> SectionProfile:
+        """Add two profiles component-wise."""
+        return SectionProfile(
+            first.time_total + second.time_total,
+            first.slot_count + second.slot_count,
+            first.preferred_count + second.preferred_count,
+            first.day_count + second.day_count,
+        )
+
+    @staticmethod
+    def course_bound(profiles: Sequence[SectionProfile]) -> CourseBound:
+        """Summarize the best any one of a course's candidate sections can contribute."""
+        return CourseBound(
+            best_time_mean=max(
+                (p.time_total / p.slot_count for p in profiles if p.slot_count),
+                default=0.0,
+            ),
+            min_slots=min((p.slot_count for p in profiles), default=0),
+            max_slots=max((p.slot_count for p in profiles), default=0),
+            best_preferred_ratio=max(
+                (p.preferred_count / p.day_count for p in profiles if p.day_count),
+                default=0.0,
+            ),
+            min_days=min((p.day_count for p in profiles), default=0),
+            max_days=max((p.day_count for p in profiles), default=0),
+        )
+
+    def upper_bound(
+        self, partial: SectionProfile, remaining: Sequence[CourseBound]
+    ) -> float:
+        """
+        Optimistic score for any completion of a partial schedule.
+
+        Both the time score and the preferred-day ratio are averages, so each
+        is bounded by letting every remaining course contribute its best
+        per-slot average with the most favourable slot count. Day penalties
+        are ignored, which can only raise the bound.
+        """
+        time_bound = self._max_completion_mean(
+            partial.time_total,
+            partial.slot_count,
+            [(c.best_time_mean, c.min_slots, c.max_slots) for c in remaining],
+        )
+
+        if self.preferences.preferred_days == self.VALID_DAYS:
+            day_bound = 1.0  # Distribution score is at most 1 / (1 + 0)
+        else:
+            preferred_ratio = self._max_completion_mean(
+                partial.preferred_count,
+                partial.day_count,
+                [(c.best_preferred_ratio, c.min_days, c.max_days) for c in remaining],
+            )
+            day_bound = min(preferred_ratio + self._max_spacing_bonus(), 1.0)
+
+        return max(
+            min(
+                time_bound * self.preferences.time_weight
+                + day_bound * self.preferences.day_weight,
+                1.0,
+            ),
+            0.0,
+        )
+
+    @staticmethod
+    def _max_completion_mean(
+        total: float, count: int, options: Sequence[Tuple[float, int, int]]
+    ) -> float:
+        """Maximize (total + sum(mean_i * n_i)) / (count + sum(n_i)) over n_i in [min_i, max_i]."""
+        for mean, min_count, _ in options:
+            total += mean * min_count
+            count += min_count
+
+        # Extra weight only helps for means above the running average
+        for mean, min_count, max_count in sorted(options, reverse=True):
+            if count and mean <= total / count:
+                break
+            total += mean * (max_count - min_count)
+            count += max_count - min_count
+
+        return total / count if count else 0.0
+
+    def _max_spacing_bonus(self) -> float:
+        """Largest spacing bonus _calculate_improved_preference_score can award."""
+        preferred_day_list = sorted(self.preferences.preferred_days)
+        return sum(
+            0.1
+            for day1, day2 in zip(preferred_day_list, preferred_day_list[1:])
+            if abs(ord(day2) - ord(day1)) >= 2
+        )
+
+    def score_table(self, sections: Sequence[Sequence]) -> ScoreTable:
+        """Precompute the per-section score components score_batch combines."""
+        # Every slot's section and start minute, converted once; bincount adds
+        # each section's slot scores in order, like score_schedule
+        slot_sections = np.array(
+            [index for index, section_times in enumerate(sections) for _ in section_times],
+            dtype=np.intp,
+        )
+        slot_minutes = np.array(
+            [
+                self._convert_to_minutes(slot.begin_time)
+                for section_times in sections
+                for slot in section_times
+            ],
+            dtype=np.intp,
+        )
+        time_totals = np.bincount(
+            slot_sections, weights=self.time_scores[slot_minutes], minlength=len(sections)
+        )
+        slot_counts = np.bincount(slot_sections, minlength=len(sections)).astype(float)
+        weekday_counts = np.zeros((len(sections), len(self.WEEKDAYS)))
+        other_day_counts = np.zeros(len(sections))
+        for index, section_times in enumerate(sections):
+            day_counts = Counter(day for section in section_times for day in section.days)
+            weekday_counts[index] = [day_counts.get(day, 0) for day in self.WEEKDAYS]
+            other_day_counts[index] = sum(day_counts.values()) - weekday_counts[index].sum()
+        return ScoreTable(time_totals, slot_counts, weekday_counts, other_day_counts)
+
+    def score_batch(self, table: ScoreTable, schedules: np.ndarray) -> np.ndarray:
+        """
+        Score many schedules at once; matches score_schedule up to float rounding.
+
+        Args:
+            table: Score components of the sections, from score_table
+            schedules: (schedules, sections per schedule) array of row indices
+                into the table
+
+        Returns:
+            np.ndarray: One score per schedule
+        """
+        slot_counts = table.slot_counts[schedules].sum(axis=1)
+        has_slots = slot_counts > 0
+        time_scores = np.divide(
+            table.time_totals[schedules].sum(axis=1),
+            slot_counts,
+            out=np.zeros(len(schedules)),
+            where=has_slots,
+        )
+
+        counts = table.weekday_counts[schedules].sum(axis=1)
+        if self.preferences.preferred_days == self.VALID_DAYS:
+            day_scores = self._batch_distribution_scores(counts)
+        else:
+            day_scores = self._batch_preference_scores(
+                counts, table.other_day_counts[schedules].sum(axis=1)
+            )
+
+        scores = np.clip(
+            time_scores * self.preferences.time_weight
+            + day_scores * self.preferences.day_weight,
+            0.0,
+            1.0,
+        )
+        return np.where(has_slots, scores, 0.0)
+
+    def _batch_distribution_scores(self, counts: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_improved_distribution_score over rows of weekday counts."""
+        mean = counts.mean(axis=1, keepdims=True)
+        std_dev = np.sqrt(((counts - mean) ** 2).mean(axis=1))
+        distribution_scores = 1 / (1 + std_dev)
+
+        present = counts > 0
+        consecutive_penalties = 0.1 * np.where(
+            present[:, :-1] & present[:, 1:],
+            np.minimum(counts[:, :-1], counts[:, 1:]),
+            0,
+        ).sum(axis=1)
+
+        gap_penalties = np.zeros(len(counts))
+        last_class_day = np.full(len(counts), -1)
+        for day in range(counts.shape[1]):
+            gap_penalties += 0.1 * (
+                present[:, day] & (last_class_day != -1) & (day - last_class_day > 2)
+            )
+            last_class_day = np.where(present[:, day], day, last_class_day)
+
+        scores = np.maximum(
+            distribution_scores * (1 - consecutive_penalties) * (1 - gap_penalties), 0.001
+        )
+        return np.where(present.any(axis=1), scores, 0.0)
+
+    def _batch_preference_scores(self, counts: np.ndarray, other_counts: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_improved_preference_score over rows of weekday counts."""
+        total_classes = counts.sum(axis=1) + other_counts
+        preferred = [day in self.preferences.preferred_days for day in self.WEEKDAYS]
+        base_scores = np.divide(
+            counts[:, preferred].sum(axis=1),
+            total_classes,
+            out=np.zeros(len(counts)),
+            where=total_classes > 0,
+        )
+
+        spacing_bonuses = np.zeros(len(counts))
+        preferred_day_list = sorted(self.preferences.preferred_days)
+        for day1, day2 in zip(preferred_day_list, preferred_day_list[1:]):
+            if abs(ord(day2) - ord(day1)) >= 2:
+                column1 = self.WEEKDAYS.index(day1)
+                column2 = self.WEEKDAYS.index(day2)
+                spacing_bonuses += 0.1 * ((counts[:, column1] > 0) & (counts[:, column2] > 0))
+
+        return np.where(total_classes > 0, np.minimum(base_scores + spacing_bonuses, 1.0), 0.0)
+
     def _calculate_time_score(self, schedule: Tuple) -> float:
         """Calculate time-based score using piecewise linear interpolation."""
         if not schedule:
@@ -216,7 +536,7 @@ class ScheduleScorer:
         if not day_counts:
             return 0.0
 
-        counts = [day_counts.get(day, 0) for day in self.VALID_DAYS]
+        counts = [day_counts.get(day, 0) for day in self.WEEKDAYS]
 
         if not any(counts):
             return 0.0
@@ -0,0 +1,155 @@
+"""
+Search Estimator Module
+
+This module predicts, before any search, how many schedules a request has and
+how long an exhaustive search of them would take, and picks a search strategy
+from that prediction. It reads only a CompiledCatalog, so it costs a small
+fraction of compiling a ScheduleGenerator and can back a lightweight endpoint.
+
+Model:
+    Sections with identical meeting times are searched once, so each course
+    counts its distinct meeting patterns (outside the breaks). For every
+    pair of courses, the share of pattern pairs that overlap is measured,
+    exactly when there are at most SAMPLES_PER_PAIR pattern pairs and
+    otherwise on a seeded sample. Treating the pairs as independent, the
+    expected number of conflict-free schedules is the product of the pattern
+    counts times the product over course pairs of (1 - conflict rate). The
+    search time is that number over LEAVES_PER_SECOND, the rate at which the
+    depth-first search visits complete schedules without bound pruning, so
+    it is a worst case; bound pruning usually cuts it by a large factor.
+
+Example Usage:
+    ```python
+    catalog = CompiledCatalog.compile(section_dict, section_time_dict)
+    estimate = estimate_search(catalog, breaks)
+    strategy = choose_strategy(estimate, timeout=90, workers=4)
+    ```
+"""
+
+import math
+import random
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple
+
+from .compiled_catalog import CompiledCatalog
+
+# Pattern pairs compared per pair of courses before sampling
+SAMPLES_PER_PAIR = 256
+
+# Complete schedules per second of an unpruned depth-first search (one core),
+# calibrated on the benchmark catalogs (benchmarks/bench_estimator.py)
+LEAVES_PER_SECOND = 200_000
+
+# Estimated seconds up to which a plain serial search is used
+AUTO_DFS_SECONDS = 1.0
+
+# Courses from which the meet-in-the-middle search is preferred to a serial
+# depth-first search
+AUTO_MITM_MIN_COURSES = 7
+
+# Estimated seconds, as a multiple of the timeout, from which the
+# approximate beam search is used
+AUTO_BEAM_TIMEOUTS = 20
+
+STRATEGIES = ("dfs", "parallel", "mitm", "beam")
+
+
+class SearchEstimate(NamedTuple):
+    """Predicted size and cost of a request's search."""
+
+    courses: int  # Requested courses with sections
+    combinations: int  # Product of the meeting patterns per course
+    conflict_rate: float  # Mean share of overlapping pattern pairs between two courses
+    estimated_schedules: float  # Expected conflict-free schedules, by meeting pattern
+    estimated_seconds: float  # Worst-case depth-first search time
+
+
+def estimate_search(
+    catalog: CompiledCatalog, breaks: List[Dict[str, Any]], seed: int = 0
+) -> SearchEstimate:
+    """
+    Predict the number of schedules of a request and its search time.
+
+    Args:
+        catalog: The request's compiled sections
+        breaks: List of break periods with begin_time and end_time
+        seed: Seed for sampling pattern pairs of large courses
+
+    Returns:
+        SearchEstimate: The prediction
+    """
+    masks = catalog.occupancy_masks()
+    blocked = set(catalog.starts_during(breaks))
+
+    # One occupancy mask per distinct meeting pattern of each course
+    patterns: Dict[int, Dict[tuple, int]] = defaultdict(dict)
+    for section in range(len(catalog)):
+        course_patterns = patterns[catalog.section_course[section]]  # Kept even if all blocked
+        if section not in blocked:
+            signature = tuple(
+                sorted((slot.days, slot.begin, slot.end) for slot in catalog.section_slots(section))
+            )
+            course_patterns.setdefault(signature, masks[section])
+    courses = [list(course_patterns.values()) for course_patterns in patterns.values()]
+
+    combinations = math.prod(len(course_masks) for course_masks in courses)
+    if not combinations:
+        return SearchEstimate(len(courses), 0, 0.0, 0.0, 0.0)
+
+    rng = random.Random(seed)
+    log_feasible = sum(math.log(len(course_masks)) for course_masks in courses)
+    rates = []
+    for first in range(len(courses)):
+        for second in range(first + 1, len(courses)):
+            rate = _conflict_rate(courses[first], courses[second], rng)
+            rates.append(rate)
+            if rate >= 1.0:
+                return SearchEstimate(len(courses), combinations, sum(rates) / len(rates), 0.0, 0.0)
+            log_feasible += math.log1p(-rate)
+
+    estimated_schedules = math.exp(log_feasible)
+    return SearchEstimate(
+        courses=len(courses),
+        combinations=combinations,
+        conflict_rate=sum(rates) / len(rates) if rates else 0.0,
+        estimated_schedules=estimated_schedules,
+        estimated_seconds=estimated_schedules / LEAVES_PER_SECOND,
+    )
+
+
+def _conflict_rate(first: List[int], second: List[int], rng: random.Random) -> float:
+    """Share of overlapping pairs between two courses' pattern masks, sampled if many."""
+    pairs = len(first) * len(second)
+    if pairs <= SAMPLES_PER_PAIR:
+        conflicts = sum(1 for mask in first for other in second if mask & other)
+        return conflicts / pairs
+    conflicts = sum(
+        1 for _ in range(SAMPLES_PER_PAIR) if rng.choice(first) & rng.choice(second)
+    )
+    return conflicts / SAMPLES_PER_PAIR
+
+
+def choose_strategy(estimate: SearchEstimate, timeout: float, workers: int) -> str:
+    """
+    Pick how to search a request from its estimate.
+
+    Args:
+        estimate: Output of estimate_search
+        timeout: Seconds the search may run
+        workers: Processes available to one search
+
+    Returns:
+        str: "dfs" for a serial depth-first search, "parallel" for a
+        depth-first search on a process pool, "mitm" for the
+        meet-in-the-middle search, or "beam" for the approximate beam search
+    """
+    seconds = estimate.estimated_seconds
+    if seconds <= AUTO_DFS_SECONDS:
+        return "dfs"
+    if seconds > timeout * AUTO_BEAM_TIMEOUTS:
+        return "beam"
+    if workers > 1:
+        return "parallel"
+    if estimate.courses >= AUTO_MITM_MIN_COURSES:
+        return "mitm"
+    return "dfs"
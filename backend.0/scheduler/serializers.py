@@ -57,4 +57,14 @@ class ScheduleInputSerializer(serializers.Serializer):
     preferred_time = serializers.CharField()
     day_weight = serializers.FloatField()
     time_weight = serializers.FloatField()
-    
\ No newline at end of file
+    timeout = serializers.FloatField(required=False, min_value=0.1)
+    max_nodes = serializers.IntegerField(required=False, min_value=1)
+    engine = serializers.ChoiceField(choices=["dfs", "mip", "mitm", "auto"], required=False)
+    mode = serializers.ChoiceField(choices=["exact", "beam", "auto"], required=False)
+    beam_width = serializers.IntegerField(required=False, min_value=1, max_value=1024)
+    include_stats = serializers.BooleanField(required=False, default=False)
+
+class ScheduleEstimateSerializer(serializers.Serializer):
+    courses = serializers.ListField(child=serializers.CharField())
+    breaks = serializers.ListField(child=BreakSerializer(), allow_empty=True, required=False, default=list)
+    timeout = serializers.FloatField(required=False, min_value=0.1)
@@ -0,0 +1,190 @@
+"""
+Term Catalog Module
+
+This module keeps a read-only, in-memory snapshot of the term's sections and
+meeting times in each worker, so fetching a request's sections is a few
+dictionary lookups instead of a database query. The catalog only changes
+when the section scraper runs, which bumps a catalog version when it
+finishes.
+
+The snapshot is loaded on first use. After that, at most every
+check_interval seconds a request triggers a background check of the catalog
+version; when it changed, the new snapshot is loaded in that background
+thread and replaces the old one with a single assignment, so requests
+always see either the old or the new snapshot, never a mix, and never wait
+for a reload. The store's release function runs when the background thread
+finishes, e.g. to close the database connection the thread opened; the
+first load runs in the request's thread and leaves its connection alone.
+
+Snapshots come from the store's load function: a TermCatalog read from the
+database, or a catalog_file.MappedCatalog, whose reload only maps the new
+file, so swapping it in is just replacing a reference.
+
+Example Usage:
+    ```python
+    store = TermCatalogStore(load_catalog, read_version)
+    section_dict, section_time_dict, missing = store.get().fetch_sections(courses)
+    ```
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class TermCatalog:
+    """
+    Read-only snapshot of a term's sections and meeting times by course.
+
+    Attributes:
+        version (Optional[int]): Catalog version the snapshot was loaded at
+        course_sections (Dict[str, Tuple[Dict, Dict]]): (section_dict,
+            section_time_dict) per course code
+    """
+
+    __slots__ = ("version", "course_sections")
+
+    def __init__(
+        self,
+        version: Optional[int],
+        section_dict: Dict[Any, Any],
+        section_time_dict: Dict[Any, List[Any]],
+    ) -> None:
+        """
+        Index fetched sections by course.
+
+        Args:
+            version: Catalog version the sections were read at
+            section_dict: Dictionary mapping CRNs to section information
+            section_time_dict: Dictionary mapping CRNs to time slots
+        """
+        self.version = version
+        self.course_sections: Dict[str, Tuple[Dict[Any, Any], Dict[Any, List[Any]]]] = {}
+        for crn, section in section_dict.items():
+            sections, times = self.course_sections.setdefault(section.course, ({}, {}))
+            sections[crn] = section
+            times[crn] = section_time_dict.get(crn, [])
+
+    def __len__(self) -> int:
+        return sum(len(sections) for sections, _ in self.course_sections.values())
+
+    def fetch_sections(self, courses: List[str]) -> Tuple[Dict, Dict, List[str]]:
+        """
+        Return the sections of the courses.
+
+        Args:
+            courses: Course codes of the request
+
+        Returns:
+            Tuple[Dict, Dict, List[str]]: section_dict, section_time_dict and
+            the courses without sections, like SectionFetcher.fetch_sections
+        """
+        section_dict, section_time_dict, missing_sections = {}, {}, []
+        for course in courses:
+            if course not in self.course_sections:
+                missing_sections.append(course)
+                continue
+            sections, times = self.course_sections[course]
+            section_dict.update(sections)
+            section_time_dict.update(times)
+        return section_dict, section_time_dict, missing_sections
+
+
+class TermCatalogStore:
+    """
+    Holds the current TermCatalog and reloads it in the background when the
+    catalog version changes.
+    """
+
+    # Seconds between checks of the catalog version
+    CHECK_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        load: Callable[[], TermCatalog],
+        read_version: Callable[[], Optional[int]],
+        check_interval: float = CHECK_INTERVAL,
+        release: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Args:
+            load: Reads the whole catalog (a TermCatalog, or any object with
+                its version, len and fetch_sections); called on first use and
+                on reloads
+            read_version: Reads the current catalog version
+            check_interval: Seconds between checks of the catalog version
+            release: Called in the background refresh thread when it is done,
+                to free what load and read_version acquired in that thread
+        """
+        self._load = load
+        self._read_version = read_version
+        self.check_interval = check_interval
+        self._release = release
+        self._catalog: Optional[TermCatalog] = None
+        self._checked = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get(self) -> TermCatalog:
+        """
+        Return the current snapshot, loading it on first use.
+
+        Starts a background check of the catalog version when the last one
+        is more than check_interval seconds old.
+
+        Returns:
+            TermCatalog: The current snapshot
+        """
+        catalog = self._catalog
+        if catalog is None:
+            with self._lock:
+                if self._catalog is None:
+                    self._catalog = self._load()
+                    self._checked = time.monotonic()
+                return self._catalog
+
+        if time.monotonic() - self._checked >= self.check_interval:
+            with self._lock:
+                start = not self._refreshing
+                self._refreshing = True
+            if start:
+                threading.Thread(
+                    target=self._refresh_in_background, name="term-catalog-refresh", daemon=True
+                ).start()
+        return catalog
+
+    def _refresh_in_background(self) -> None:
+        """Run refresh in the background thread, then release its resources."""
+        try:
+            self.refresh()
+        finally:
+            if self._release is not None:
+                self._release()
+
+    def refresh(self) -> bool:
+        """
+        Reload the snapshot if the catalog version changed.
+
+        Errors are logged and keep the current snapshot, so a failed check
+        is retried after the next check_interval.
+
+        Returns:
+            bool: Whether a new snapshot was loaded
+        """
+        try:
+            version = self._read_version()
+            if self._catalog is not None and version == self._catalog.version:
+                return False
+            catalog = self._load()
+            self._catalog = catalog
+            logger.info(f"Loaded term catalog version {catalog.version} ({len(catalog)} sections)")
+            return True
+        except Exception:
+            logger.exception("Failed to refresh the term catalog")
+            return False
+        finally:
+            self._checked = time.monotonic()
+            self._refreshing = False
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "class_scheduler.test_settings")
+django.setup()
+
+from django.core.cache import caches
+
+from benchmarks.synthetic_catalog import generate_catalog
+from scheduler import main
+from scheduler.schedule_generator import SearchBudget
+
+PREFERENCES = {
+    "preferred_days": ["M", "W", "F"],
+    "preferred_time": "morning",
+    "day_weight": 0.5,
+    "time_weight": 0.5,
+}
+
+
+def courses_of(section_dict):
+    return sorted({section.course for section in section_dict.values()})
+
+
+class CatalogTestCase(unittest.TestCase):
+    """Serves a synthetic catalog to scheduler.main instead of the database."""
+
+    num_courses = 5
+
+    def setUp(self):
+        caches["schedules"].clear()
+        self.section_dict, self.section_time_dict = generate_catalog(seed=3, num_courses=self.num_courses)
+        self.courses = courses_of(self.section_dict)
+        patchers = [
+            patch.object(main, "fetch_sections", return_value=(self.section_dict, self.section_time_dict, [])),
+            patch.object(main, "catalog_version", return_value=1),
+        ]
+        self.fetch_sections, _ = [patcher.start() for patcher in patchers]
+        for patcher in patchers:
+            self.addCleanup(patcher.stop)
+
+
+class TestStreamSchedules(CatalogTestCase):
+
+    def test_progress_is_streamed_before_the_result(self):
+        """Progress and improving schedules come first and the result last."""
+        events = list(main.stream_schedules(self.courses, [], PREFERENCES, progress_interval=0))
+        kinds = [kind for kind, _ in events]
+        self.assertEqual(kinds[-1], "result")
+        self.assertEqual(kinds.count("result"), 1)
+        self.assertIn("progress", kinds)
+        self.assertIn("schedules", kinds)
+        progress = dict(events)["progress"]
+        self.assertLessEqual({"nodes_explored", "fraction_covered", "best_score"}, set(progress))
+
+    def test_result_matches_process_schedules(self):
+        """The final event carries the response of the blocking endpoint."""
+        *_, (kind, result) = main.stream_schedules(self.courses, [], PREFERENCES)
+        schedules, total_schedules, search_info, _ = main.process_schedules(self.courses, [], PREFERENCES)
+        self.assertEqual(kind, "result")
+        self.assertEqual(result["schedules"], schedules)
+        self.assertFalse(result["partial"])
+        # Progress reports score buffered schedules early, which prunes more of
+        # the tree, so only the counters of the search differ
+        self.assertLessEqual(result["total_schedules"], total_schedules)
+        ignored = {"elapsed_seconds", "nodes_explored", "nodes_pruned"}
+        self.assertEqual(set(result["search"]), set(search_info))
+        self.assertEqual(
+            {key: value for key, value in result["search"].items() if key not in ignored},
+            {key: value for key, value in search_info.items() if key not in ignored},
+        )
+
+    def test_missing_courses_end_the_stream_with_the_error_messages(self):
+        with patch.object(main, "fetch_sections", return_value=({}, {}, ["CS-9999"])):
+            events = list(main.stream_schedules(["CS-9999"], [], PREFERENCES))
+        self.assertEqual(events, [("result", {"schedules": ["No sections found for CS-9999"]})])
+
+
+class TestStreamCancellation(CatalogTestCase):
+
+    num_courses = 8
+
+    def test_closing_the_stream_cancels_the_search(self):
+        """A client that goes away stops the search thread instead of leaving it running."""
+        budgets = []
+
+        def record_budget(*args):
+            budgets.append(SearchBudget(*args))
+            return budgets[-1]
+
+        with patch.object(main, "SearchBudget", side_effect=record_budget):
+            events = main.stream_schedules(self.courses, [], PREFERENCES, progress_interval=0)
+            self.assertEqual(next(events)[0], "progress")
+            events.close()
+
+        self.assertEqual(budgets[0].stop_reason, "client_disconnected")
+        for thread in threading.enumerate():
+            if thread.name == "schedule-search":
+                thread.join(5)
+                self.assertFalse(thread.is_alive())
+
+
+class TestProcessSchedules(CatalogTestCase):
+
+    def process(self, **options):
+        return main.process_schedules(self.courses, [], PREFERENCES, **options)
+
+    def test_complete_exact_results_are_answered_from_the_cache(self):
+        first = self.process()
+        second = self.process()
+        self.assertEqual(first[3]["cache"], "miss")
+        self.assertEqual(second[3]["cache"], "hit")
+        self.assertEqual(second[:3], first[:3])
+        self.assertEqual(self.fetch_sections.call_count, 1)
+
+    def test_partial_and_beam_results_are_never_cached(self):
+        """Results that depend on the budget or the beam are searched again every time."""
+        for options in ({"max_nodes": 50}, {"timeout": 1e-9}, {"mode": "beam"}):
+            with self.subTest(**options):
+                self.fetch_sections.reset_mock()
+                for _ in range(2):
+                    _, _, search_info, stats = self.process(**options)
+                    self.assertEqual(stats["cache"], "miss")
+                    self.assertTrue(search_info["partial"] or search_info["mode"] == "beam")
+                self.assertEqual(self.fetch_sections.call_count, 2)
+
+    def test_identical_concurrent_requests_search_once_and_fill_the_cache(self):
+        """A request arriving during an identical search waits for its result, which is then cached."""
+        started, release = threading.Event(), threading.Event()
+        catalog = self.fetch_sections.return_value
+
+        def fetch_slowly(courses):
+            started.set()
+            release.wait(5)
+            return catalog
+
+        self.fetch_sections.side_effect = fetch_slowly
+        results = {}
+
+        def request(name):
+            results[name] = self.process()
+
+        leader = threading.Thread(target=request, args=("leader",))
+        leader.start()
+        started.wait(5)
+        follower = threading.Thread(target=request, args=("follower",))
+        follower.start()
+        time.sleep(0.2)  # Let the follower find the search in progress
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(self.fetch_sections.call_count, 1)
+        self.assertEqual(results["leader"][3]["cache"], "miss")
+        self.assertTrue(results["follower"][3]["coalesced"])
+        self.assertEqual(results["follower"][:3], results["leader"][:3])
+        self.assertEqual(self.process()[3]["cache"], "hit")
+        self.assertEqual(self.fetch_sections.call_count, 1)
@@ -0,0 +1,151 @@
+import tempfile
+import threading
+import time
+import unittest
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from scheduler.cache_backends import LRUFileBasedCache
+from scheduler.request_coalescing import LOCK_PREFIX, RequestFlights
+
+
+class BlockingSearch:
+    """compute stand-in that blocks until released and counts its calls."""
+
+    def __init__(self, result=("schedules", False), error=None):
+        self.result = result
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.calls = []
+
+    def __call__(self, budget):
+        self.calls.append(budget)
+        self.started.set()
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def run_in_thread(flights, key, timeout, compute):
+    """Start flights.run in a thread; return the thread and a list receiving its outcome."""
+    outcome = []
+
+    def target():
+        try:
+            outcome.append(flights.run(key, timeout, compute))
+        except Exception as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, outcome
+
+
+class TestRequestFlights(unittest.TestCase):
+
+    def test_identical_requests_in_a_process_search_once(self):
+        """A concurrent identical request waits for the leader's result."""
+        flights = RequestFlights(LocMemCache("flights", {}))
+        search = BlockingSearch()
+        leader, leader_outcome = run_in_thread(flights, "key", 10, search)
+        search.started.wait(5)
+
+        waiter_search = BlockingSearch("own search")
+        waiter, waiter_outcome = run_in_thread(flights, "key", 10, waiter_search)
+        time.sleep(0.1)
+        search.release.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertEqual(leader_outcome, [(("schedules", False), False)])
+        self.assertEqual(waiter_outcome, [(("schedules", False), True)])
+        self.assertEqual(waiter_search.calls, [])
+
+    def test_waiters_search_when_the_result_is_not_shareable(self):
+        """A partial leader result is not handed to waiters, which search by themselves."""
+        flights = RequestFlights(LocMemCache("flights", {}), shareable=lambda result: not result[1])
+        search = BlockingSearch(("best so far", True))
+        leader, leader_outcome = run_in_thread(flights, "key", 10, search)
+        search.started.wait(5)
+
+        own = BlockingSearch("own search")
+        own.release.set()
+        waiter, waiter_outcome = run_in_thread(flights, "key", 10, own)
+        time.sleep(0.1)
+        search.release.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertEqual(leader_outcome, [(("best so far", True), False)])
+        self.assertEqual(waiter_outcome, [("own search", False)])
+        self.assertEqual(len(own.calls), 1)
+
+    def test_waiters_keep_their_own_timeout(self):
+        """A request due before the leader finishes searches by itself instead of waiting."""
+        flights = RequestFlights(LocMemCache("flights", {}))
+        search = BlockingSearch()
+        leader, _ = run_in_thread(flights, "key", 60, search)
+        search.started.wait(5)
+
+        own = BlockingSearch("own search")
+        own.release.set()
+        started = time.monotonic()
+        self.assertEqual(flights.run("key", 0.5, own), ("own search", False))
+        self.assertLess(time.monotonic() - started, 1)
+        search.release.set()
+        leader.join(5)
+
+    def test_waiters_search_when_the_leader_fails(self):
+        """If the leader's search raises, the waiter searches by itself."""
+        flights = RequestFlights(LocMemCache("flights", {}))
+        search = BlockingSearch(error=RuntimeError("database unavailable"))
+        leader, leader_outcome = run_in_thread(flights, "key", 10, search)
+        search.started.wait(5)
+
+        own = BlockingSearch("own search")
+        own.release.set()
+        waiter, waiter_outcome = run_in_thread(flights, "key", 10, own)
+        time.sleep(0.1)
+        search.release.set()
+        leader.join(5)
+        waiter.join(5)
+
+        self.assertIsInstance(leader_outcome[0], RuntimeError)
+        self.assertEqual(waiter_outcome, [("own search", False)])
+
+    def test_identical_requests_across_workers_search_once(self):
+        """A worker finding another worker's lock waits for the result it publishes."""
+        with tempfile.TemporaryDirectory() as directory:
+            worker1 = RequestFlights(LRUFileBasedCache(directory, {}))
+            worker2 = RequestFlights(LRUFileBasedCache(directory, {}))
+            search = BlockingSearch()
+            leader, leader_outcome = run_in_thread(worker1, "key", 10, search)
+            search.started.wait(5)
+
+            other_search = BlockingSearch("own search")
+            waiter, waiter_outcome = run_in_thread(worker2, "key", 10, other_search)
+            time.sleep(0.1)
+            search.release.set()
+            leader.join(5)
+            waiter.join(5)
+
+            self.assertEqual(leader_outcome, [(("schedules", False), False)])
+            self.assertEqual(waiter_outcome, [(("schedules", False), True)])
+            self.assertEqual(other_search.calls, [])
+            self.assertIsNone(worker1.cache.get(LOCK_PREFIX + "key"))
+
+    def test_file_cache_add_is_exclusive_until_expiry(self):
+        """add of the file-based cache succeeds once, and again after the entry expires."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = LRUFileBasedCache(directory, {})
+            self.assertTrue(cache.add("lock", 1, timeout=0.2))
+            self.assertFalse(LRUFileBasedCache(directory, {}).add("lock", 2, timeout=10))
+            time.sleep(0.3)
+            self.assertTrue(cache.add("lock", 3, timeout=10))
+            self.assertEqual(cache.get("lock"), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from datetime import time
+
+from django.core.cache.backends.locmem import LocMemCache
+
+from scheduler.cache_backends import LRUFileBasedCache
+from scheduler.result_cache import MISSES_KEY, ScheduleResultCache, request_key
+
+PREFERENCES = {
+    "preferred_days": ["M", "W", "F"],
+    "preferred_time": "morning",
+    "day_weight": 0.5,
+    "time_weight": 0.5,
+}
+BREAKS = [
+    {"begin_time": time(12, 0), "end_time": time(13, 0)},
+    {"begin_time": time(8, 0), "end_time": time(9, 0)},
+]
+
+
+class TestRequestKey(unittest.TestCase):
+
+    def test_equivalent_requests_share_a_key(self):
+        """Course, break and day order, duplicates and weight noise do not change the key."""
+        key = request_key(["CS-1114", "MATH-1225"], BREAKS, PREFERENCES, 1, max_schedules=20)
+        same = request_key(
+            ["MATH-1225", "CS-1114", "CS-1114"],
+            list(reversed(BREAKS)) + BREAKS[:1],
+            dict(PREFERENCES, preferred_days=["F", "M", "W"], day_weight=0.5 + 1e-12),
+            1,
+            max_schedules=20,
+        )
+        self.assertEqual(key, same)
+
+    def test_result_changing_inputs_change_the_key(self):
+        """Courses, breaks, preferences, options and the catalog version are all part of the key."""
+        key = request_key(["CS-1114"], BREAKS, PREFERENCES, 1, max_schedules=20)
+        for other in (
+            request_key(["CS-1114", "MATH-1225"], BREAKS, PREFERENCES, 1, max_schedules=20),
+            request_key(["CS-1114"], BREAKS[:1], PREFERENCES, 1, max_schedules=20),
+            request_key(["CS-1114"], BREAKS, dict(PREFERENCES, preferred_time="evening"), 1, max_schedules=20),
+            request_key(["CS-1114"], BREAKS, PREFERENCES, 2, max_schedules=20),
+            request_key(["CS-1114"], BREAKS, PREFERENCES, 1, max_schedules=10),
+        ):
+            self.assertNotEqual(key, other)
+
+
+class TestScheduleResultCache(unittest.TestCase):
+
+    def test_hits_and_misses_are_counted(self):
+        """Lookups return cached responses and count hits and misses."""
+        results = ScheduleResultCache(LocMemCache("schedules", {}))
+        key = request_key(["CS-1114"], [], PREFERENCES, 1)
+        self.assertIsNone(results.get(key))
+        results.set(key, (["schedule"], 1, {"partial": False}, {}))
+        self.assertEqual(results.get(key)[1], 1)
+        self.assertEqual(results.get(key)[1], 1)
+        self.assertEqual(results.counters(), {"hits": 2, "misses": 1, "hit_rate": 0.6667})
+
+    def test_file_cache_culls_least_recently_used(self):
+        """The file-based cache evicts the entries touched longest ago once full."""
+        with tempfile.TemporaryDirectory() as directory:
+            cache = LRUFileBasedCache(directory, {"OPTIONS": {"MAX_ENTRIES": 3, "CULL_FREQUENCY": 3}})
+            for age, key in enumerate(["a", "b", "c"]):
+                cache.set(key, key)
+                os.utime(cache._key_to_file(key), (1000 + age, 1000 + age))
+            cache.touch("a")  # Now the most recently used
+            cache.set("d", "d")
+            self.assertEqual(
+                [key for key in "abcd" if cache.get(key) is not None], ["a", "c", "d"]
+            )
+
+    def test_file_cache_counts_concurrent_lookups(self):
+        """Counts from concurrent workers are all kept, and the counters never expire."""
+        with tempfile.TemporaryDirectory() as directory:
+            results = ScheduleResultCache(LRUFileBasedCache(directory, {"TIMEOUT": 60}))
+
+            def look_up():
+                for _ in range(100):
+                    results.get("missing")
+
+            threads = [threading.Thread(target=look_up) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(results.counters()["misses"], 400)
+            with open(results.cache._key_to_file(MISSES_KEY), "rb") as f:
+                self.assertIsNone(pickle.load(f))  # The expiry
+
+
+if __name__ == "__main__":
+    unittest.main()
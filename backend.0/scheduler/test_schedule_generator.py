@@ -0,0 +1,639 @@
+import multiprocessing
+import sys
+import unittest
+from datetime import time
+from itertools import product
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+
+from benchmarks.synthetic_catalog import generate_catalog
+from scheduler.compiled_catalog import CompiledCatalog, CompiledSlot
+from scheduler.parallel_search import SharedNodeBudget, get_pool
+from scheduler.schedule_generator import ScheduleGenerator, SearchBudget
+from scheduler.schedule_scoring import EMPTY_PROFILE, ScheduleScorer
+from scheduler.search_estimator import SearchEstimate, choose_strategy, estimate_search
+
+
+class FakeSectionTime(SimpleNamespace):
+    """SectionTime stand-in that is hashable like the Django model."""
+
+    __hash__ = object.__hash__
+
+
+def make_catalog(courses):
+    """Build section_dict/section_time_dict from {course: {crn: [(days, begin, end)]}}."""
+    section_dict = {}
+    section_time_dict = {}
+    for course, sections in courses.items():
+        for crn, meetings in sections.items():
+            section = SimpleNamespace(crn=crn, course=course)
+            section_dict[crn] = section
+            section_time_dict[crn] = [
+                FakeSectionTime(crn=section, days=days, begin_time=begin, end_time=end)
+                for days, begin, end in meetings
+            ]
+    return section_dict, section_time_dict
+
+
+def overlaps(time1, time2):
+    """Reference conflict predicate for two meeting times."""
+    return bool(
+        set(time1.days) & set(time2.days)
+        and time1.end_time > time2.begin_time
+        and time1.begin_time < time2.end_time
+    )
+
+
+COURSES = {
+    "CS-1114": {
+        1: [("M", time(8, 0), time(8, 50)), ("W", time(8, 0), time(8, 50))],
+        2: [("T", time(9, 30), time(10, 45)), ("R", time(9, 30), time(10, 45))],
+        3: [("M", time(13, 25), time(14, 15))],
+    },
+    "MATH-1225": {
+        4: [("M", time(8, 0), time(8, 50))],
+        5: [("T", time(10, 0), time(11, 15)), ("R", time(10, 0), time(11, 15))],
+        6: [("ONLINE", time(0, 0), time(0, 0))],
+    },
+    "PHYS-2305": {
+        7: [("M", time(8, 50), time(9, 40))],
+        8: [("W", time(12, 20), time(13, 10))],
+        9: [("ARR", time(0, 0), time(0, 0))],
+    },
+}
+
+PREFERENCES = {
+    "preferred_days": ["M", "W", "F"],
+    "preferred_time": "morning",
+    "day_weight": 0.5,
+    "time_weight": 0.5,
+}
+
+
+class TestScheduleGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.section_dict, self.section_time_dict = make_catalog(COURSES)
+
+    def test_section_masks_match_reference_conflicts(self):
+        """Bitmask conflicts agree with pairwise meeting-time comparison."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES
+        )
+        for crn1, crn2 in product(self.section_time_dict, repeat=2):
+            if crn1 == crn2:
+                continue
+            expected = any(
+                overlaps(t1, t2)
+                for t1 in self.section_time_dict[crn1]
+                for t2 in self.section_time_dict[crn2]
+            )
+            actual = bool(
+                generator.section_masks[crn1] & generator.section_masks[crn2]
+            )
+            self.assertEqual(actual, expected, (crn1, crn2))
+
+    def test_breaks_exclude_sections_starting_inside_them(self):
+        """Sections with a meeting starting during a break are never scheduled."""
+        breaks = [{"begin_time": time(8, 0), "end_time": time(8, 30)}]
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, breaks, PREFERENCES
+        )
+        self.assertEqual(generator.blocked_crns, {1, 4})
+
+    def test_compatibility_rows_exclude_same_course_and_conflicts(self):
+        """Compatibility bits are set only for non-overlapping sections of other courses."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES
+        )
+        for i, (crn1, _) in enumerate(generator.sections):
+            for j, (crn2, _) in enumerate(generator.sections):
+                expected = (
+                    self.section_dict[crn1].course != self.section_dict[crn2].course
+                    and not generator.section_masks[crn1] & generator.section_masks[crn2]
+                )
+                self.assertEqual(bool(generator.compatibility[i] >> j & 1), expected)
+
+    def test_course_blocked_by_breaks_yields_no_schedules(self):
+        """A course whose every section starts during a break cannot be scheduled."""
+        breaks = [{"begin_time": time(8, 0), "end_time": time(13, 30)}]
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, breaks, PREFERENCES
+        )
+        schedules, count = generator.generate_schedules()
+        self.assertEqual((schedules, count), ([], 0))
+
+    def test_arc_consistency_removes_unsupported_sections(self):
+        """A section overlapping every section of another course is pruned up front."""
+        courses = {
+            "CS-1114": {1: [("M", time(8, 0), time(8, 50))], 2: [("T", time(8, 0), time(8, 50))]},
+            "MATH-1225": {3: [("T", time(8, 0), time(8, 50))]},
+        }
+        section_dict, section_time_dict = make_catalog(courses)
+        generator = ScheduleGenerator(section_dict, section_time_dict, [], PREFERENCES)
+        domain_crns = {
+            generator.sections[index][0]
+            for domain in generator.domains
+            for index in range(len(generator.sections))
+            if domain >> index & 1
+        }
+        self.assertEqual(domain_crns, {1, 3})
+
+    def test_incompatible_course_pair_fails_immediately(self):
+        """Two courses with no compatible combination are reported before searching."""
+        courses = {
+            "CS-1114": {1: [("M", time(8, 0), time(8, 50))]},
+            "MATH-1225": {2: [("M", time(8, 30), time(9, 20))]},
+        }
+        section_dict, section_time_dict = make_catalog(courses)
+        generator = ScheduleGenerator(section_dict, section_time_dict, [], PREFERENCES)
+        self.assertEqual(set(generator.conflicting_courses), {"CS-1114", "MATH-1225"})
+        self.assertEqual(generator.generate_schedules(), ([], 0))
+
+    def test_dynamic_and_static_ordering_find_the_same_scores(self):
+        """Course ordering changes the search order, not the set of schedules."""
+        results = []
+        for ordering in ("dynamic", "static"):
+            generator = ScheduleGenerator(
+                self.section_dict, self.section_time_dict, [], PREFERENCES, 100, ordering
+            )
+            schedules, _ = generator.generate_schedules()
+            results.append({round(score, 9) for score, _ in schedules})
+        self.assertEqual(results[0], results[1])
+
+    def test_unknown_ordering_is_rejected(self):
+        with self.assertRaises(ValueError):
+            ScheduleGenerator(
+                self.section_dict, self.section_time_dict, [], PREFERENCES, ordering="random"
+            )
+
+    def test_bound_pruning_keeps_the_same_top_scores(self):
+        """Branch-and-bound only cuts subtrees that cannot reach the top schedules."""
+        results = []
+        for use_bounds in (False, True):
+            generator = ScheduleGenerator(
+                self.section_dict, self.section_time_dict, [], PREFERENCES, 3,
+                use_bounds=use_bounds,
+            )
+            schedules, _ = generator.generate_schedules()
+            results.append([round(score, 9) for score, _ in schedules])
+        self.assertEqual(results[0], results[1])
+
+    def test_batch_scores_match_scalar_scores(self):
+        """score_batch agrees with score_schedule for every combination of sections."""
+        for preferred_days in (["M", "W", "F"], ["M", "T", "W", "R", "F"], []):
+            preferences = dict(PREFERENCES, preferred_days=preferred_days)
+            generator = ScheduleGenerator(
+                self.section_dict, self.section_time_dict, [], preferences
+            )
+            rows = list(product(range(len(generator.sections)), repeat=3))
+            scores = generator.scorer.score_batch(generator.score_table, np.array(rows))
+            for row, score in zip(rows, scores):
+                flat = tuple(slot for index in row for slot in generator.sections[index][1])
+                self.assertAlmostEqual(score, generator.scorer.score_schedule(flat), places=12)
+
+    def test_time_score_tables_are_shared_lookups_of_the_peak_interpolation(self):
+        """Every scorer with a preferred_time indexes one table matching the peak curve."""
+        for preferred_time in ScheduleScorer.ONLINE_CLASS_SCORES:
+            scorer = ScheduleScorer(dict(PREFERENCES, preferred_time=preferred_time))
+            self.assertIs(
+                scorer.time_scores,
+                ScheduleScorer(dict(PREFERENCES, preferred_time=preferred_time)).time_scores,
+            )
+            self.assertEqual(len(scorer.time_scores), 24 * 60)
+            self.assertEqual(
+                scorer._calculate_time_score_for_slot(time(0, 0)),
+                ScheduleScorer.ONLINE_CLASS_SCORES[preferred_time],
+            )
+            for minutes in range(1, 24 * 60):
+                self.assertEqual(
+                    scorer._calculate_time_score_for_slot(time(minutes // 60, minutes % 60)),
+                    ScheduleScorer._interpolate_time_score(preferred_time, minutes),
+                )
+        morning = ScheduleScorer(PREFERENCES)
+        self.assertEqual(morning._calculate_time_score_for_slot(time(8, 30)), 0.95)
+        self.assertEqual(morning._calculate_time_score_for_slot(time(7, 0)), 0.5)
+
+    def test_upper_bound_is_optimistic_for_every_completion(self):
+        """No complete schedule scores above the bound of the empty schedule."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES, 100,
+            use_bounds=False,
+        )
+        bound = generator.scorer.upper_bound(
+            EMPTY_PROFILE, generator.course_bounds
+        )
+        schedules, _ = generator.generate_schedules()
+        self.assertTrue(all(score <= bound + 1e-9 for score, _ in schedules))
+
+    def test_heap_keeps_the_highest_scoring_schedules(self):
+        """A small max_schedules keeps the best schedules, not the first found."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES, 100
+        )
+        everything, _ = generator.generate_schedules()
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES, 2
+        )
+        top, _ = generator.generate_schedules()
+        self.assertEqual(
+            [round(score, 9) for score, _ in top],
+            [round(score, 9) for score, _ in everything[:2]],
+        )
+
+    def test_parallel_search_matches_serial_search(self):
+        """Splitting the search across processes finds the same top schedules."""
+        results = []
+        for workers in (1, 2):
+            generator = ScheduleGenerator(
+                self.section_dict, self.section_time_dict, [], PREFERENCES, 3
+            )
+            generator.PARALLEL_MIN_SPACE = 1
+            schedules, _ = generator.generate_schedules(workers=workers)
+            results.append([round(score, 9) for score, _ in schedules])
+            self.assertFalse(generator.search_info["partial"])
+        self.assertEqual(results[0], results[1])
+
+    def test_parallel_search_stopped_while_scoring_leaves_returns_a_partial_result(self):
+        """A budget that runs out before the pool is used stops the search without raising."""
+        section_dict, section_time_dict = make_catalog(
+            {course: COURSES[course] for course in ("CS-1114", "MATH-1225")}
+        )
+        generator = ScheduleGenerator(section_dict, section_time_dict, [], PREFERENCES, 3)
+        generator.PARALLEL_MIN_SPACE = 1
+        generator.generate_schedules(max_nodes=1, workers=2)
+        self.assertTrue(generator.search_info["partial"])
+        self.assertEqual(generator.search_info["stop_reason"], "node_budget")
+
+    def test_parallel_search_recovers_from_a_broken_pool(self):
+        """A pool whose workers died is replaced instead of failing every later search."""
+        def search():
+            generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES, 3)
+            generator.PARALLEL_MIN_SPACE = 1
+            schedules, _ = generator.generate_schedules(workers=2)
+            self.assertFalse(generator.search_info["partial"])
+            return [round(score, 9) for score, _ in schedules]
+
+        expected = search()
+        pool = get_pool(2)
+        for process in list(pool.executor._processes.values()):
+            process.terminate()
+            process.join()
+        self.assertEqual(search(), expected)
+        self.assertEqual(search(), expected)
+        self.assertIsNot(get_pool(2), pool)
+
+    def test_shared_node_budget_is_shared_and_cancellable(self):
+        """Workers of a search count nodes against one budget and stop on its cancel flag."""
+        nodes, cancelled = multiprocessing.Array("q", 2), multiprocessing.Array("b", 2)
+        first = SharedNodeBudget(None, 10, nodes, cancelled, 1)
+        second = SharedNodeBudget(None, 10, nodes, cancelled, 1)
+        self.assertFalse(first.exhausted(4))
+        self.assertFalse(second.exhausted(5))
+        self.assertTrue(first.exhausted(5))
+        self.assertEqual(first.stop_reason, "node_budget")
+
+        other = SharedNodeBudget(None, None, nodes, cancelled, 0)
+        self.assertFalse(other.exhausted(100))
+        cancelled[0] = 1
+        self.assertTrue(other.exhausted(101))
+        self.assertEqual(other.stop_reason, "cancelled")
+
+    def test_mip_engine_matches_depth_first_search(self):
+        """Enumerating with the 0-1 program finds the same top scores as the search."""
+        for preferred_days in (["M", "W", "F"], ["M", "T", "W", "R", "F"], ["T", "R"], []):
+            preferences = dict(PREFERENCES, preferred_days=preferred_days)
+            for max_schedules in (3, 100):
+                results = []
+                for engine in ("dfs", "mip"):
+                    generator = ScheduleGenerator(
+                        self.section_dict, self.section_time_dict, [], preferences, max_schedules
+                    )
+                    schedules, _ = generator.generate_schedules(engine=engine)
+                    results.append([round(score, 9) for score, _ in schedules])
+                    self.assertFalse(generator.search_info["partial"])
+                self.assertEqual(results[0], results[1])
+
+    def test_mip_engine_matches_depth_first_search_after_no_good_cuts(self):
+        """Strata solved again after no-good cuts keep their best schedules, without a partial result."""
+        # Catalogs on which re-solving one CBC model returned ERROR or a wrong optimum
+        evening = dict(PREFERENCES, preferred_time="evening", day_weight=0.0, time_weight=1.0)
+        for seed, num_courses, preferences in (
+            (41, 5, dict(PREFERENCES, preferred_days=[])),
+            (82, 3, dict(evening, preferred_days=["M", "T", "W", "R", "F"])),
+        ):
+            section_dict, section_time_dict = generate_catalog(
+                seed=seed, num_courses=num_courses, sections_per_course=(2, 6)
+            )
+            results = []
+            for engine in ("dfs", "mip"):
+                generator = ScheduleGenerator(section_dict, section_time_dict, [], preferences, 20)
+                schedules, _ = generator.generate_schedules(engine=engine)
+                results.append([round(score, 9) for score, _ in schedules])
+                self.assertFalse(generator.search_info["partial"])
+            self.assertEqual(results[0], results[1])
+
+    def test_mip_solve_stopped_at_the_deadline_flags_the_result_partial(self):
+        """A solve cut short by the deadline stops the search instead of skipping its stratum."""
+        from mip import Model, OptimizationStatus
+
+        generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES, 3)
+        budget = SearchBudget(60)
+
+        def run_out_of_time(*args, **kwargs):
+            budget.deadline = float("-inf")
+            return OptimizationStatus.FEASIBLE
+
+        with patch.object(Model, "optimize", side_effect=run_out_of_time):
+            generator.generate_schedules(budget=budget, engine="mip")
+        self.assertTrue(generator.search_info["partial"])
+        self.assertEqual(generator.search_info["stop_reason"], "deadline")
+        self.assertEqual(generator.search_info["nodes_explored"], 1)
+
+    def test_mip_solver_error_falls_back_to_depth_first_search(self):
+        """A solve that fails before the deadline hands the search to the depth-first search."""
+        from mip import Model, OptimizationStatus
+
+        generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES, 3)
+        expected, _ = generator.generate_schedules()
+        with patch.object(Model, "optimize", return_value=OptimizationStatus.ERROR):
+            schedules, _ = generator.generate_schedules(engine="mip")
+        self.assertEqual(schedules, expected)
+        self.assertFalse(generator.search_info["partial"])
+
+    def test_meet_in_middle_engine_matches_depth_first_search(self):
+        """Joining half-schedules finds the same top scores as the search."""
+        for preferred_days in (["M", "W", "F"], ["M", "T", "W", "R", "F"], ["T", "R"], []):
+            preferences = dict(PREFERENCES, preferred_days=preferred_days)
+            for max_schedules in (1, 3, 100):
+                results = []
+                for engine in ("dfs", "mitm"):
+                    generator = ScheduleGenerator(
+                        self.section_dict, self.section_time_dict, [], preferences, max_schedules
+                    )
+                    schedules, _ = generator.generate_schedules(engine=engine)
+                    results.append([round(score, 9) for score, _ in schedules])
+                    self.assertFalse(generator.search_info["partial"])
+                self.assertEqual(results[0], results[1])
+
+    def test_unknown_engine_is_rejected(self):
+        generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES)
+        with self.assertRaises(ValueError):
+            generator.generate_schedules(engine="simplex")
+
+    def test_unknown_mode_is_rejected(self):
+        generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES)
+        with self.assertRaises(ValueError):
+            generator.generate_schedules(mode="greedy")
+
+    def test_beam_search_bounds_the_optimal_score(self):
+        """A narrow beam finds no better than the optimum, and its upper bound is at least the optimum."""
+        for preferred_days in (["M", "W", "F"], ["M", "T", "W", "R", "F"]):
+            preferences = dict(PREFERENCES, preferred_days=preferred_days)
+            exact = ScheduleGenerator(self.section_dict, self.section_time_dict, [], preferences)
+            exact_schedules, _ = exact.generate_schedules()
+            self.assertEqual(exact.search_info["mode"], "exact")
+            self.assertEqual(exact.search_info["upper_bound"], exact_schedules[0][0])
+
+            for beam_width in (1, 2):
+                beam = ScheduleGenerator(self.section_dict, self.section_time_dict, [], preferences)
+                beam_schedules, _ = beam.generate_schedules(mode="beam", beam_width=beam_width)
+                self.assertEqual(beam.search_info["mode"], "beam")
+                self.assertTrue(beam_schedules)
+                self.assertLessEqual(beam_schedules[0][0], exact_schedules[0][0] + 1e-9)
+                self.assertGreaterEqual(beam.search_info["upper_bound"], exact_schedules[0][0] - 1e-9)
+
+    def test_wide_beam_search_is_exact(self):
+        """A beam wider than any level of the tree keeps every partial schedule."""
+        exact = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES)
+        exact_schedules, _ = exact.generate_schedules()
+        beam = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES)
+        beam_schedules, _ = beam.generate_schedules(mode="beam", beam_width=exact.search_space_size())
+        self.assertEqual(
+            [round(score, 9) for score, _ in beam_schedules],
+            [round(score, 9) for score, _ in exact_schedules],
+        )
+        self.assertAlmostEqual(beam.search_info["upper_bound"], exact_schedules[0][0])
+
+    def test_auto_mode_uses_the_beam_search_where_the_strategy_is_beam(self):
+        generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES)
+        generator.generate_schedules(mode="auto")
+        self.assertEqual(generator.search_info["mode"], "exact")
+
+        with patch("scheduler.schedule_generator.choose_strategy", return_value="beam") as choose:
+            generator.generate_schedules(timeout=None, workers=2, mode="auto")
+        self.assertEqual(generator.search_info["mode"], "beam")
+        self.assertEqual(choose.call_args.args[1:], (float("inf"), 2))
+
+    def test_node_budget_returns_partial_best_so_far(self):
+        """An exhausted node budget stops the search and flags the result partial."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES, use_bounds=False
+        )
+        schedules, _ = generator.generate_schedules(max_nodes=5)
+        self.assertTrue(generator.search_info["partial"])
+        self.assertEqual(generator.search_info["stop_reason"], "node_budget")
+        self.assertEqual(generator.search_info["nodes_explored"], 5)
+        self.assertGreater(len(schedules), 0)
+
+    def test_cancelled_budget_stops_search(self):
+        budget = SearchBudget()
+        budget.cancel()
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES
+        )
+        generator.BUDGET_CHECK_INTERVAL = 1
+        schedules, count = generator.generate_schedules(budget=budget)
+        self.assertEqual(generator.search_info["stop_reason"], "cancelled")
+        self.assertEqual((schedules, count), ([], 0))
+
+    def test_complete_search_is_not_partial(self):
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES
+        )
+        generator.generate_schedules()
+        self.assertFalse(generator.search_info["partial"])
+        self.assertIsNone(generator.search_info["stop_reason"])
+
+    def test_search_stats_count_pruning_reasons_and_scored_leaves(self):
+        """search_stats breaks the run down by pruning reason and scoring work."""
+        breaks = [{"begin_time": time(8, 0), "end_time": time(8, 30)}]
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, breaks, PREFERENCES, 1, use_bounds=False
+        )
+        schedules, count = generator.generate_schedules()
+        stats = generator.search_stats
+
+        self.assertEqual(stats["nodes_visited"], generator.search_info["nodes_explored"])
+        self.assertEqual(stats["nodes_pruned"], {"conflict": 0, "break": 2, "bound": 0})
+        self.assertEqual(stats["leaves_scored"], count)
+        self.assertLessEqual(stats["heap_replacements"], stats["leaves_scored"])
+        self.assertEqual(stats["search_space"], {"combinations": 27, "after_propagation": 12})
+
+        # Three courses over two days pass arc consistency, but every choice
+        # of the first course leaves the other two competing for one day
+        courses = {
+            course: {
+                f"{course}-M": [("M", time(8, 0), time(8, 50))],
+                f"{course}-T": [("T", time(8, 0), time(8, 50))],
+            }
+            for course in ("CS-1114", "MATH-1225", "PHYS-2305")
+        }
+        generator = ScheduleGenerator(*make_catalog(courses), [], PREFERENCES)
+        self.assertEqual(generator.generate_schedules(), ([], 0))
+        self.assertEqual(generator.search_stats["nodes_pruned"]["conflict"], 2)
+        self.assertEqual(generator.search_stats["leaves_scored"], 0)
+
+    def test_progress_reports_improving_schedules_and_coverage(self):
+        """Progress reports cover more of the tree and end at the final best score."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES, 3, use_bounds=False
+        )
+        generator.BUDGET_CHECK_INTERVAL = 1
+        reports = []
+        schedules, _ = generator.generate_schedules(
+            progress=reports.append, progress_interval=0
+        )
+
+        self.assertGreater(len(reports), 1)
+        fractions = [report["fraction_covered"] for report in reports]
+        self.assertEqual(fractions, sorted(fractions))
+        self.assertTrue(all(0 <= fraction <= 1 for fraction in fractions))
+        snapshots = [report["schedules"] for report in reports if report["schedules"]]
+        self.assertEqual(snapshots[-1][0][0], schedules[0][0])
+        self.assertEqual(reports[-1]["best_score"], schedules[0][0])
+
+    def test_generated_schedules_are_conflict_free(self):
+        """Every generated schedule has one section per course and no overlaps."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES
+        )
+        schedules, count = generator.generate_schedules()
+        self.assertGreater(count, 0)
+        for score, variants in schedules:
+            for schedule in variants:
+                self.assertEqual(len(schedule), len(COURSES))
+                flat = [t for times in schedule.values() for t in times]
+                for i, t1 in enumerate(flat):
+                    for t2 in flat[i + 1:]:
+                        if t1.crn is not t2.crn:
+                            self.assertFalse(overlaps(t1, t2))
+
+    def test_search_depth_is_not_limited_by_recursion(self):
+        """The iterative search handles more courses than the recursion limit allows."""
+        courses = {
+            f"ONL-{number}": {
+                2 * number: [("ONLINE", time(0, 0), time(0, 0))],
+                2 * number + 1: [("ARR", time(0, 0), time(0, 0))],
+            }
+            for number in range(150)
+        }
+        section_dict, section_time_dict = make_catalog(courses)
+        generator = ScheduleGenerator(section_dict, section_time_dict, [], PREFERENCES, 1)
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            schedules, _ = generator.generate_schedules(max_nodes=1000)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual(len(schedules[0][1][0]), len(courses))
+
+    def test_search_runs_on_the_compiled_catalog_and_returns_fetched_times(self):
+        """Sections are searched as compiled slots; schedules hold the fetched time objects."""
+        generator = ScheduleGenerator(
+            self.section_dict, self.section_time_dict, [], PREFERENCES
+        )
+        catalog = generator.catalog
+        self.assertEqual(catalog.crns, list(self.section_dict))
+        self.assertEqual(catalog.courses, list(COURSES))
+        for section, crn in enumerate(catalog.crns):
+            slots = catalog.section_slots(section)
+            self.assertEqual(
+                [(slot.days, slot.begin, slot.end) for slot in slots],
+                [
+                    (t.days, t.begin_time.hour * 60 + t.begin_time.minute,
+                     t.end_time.hour * 60 + t.end_time.minute)
+                    for t in self.section_time_dict[crn]
+                ],
+            )
+        self.assertTrue(
+            all(isinstance(slot, CompiledSlot) for _, times in generator.sections for slot in times)
+        )
+
+        schedules, _ = generator.generate_schedules()
+        for _, variants in schedules:
+            for schedule in variants:
+                for crn, times in schedule.items():
+                    self.assertIs(times, self.section_time_dict[crn])
+
+    def test_identical_meeting_patterns_are_returned_as_variants(self):
+        """Sections differing only by CRN are searched once and expanded as variants."""
+        courses = {
+            "CS-1114": {
+                1: [("M", time(8, 0), time(8, 50)), ("W", time(8, 0), time(8, 50))],
+                2: [("W", time(8, 0), time(8, 50)), ("M", time(8, 0), time(8, 50))],
+                3: [("T", time(9, 30), time(10, 45))],
+            },
+            "MATH-1225": {
+                4: [("R", time(10, 0), time(11, 15))],
+                5: [("R", time(10, 0), time(11, 15))],
+            },
+        }
+        section_dict, section_time_dict = make_catalog(courses)
+        generator = ScheduleGenerator(section_dict, section_time_dict, [], PREFERENCES)
+        self.assertEqual(len(generator.sections), 3)
+
+        schedules, _ = generator.generate_schedules()
+        variant_crns = {
+            frozenset(schedule) for _, variants in schedules for schedule in variants
+        }
+        self.assertIn(frozenset({1, 4}), variant_crns)
+        self.assertIn(frozenset({2, 5}), variant_crns)
+        best_score, best_variants = schedules[0]
+        self.assertEqual(len(best_variants), 4)
+
+    def test_estimate_counts_patterns_and_conflicts(self):
+        """The estimate counts meeting patterns outside breaks and discounts overlapping pairs."""
+        catalog = CompiledCatalog.compile(self.section_dict, self.section_time_dict)
+        estimate = estimate_search(catalog, [])
+        self.assertEqual(estimate.courses, 3)
+        self.assertEqual(estimate.combinations, 27)
+        self.assertGreater(estimate.conflict_rate, 0)
+        feasible = sum(
+            1 for crns in product(*[list(sections) for sections in COURSES.values()])
+            if not any(
+                overlaps(time1, time2)
+                for i, first in enumerate(crns) for second in crns[i + 1:]
+                for time1 in self.section_time_dict[first] for time2 in self.section_time_dict[second]
+            )
+        )
+        self.assertAlmostEqual(estimate.estimated_schedules, feasible, delta=feasible * 0.5)
+
+        # A break at 08:00 blocks sections 1 and 4
+        breaks = [{"begin_time": time(7, 30), "end_time": time(8, 30)}]
+        self.assertEqual(estimate_search(catalog, breaks).combinations, 12)
+
+        # Courses that always overlap have no schedules
+        section_dict, section_time_dict = make_catalog({
+            "A": {1: [("M", time(9, 0), time(9, 50))]},
+            "B": {2: [("M", time(9, 0), time(9, 50))]},
+        })
+        estimate = estimate_search(CompiledCatalog.compile(section_dict, section_time_dict), [])
+        self.assertEqual(estimate.estimated_schedules, 0)
+
+    def test_choose_strategy_scales_with_estimated_seconds(self):
+        """Small searches run serially, larger ones in parallel or meet-in-the-middle, huge ones by beam."""
+        def estimate(seconds, courses=5):
+            return SearchEstimate(courses, 0, 0.0, 0.0, seconds)
+
+        self.assertEqual(choose_strategy(estimate(0.1), timeout=90, workers=4), "dfs")
+        self.assertEqual(choose_strategy(estimate(60), timeout=90, workers=4), "parallel")
+        self.assertEqual(choose_strategy(estimate(60), timeout=90, workers=1), "dfs")
+        self.assertEqual(choose_strategy(estimate(60, courses=8), timeout=90, workers=1), "mitm")
+        self.assertEqual(choose_strategy(estimate(1e6), timeout=90, workers=4), "beam")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,12 @@
 import unittest
 from unittest.mock import MagicMock
-from schedule_scoring import ScheduleScorer
+from scheduler.schedule_scoring import ScheduleScorer
 import datetime
 
+import numpy as np
+
 class TestScheduleScorer(unittest.TestCase):
-    
+
     def setUp(self):
         # Sample user preferences
         self.preferences = {
@@ -15,53 +17,44 @@ class TestScheduleScorer(unittest.TestCase):
         }
         self.scorer = ScheduleScorer(self.preferences)
 
-    def test_score_time_morning(self):
-        """Test score_time with a time within the morning range."""
-        begin_time = datetime.time(9, 0)  # 9:00 AM
-        score = self.scorer.score_time(begin_time, 'morning')
-        self.assertEqual(score, 1)
+    def test_time_score_morning(self):
+        """Test the slot time score at the morning peaks."""
+        self.assertEqual(self.scorer._calculate_time_score_for_slot(datetime.time(8, 0)), 1.0)
+        self.assertEqual(self.scorer._calculate_time_score_for_slot(datetime.time(9, 0)), 0.9)
+
+    def test_time_score_between_peaks(self):
+        """Test that scores between two peaks are interpolated linearly."""
+        score = self.scorer._calculate_time_score_for_slot(datetime.time(9, 30))
+        self.assertAlmostEqual(score, 0.85)
 
-    def test_score_time_outside_range(self):
-        """Test score_time with a time outside the preferred range."""
-        begin_time = datetime.time(13, 0)  # 1:00 PM
-        score = self.scorer.score_time(begin_time, 'morning')
+    def test_time_score_outside_range(self):
+        """Test the slot time score after the preferred range."""
+        score = self.scorer._calculate_time_score_for_slot(datetime.time(13, 0))
         self.assertLess(score, 1)
         self.assertGreater(score, 0)
 
-    def test_score_time_before_morning(self):
-        """Test score_time with a time before the morning range."""
-        begin_time = datetime.time(7, 0)  # 7:00 AM
-        score = self.scorer.score_time(begin_time, 'morning')
-        self.assertEqual(score, 0)
+    def test_time_score_before_morning(self):
+        """Test that times before the range get half the nearest peak's score."""
+        score = self.scorer._calculate_time_score_for_slot(datetime.time(7, 0))
+        self.assertEqual(score, 0.5)
 
-    def test_score_time_after_evening(self):
-        """Test score_time with a time after the evening range."""
-        begin_time = datetime.time(21, 0)  # 9:00 PM
-        score = self.scorer.score_time(begin_time, 'evening')
-        self.assertEqual(score, 0)
+    def test_time_score_after_evening(self):
+        """Test that times after the evening range get half the nearest peak's score."""
+        scorer = ScheduleScorer(dict(self.preferences, preferred_time='evening'))
+        score = scorer._calculate_time_score_for_slot(datetime.time(21, 0))
+        self.assertEqual(score, 0.35)
 
-    def test_score_section_time(self):
-        """Test score_section_time for a section time object."""
-        section_time = MagicMock(begin_time=datetime.time(9, 0), days='MWF')
-        score = self.scorer.score_section_time(section_time)
-        self.assertGreater(score, 0)  # Score should be positive
+    def test_time_score_online(self):
+        """Test the time score of an online section (begin_time '00:00:00')."""
+        score = self.scorer._calculate_time_score_for_slot(datetime.time(0, 0))
+        self.assertEqual(score, ScheduleScorer.ONLINE_CLASS_SCORES['morning'])
 
-    def test_score_section_time_online(self):
-        """Test score_section_time for an online section (begin_time '00:00:00')."""
-        section_time = MagicMock(begin_time=datetime.time(0, 0), days='N/A')
-        score = self.scorer.score_section_time(section_time)
-        self.assertEqual(score, 1)  # Online classes should score perfectly
-
-    def test_score_section(self):
-        """Test score_section to ensure correct average score calculation."""
-        section_times = [
-            MagicMock(begin_time=datetime.time(9, 0), days='M'),
-            MagicMock(begin_time=datetime.time(10, 0), days='MWF')
-        ]
-        section = MagicMock()
-        score = self.scorer.score_section(section, section_times)
-        self.assertGreater(score, 0)
-        self.assertLessEqual(score, 1)
+    def test_invalid_preferences_are_rejected(self):
+        """Test that weights must sum to 1 and preferred_time must be known."""
+        with self.assertRaises(ValueError):
+            ScheduleScorer(dict(self.preferences, time_weight=0.9))
+        with self.assertRaises(ValueError):
+            ScheduleScorer(dict(self.preferences, preferred_time='night'))
 
     def test_score_schedule(self):
         """Test score_schedule for a complete schedule."""
@@ -72,20 +65,33 @@ class TestScheduleScorer(unittest.TestCase):
         schedule = section_times
         score = self.scorer.score_schedule(schedule)
         self.assertGreater(score, 0)  # Ensure the schedule has a positive score
+        self.assertLessEqual(score, 1)
 
-    def test_group_section_times_by_section(self):
-        """Test that group_section_times_by_section correctly groups SectionTime objects."""
-        section_time1 = MagicMock(crn=1, begin_time=datetime.time(9, 0), days='MWF')
-        section_time2 = MagicMock(crn=1, begin_time=datetime.time(10, 0), days='MWF')
-        section_time3 = MagicMock(crn=2, begin_time=datetime.time(9, 0), days='TR')
+    def test_score_empty_schedule(self):
+        """Test that an empty schedule scores 0."""
+        self.assertEqual(self.scorer.score_schedule(()), 0.0)
 
-        section_times = [section_time1, section_time2, section_time3]
-        grouped = self.scorer.group_section_times_by_section(section_times)
+    def test_preferred_days_score_higher(self):
+        """Test that classes on preferred days score higher than on other days."""
+        scorer = ScheduleScorer(dict(self.preferences, preferred_days=['M', 'W', 'F']))
+        preferred = [MagicMock(begin_time=datetime.time(9, 0), days='MWF')]
+        other = [MagicMock(begin_time=datetime.time(9, 0), days='TR')]
+        self.assertGreater(scorer.score_schedule(preferred), scorer.score_schedule(other))
 
-        self.assertIn(1, grouped)
-        self.assertIn(2, grouped)
-        self.assertEqual(len(grouped[1]), 2)
-        self.assertEqual(len(grouped[2]), 1)
+    def test_score_batch_matches_score_schedule(self):
+        """Test that batch scoring agrees with scoring schedules one at a time."""
+        sections = [
+            [MagicMock(begin_time=datetime.time(9, 0), days='M'),
+             MagicMock(begin_time=datetime.time(9, 0), days='W')],
+            [MagicMock(begin_time=datetime.time(14, 0), days='TR')],
+            [MagicMock(begin_time=datetime.time(0, 0), days='ONLINE')],
+        ]
+        rows = np.array([[0, 1], [0, 2], [1, 2]])
+        table = self.scorer.score_table(sections)
+        scores = self.scorer.score_batch(table, rows)
+        for row, score in zip(rows, scores):
+            schedule = [time for index in row for time in sections[index]]
+            self.assertAlmostEqual(score, self.scorer.score_schedule(schedule), places=12)
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,187 @@
+import os
+import tempfile
+import threading
+import unittest
+from datetime import time
+from time import sleep
+from types import SimpleNamespace
+
+from scheduler.catalog_file import MappedCatalog, read_catalog_version, write_catalog_file
+from scheduler.term_catalog import TermCatalog, TermCatalogStore
+
+
+def make_sections(version, courses):
+    """Build a TermCatalog from {course: [crn, ...]} with one meeting per section."""
+    section_dict = {}
+    section_time_dict = {}
+    for course, crns in courses.items():
+        for crn in crns:
+            section_dict[crn] = SimpleNamespace(crn=crn, course=course)
+            section_time_dict[crn] = [SimpleNamespace(days="M", begin_time=time(9, 0), end_time=time(9, 50))]
+    return TermCatalog(version, section_dict, section_time_dict)
+
+
+class FakeCatalogSource:
+    """Catalog version and loader stand-in counting loads."""
+
+    def __init__(self):
+        self.version = 1
+        self.loads = 0
+        self.fail = False
+
+    def load(self):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        self.loads += 1
+        return make_sections(self.version, {"CS-1114": [1, 2], "MATH-1225": [3 + self.version]})
+
+    def read_version(self):
+        if self.fail:
+            raise RuntimeError("database unavailable")
+        return self.version
+
+
+class TestTermCatalog(unittest.TestCase):
+
+    def test_fetch_sections_by_course(self):
+        """Sections of the requested courses are returned with the missing courses."""
+        catalog = make_sections(1, {"CS-1114": [1, 2], "MATH-1225": [3]})
+        section_dict, section_time_dict, missing = catalog.fetch_sections(["CS-1114", "PHYS-2305"])
+        self.assertEqual(set(section_dict), {1, 2})
+        self.assertEqual(set(section_time_dict), {1, 2})
+        self.assertEqual(missing, ["PHYS-2305"])
+        self.assertEqual(len(catalog), 3)
+
+    def test_store_loads_once_and_reloads_on_new_version(self):
+        """The snapshot is loaded on first use and replaced only when the version changes."""
+        source = FakeCatalogSource()
+        store = TermCatalogStore(source.load, source.read_version, check_interval=3600)
+        first = store.get()
+        self.assertIs(store.get(), first)
+        self.assertEqual(source.loads, 1)
+
+        self.assertFalse(store.refresh())
+        self.assertEqual(source.loads, 1)
+
+        source.version = 2
+        self.assertTrue(store.refresh())
+        self.assertEqual(store.get().version, 2)
+        self.assertEqual(store.get().fetch_sections(["MATH-1225"])[0].keys(), {5})
+        self.assertEqual(first.version, 1)  # Snapshots handed out earlier stay intact
+
+    def test_store_keeps_snapshot_when_refresh_fails(self):
+        """A failed version check or reload keeps serving the current snapshot."""
+        source = FakeCatalogSource()
+        store = TermCatalogStore(source.load, source.read_version, check_interval=3600)
+        first = store.get()
+        source.fail = True
+        self.assertFalse(store.refresh())
+        self.assertIs(store.get(), first)
+
+    def test_get_refreshes_in_the_background(self):
+        """An expired check interval makes get start a background refresh and return the old snapshot."""
+        source = FakeCatalogSource()
+        store = TermCatalogStore(source.load, source.read_version, check_interval=0)
+        first = store.get()
+        source.version = 2
+        self.assertIs(store.get(), first)
+        for _ in range(200):
+            if store.get().version == 2:
+                break
+            sleep(0.01)
+        self.assertEqual(store.get().version, 2)
+
+    def test_only_the_background_refresh_is_released(self):
+        """release runs in the refresh thread once it is done, never in the caller's thread."""
+        source = FakeCatalogSource()
+        released = []
+        store = TermCatalogStore(
+            source.load, source.read_version, check_interval=0,
+            release=lambda: released.append(threading.current_thread().name),
+        )
+        store.get()
+        source.version = 2
+        self.assertTrue(store.refresh())
+        self.assertEqual(released, [])
+
+        store.get()
+        for _ in range(200):
+            if released:
+                break
+            sleep(0.01)
+        self.assertEqual(released, ["term-catalog-refresh"])
+
+
+def make_section(crn, course, meetings, **fields):
+    """Section stand-in with the Section model's fields and its meeting times."""
+    section = SimpleNamespace(
+        crn=crn, course=course, title="", class_type="L", modality="Face-to-Face", credit_hours="3",
+        capacity="30", professor="Staff", location="TBA", exam_code="01", avg_gpa=None,
+    )
+    vars(section).update(fields)
+    times = [SimpleNamespace(days=days, begin_time=begin, end_time=end) for days, begin, end in meetings]
+    return section, times
+
+
+class TestCatalogFile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "term_catalog.bin")
+        self.sections = [
+            make_section(12345, "CS-1114", [("M", time(8, 0), time(8, 50)), ("W", time(8, 0), time(8, 50))],
+                         title="Intro to Software Design", professor="Smith", avg_gpa=3.25),
+            make_section(12346, "CS-1114", [("T", time(9, 30), time(10, 45))], title="Intro to Software Design"),
+            make_section(20001, "MATH-1225", [("ONLINE", time(0, 0), time(0, 0))], location="ONLINE"),
+        ]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """A written catalog file reads back every section field and meeting time."""
+        self.assertEqual(write_catalog_file(self.path, 3, self.sections), 3)
+        self.assertEqual(read_catalog_version(self.path), 3)
+
+        catalog = MappedCatalog(self.path)
+        self.assertEqual((catalog.version, len(catalog)), (3, 3))
+        section_dict, section_time_dict, missing = catalog.fetch_sections(["MATH-1225", "CS-1114", "PHYS-2305"])
+        self.assertEqual(missing, ["PHYS-2305"])
+        self.assertEqual(set(section_dict), {12345, 12346, 20001})
+        for section, times in self.sections:
+            loaded = section_dict[section.crn]
+            self.assertEqual(
+                {field: getattr(loaded, field) for field in vars(section)}, vars(section)
+            )
+            self.assertEqual(
+                [(t.days, t.begin_time, t.end_time) for t in section_time_dict[section.crn]],
+                [(t.days, t.begin_time, t.end_time) for t in times],
+            )
+            self.assertTrue(all(t.crn is loaded for t in section_time_dict[section.crn]))
+
+    def test_missing_or_foreign_file(self):
+        """A missing file has no version; a file of another kind is rejected."""
+        self.assertIsNone(read_catalog_version(self.path))
+        with open(self.path, "wb") as other:
+            other.write(b"not a catalog file at all, just some bytes")
+        with self.assertRaises(ValueError):
+            MappedCatalog(self.path)
+
+    def test_store_swaps_to_a_newer_file(self):
+        """A store serving the file switches to a rewritten file; earlier maps stay readable."""
+        write_catalog_file(self.path, 1, self.sections[:2])
+        store = TermCatalogStore(
+            lambda: MappedCatalog(self.path), lambda: read_catalog_version(self.path), check_interval=3600
+        )
+        first = store.get()
+        self.assertEqual(first.fetch_sections(["MATH-1225"])[2], ["MATH-1225"])
+
+        write_catalog_file(self.path, 2, self.sections)
+        self.assertTrue(store.refresh())
+        self.assertEqual(store.get().version, 2)
+        self.assertEqual(list(store.get().fetch_sections(["MATH-1225"])[0]), [20001])
+        self.assertEqual(set(first.fetch_sections(["CS-1114"])[0]), {12345, 12346})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "class_scheduler.test_settings")
+django.setup()
+
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory
+
+from benchmarks.synthetic_catalog import generate_catalog
+from scheduler import main
+from scheduler.schedule_generator import ScheduleGenerator
+from scheduler.views import GenerateScheduleStreamView, GenerateScheduleView
+
+COURSES = ["SYN-1000", "SYN-1111", "SYN-1222"]
+REQUEST = {
+    "courses": COURSES,
+    "breaks": [],
+    "preferred_days": ["M", "W", "F"],
+    "preferred_time": "morning",
+    "day_weight": 0.5,
+    "time_weight": 0.5,
+}
+PREFERENCES = {key: REQUEST[key] for key in ("preferred_days", "preferred_time", "day_weight", "time_weight")}
+STATS_KEYS = {
+    "courses", "engine", "mode", "seconds", "nodes_visited", "nodes_pruned",
+    "leaves_scored", "heap_replacements", "search_space",
+}
+
+
+class TestGenerateScheduleView(unittest.TestCase):
+
+    def setUp(self):
+        caches["schedules"].clear()
+        self.section_dict, self.section_time_dict = generate_catalog(seed=3, num_courses=len(COURSES))
+        for target, value in (
+            ("fetch_sections", (self.section_dict, self.section_time_dict, [])),
+            ("catalog_version", 1),
+        ):
+            patcher = patch.object(main, target, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post(self, **fields):
+        request = APIRequestFactory().post("/generate-schedules/", {**REQUEST, **fields}, format="json")
+        response = GenerateScheduleView.as_view()(request)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_stats_are_returned_only_when_requested(self):
+        """The stats field is optional; the schedules and search info are always returned."""
+        body = self.post()
+        self.assertNotIn("stats", body)
+        self.assertTrue(body["schedules"])
+        self.assertIn("stop_reason", body["search"])
+
+        body = self.post(include_stats=True, engine="mitm")
+        stats = body["stats"]
+        self.assertLessEqual(STATS_KEYS, set(stats))
+        self.assertEqual(stats["courses"], COURSES)
+        self.assertEqual(stats["engine"], "mitm")
+        self.assertEqual(set(stats["seconds"]), {"fetch", "compile", "search", "score", "format"})
+        self.assertEqual(set(stats["nodes_pruned"]), {"conflict", "break", "bound"})
+        self.assertGreater(stats["nodes_visited"], 0)
+
+    def test_request_stats_combine_timings_and_search_counters(self):
+        """request_stats moves the scoring time among the phase timings."""
+        generator = ScheduleGenerator(self.section_dict, self.section_time_dict, [], PREFERENCES)
+        generator.generate_schedules()
+        stats = main.request_stats(generator, COURSES, "dfs", fetch=0.5, search=1.25)
+        self.assertEqual(set(stats), STATS_KEYS)
+        self.assertEqual(stats["mode"], "exact")
+        self.assertEqual(stats["seconds"], {"fetch": 0.5, "search": 1.25, "score": round(generator.score_seconds, 6)})
+        self.assertEqual(stats["nodes_visited"], generator.nodes_visited)
+        self.assertEqual(stats["leaves_scored"], generator.leaves_scored)
+
+
+class TestGenerateScheduleStreamView(unittest.TestCase):
+
+    def setUp(self):
+        section_dict, section_time_dict = generate_catalog(seed=3, num_courses=8)
+        self.courses = sorted({section.course for section in section_dict.values()})
+        patcher = patch.object(main, "fetch_sections", return_value=(section_dict, section_time_dict, []))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    def parse(frames):
+        """Split Server-Sent Events frames into (event, data) pairs."""
+        events = []
+        for frame in frames.split("\n\n")[:-1]:
+            event, data = frame.split("\n")
+            events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+        return events
+
+    @override_settings(SCHEDULE_SEARCH_WORKERS=4)
+    def test_stream_reports_progress_for_any_engine_and_ends_with_the_result(self):
+        """Streamed requests are searched serially, which reports progress, even with workers and another engine."""
+        request = APIRequestFactory().post(
+            "/generate-schedules/stream/", {**REQUEST, "courses": self.courses, "engine": "mip"}, format="json"
+        )
+        response = GenerateScheduleStreamView.as_view()(request)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = self.parse(b"".join(response.streaming_content).decode())
+        kinds = [event for event, _ in events]
+        self.assertIn("progress", kinds)
+        self.assertEqual(kinds[-1], "result")
+        result = events[-1][1]
+        self.assertFalse(result["partial"])
+        self.assertEqual(len(result["schedules"]), 20)
+
+    def test_failures_are_sent_as_an_error_event(self):
+        """The status is already sent when the search fails, so the error becomes the last event."""
+        closed = []
+
+        def events():
+            try:
+                yield ("progress", {"nodes_explored": 1})
+                raise RuntimeError("search failed")
+            finally:
+                closed.append(True)
+
+        frames = "".join(GenerateScheduleStreamView.encode_events(events()))
+        self.assertEqual(
+            self.parse(frames),
+            [
+                ("progress", {"nodes_explored": 1}),
+                ("error", {"error": "Failed to generate schedules: search failed"}),
+            ],
+        )
+        self.assertEqual(closed, [True])
@@ -3,7 +3,8 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     SubjectViewSet, ProfessorViewSet, SectionViewSet, SectionTimeViewSet, 
     UserViewSet, PreferenceViewSet, WeightViewSet, ScheduleViewSet, 
-    ScheduleLogViewSet, GenerateScheduleView
+    ScheduleLogViewSet, GenerateScheduleView, GenerateScheduleStreamView, EstimateScheduleView,
+    ScheduleCacheView
 )
 
 # This is the router for the API
@@ -21,4 +22,7 @@ router.register(r'schedule-logs', ScheduleLogViewSet)
 urlpatterns = [
     path('api/v1/', include(router.urls)), # this is the root URL
     path('api/v1/generate-schedules/', GenerateScheduleView.as_view(), name='generate-schedules'), # this is the endpoint for generating schedules
+    path('api/v1/generate-schedules/stream/', GenerateScheduleStreamView.as_view(), name='generate-schedules-stream'), # streams progress and schedules as Server-Sent Events
+    path('api/v1/estimate-schedules/', EstimateScheduleView.as_view(), name='estimate-schedules'), # estimates the number of schedules and search time without searching
+    path('api/v1/schedule-cache/', ScheduleCacheView.as_view(), name='schedule-cache'), # hit and miss counters of the schedule result cache
 ]
\ No newline at end of file
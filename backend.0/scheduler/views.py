@@ -5,11 +5,17 @@ from rest_framework.permissions import AllowAny
 from scheduler.models import Subject, Professor, Section, SectionTime, User, Preference, Weight, Schedule, ScheduleLog
 from scheduler.serializers import (
     SubjectSerializer, ProfessorSerializer, SectionSerializer, SectionTimeSerializer, UserSerializer, PreferenceSerializer, 
-    WeightSerializer, ScheduleSerializer, ScheduleLogSerializer, ScheduleInputSerializer
+    WeightSerializer, ScheduleSerializer, ScheduleLogSerializer, ScheduleInputSerializer,
+    ScheduleEstimateSerializer
 )
 
-from django.http import JsonResponse
-from .main import process_schedules
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
+from .main import estimate_schedules, process_schedules, result_cache, stream_schedules
+from .schedule_generator import ScheduleGenerator
 # from logging_config import loggers
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -78,30 +84,38 @@ class GenerateScheduleView(APIView):
             
             # logger.debug(f"Processed user input: courses={courses}, breaks={breaks}, preferences={preferences}")
             
+            timeout, max_nodes = self.search_budget(user_input)
+            
             try:
+                # Generate, score, and format schedules
+                result = process_schedules(
+                    courses=courses,
+                    breaks=breaks,
+                    preferences=preferences,
+                    max_schedules=20,
+                    timeout=timeout,
+                    max_nodes=max_nodes,
+                    workers=settings.SCHEDULE_SEARCH_WORKERS,
+                    engine=user_input.get("engine", "dfs"),
+                    mode=user_input.get("mode", "exact"),
+                    beam_width=user_input.get("beam_width", ScheduleGenerator.BEAM_WIDTH),
+                )
                 
-                try:
-                    # Generate, score, and format schedules
-                    generated_schedules, total_schedules = process_schedules(
-                        courses=courses,
-                        breaks=breaks,
-                        preferences=preferences,
-                        max_schedules=20
-                    )
-                except: # If total_schedules is not returned
-                    
-                    generated_schedules = process_schedules(
-                        courses=courses,
-                        breaks=breaks,
-                        preferences=preferences,
-                        max_schedules=20
-                    )
+                if not isinstance(result, tuple): # Error messages instead of schedules
+                    return JsonResponse({"schedules": result}, status=status.HTTP_200_OK)
+                
+                generated_schedules, total_schedules, search_info, stats = result
                     
                 # logger.info(f"Successfully generated {len(generated_schedules)} schedules")
-                try:
-                    return JsonResponse({"schedules": generated_schedules, "total_schedules": total_schedules}, status=status.HTTP_200_OK)
-                except:
-                    return JsonResponse({"schedules": generated_schedules}, status=status.HTTP_200_OK)
+                body = {
+                    "schedules": generated_schedules,
+                    "total_schedules": total_schedules,
+                    "partial": search_info["partial"],
+                    "search": search_info,
+                }
+                if user_input.get("include_stats"):
+                    body["stats"] = stats
+                return JsonResponse(body, status=status.HTTP_200_OK)
             
             except Exception as e:
                 # logger.error(f"Error generating schedules: {str(e)}")
@@ -110,3 +124,117 @@ class GenerateScheduleView(APIView):
 
         # logger.warning(f"Invalid input data: {serializer.errors}")
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @staticmethod
+    def search_budget(user_input):
+        """Return the (timeout, max_nodes) for a request, capped by the server settings."""
+        # Requests may shorten the search budget but never extend it
+        timeout = min(
+            user_input.get("timeout", settings.SCHEDULE_SEARCH_TIMEOUT),
+            settings.SCHEDULE_SEARCH_TIMEOUT,
+        )
+        max_nodes = min(
+            user_input.get("max_nodes", settings.SCHEDULE_SEARCH_MAX_NODES),
+            settings.SCHEDULE_SEARCH_MAX_NODES,
+        )
+        return timeout, max_nodes
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class GenerateScheduleStreamView(GenerateScheduleView):
+    """
+    Streaming variant of GenerateScheduleView using Server-Sent Events.
+
+    Emits "progress" events (nodes explored, estimated fraction covered, best
+    score), "schedules" events with the improving top schedules, and a final
+    "result" event with the same body as the blocking endpoint. Failures are
+    sent as an "error" event, since the response status is already committed.
+    Only the serial depth-first search reports progress, so requests are
+    searched by it whatever their engine and SCHEDULE_SEARCH_WORKERS; mode and
+    beam_width apply as on the blocking endpoint.
+    """
+
+    def post(self, request, *args, **kwargs):
+        serializer = ScheduleInputSerializer(data=request.data)
+        
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        user_input = serializer.validated_data
+        preferences = {
+            "preferred_days": user_input.get("preferred_days"),
+            "preferred_time": user_input.get("preferred_time"),
+            "day_weight": user_input.get("day_weight"),
+            "time_weight": user_input.get("time_weight"),
+        }
+        timeout, max_nodes = self.search_budget(user_input)
+        
+        events = stream_schedules(
+            courses=user_input.get("courses"),
+            breaks=user_input.get("breaks"),
+            preferences=preferences,
+            max_schedules=20,
+            timeout=timeout,
+            max_nodes=max_nodes,
+            mode=user_input.get("mode", "exact"),
+            beam_width=user_input.get("beam_width", ScheduleGenerator.BEAM_WIDTH),
+        )
+        response = StreamingHttpResponse(self.encode_events(events), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Stop nginx from buffering the stream
+        return response
+
+    @staticmethod
+    def encode_events(events):
+        """Serialize (event, data) pairs as Server-Sent Events frames."""
+        try:
+            for event, data in events:
+                yield f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+        except Exception as e:
+            error = {"error": f"Failed to generate schedules: {str(e)}"}
+            yield f"event: error\ndata: {json.dumps(error)}\n\n"
+        finally:
+            events.close()  # Cancels the search if the client went away
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class EstimateScheduleView(APIView):
+    """
+    Estimate the number of schedules of a request and its search time without searching.
+
+    Responds with the estimate (see search_estimator.SearchEstimate) and the
+    strategy a request with engine "auto" would be searched with.
+    """
+    permission_classes = [AllowAny]
+
+    def post(self, request, *args, **kwargs):
+        serializer = ScheduleEstimateSerializer(data=request.data)
+
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        user_input = serializer.validated_data
+        timeout, _ = GenerateScheduleView.search_budget(user_input)
+        try:
+            result = estimate_schedules(
+                courses=user_input.get("courses"),
+                breaks=user_input.get("breaks"),
+                timeout=timeout,
+                workers=settings.SCHEDULE_SEARCH_WORKERS,
+            )
+        except Exception as e:
+            return Response({"error": f"Failed to estimate schedules: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if isinstance(result, list):  # Error messages instead of an estimate
+            return JsonResponse({"errors": result}, status=status.HTTP_200_OK)
+        return JsonResponse(result, status=status.HTTP_200_OK)
+
+
+class ScheduleCacheView(APIView):
+    """Hit and miss counters of the schedule result cache, summed over all workers."""
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(
+            {"enabled": settings.SCHEDULE_RESULT_CACHE, **result_cache.counters()}, status=status.HTTP_200_OK
+        )
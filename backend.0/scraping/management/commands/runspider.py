@@ -1,3 +1,4 @@
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from scrapy.crawler import CrawlerProcess
 from scrapy.utils.project import get_project_settings
@@ -9,4 +10,5 @@ class Command(BaseCommand):
     def handle(self, *args, **kwargs):
         process = CrawlerProcess(get_project_settings())  # Get Scrapy settings from your Scrapy project
         process.crawl(SectionsSpider)  # Run the spider
-        process.start()  # Start the crawling process
\ No newline at end of file
+        process.start()  # Start the crawling process
+        call_command('writecatalog')  # Publish the updated sections to the web workers
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from scheduler.catalog_file import write_catalog_file
+from scheduler.fetch_sections import fetch_term_catalog
+
+class Command(BaseCommand):
+    help = 'Writes the term catalog file that the web workers memory-map'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=settings.SCHEDULE_CATALOG_FILE, help='File to write')
+
+    def handle(self, *args, **kwargs):
+        catalog = fetch_term_catalog()
+        sections = (
+            (section, times[crn])
+            for course_sections, times in catalog.course_sections.values()
+            for crn, section in course_sections.items()
+        )
+        count = write_catalog_file(kwargs['path'], catalog.version, sections)
+        self.stdout.write(f"Wrote {count} sections at catalog version {catalog.version} to {kwargs['path']}")
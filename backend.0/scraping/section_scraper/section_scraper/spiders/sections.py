@@ -30,7 +30,7 @@ import environ
 from datetime import datetime
 import logging
 from django.db import transaction
-from scheduler.models import Section, GradeDistribution, SectionOpenOrClosed
+from scheduler.models import CatalogVersion, Section, GradeDistribution, SectionOpenOrClosed
 from django.db.models import Avg
 from decimal import Decimal, ROUND_HALF_UP
 
@@ -691,6 +691,10 @@ class SectionsSpider(scrapy.Spider):
             # Update GPAs for all sections
             self.update_section_gpas()
 
+            # Tell the web workers to reload their term catalog snapshot
+            CatalogVersion.bump()
+            logger.info("Bumped the catalog version")
+
         except Exception as e:
             logger.error(f"Database error during update: {e}")
             self.conn.rollback()